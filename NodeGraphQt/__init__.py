@@ -38,7 +38,30 @@ __credits__ = []
 __module_name__ = 'NodeGraphQt'
 __url__ = 'https://github.com/jchanvfx/NodeGraphQt'
 
-from .interfaces.graph import NodeGraphWidget
-from .interfaces.node import Node, Backdrop
-from .interfaces.port import Port, Pipe
-from .widgets.node_widgets import NodeBaseWidget
+from .base.node_property import NodeProperty
+
+_QT_NAMES = ('NodeGraphWidget', 'Node', 'Backdrop', 'Port', 'Pipe',
+             'NodeBaseWidget')
+
+try:
+    from PySide2 import QtWidgets
+except ImportError as error:
+    # the "NodeGraphQt.base" session tools are importable without Qt, the
+    # graph widgets raise when they're accessed.
+    _QT_IMPORT_ERROR = str(error)
+else:
+    _QT_IMPORT_ERROR = None
+    from .interfaces.graph import NodeGraphWidget
+    from .interfaces.node import Node, Backdrop
+    from .interfaces.port import Port, Pipe
+    from .widgets.node_widgets import NodeBaseWidget
+
+
+def __getattr__(name):
+    if name in _QT_NAMES and _QT_IMPORT_ERROR:
+        raise ImportError(
+            'NodeGraphQt.{} requires PySide2 ({}), only the '
+            '"NodeGraphQt.base" modules are available without it.'
+            .format(name, _QT_IMPORT_ERROR))
+    raise AttributeError(
+        'module "NodeGraphQt" has no attribute "{}"'.format(name))
@@ -0,0 +1,632 @@
+#!/usr/bin/python
+"""
+Automatic node graph layouts.
+
+The layouts work on plain node and connection data without any Qt
+objects so they can run on a worker thread:
+
+    positions = layered_layout(node_ids, connections, sizes)
+"""
+import heapq
+from collections import deque
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LAYER_SPACING = 100.0
+NODE_SPACING = 40.0
+# max number of nodes of a grid cell a node is repelled from.
+FORCE_CELL_LIMIT = 16
+# connections spanning more layers aren't routed through dummy nodes.
+MAX_ROUTED_SPAN = 8
+
+
+class _Dummy(object):
+    """
+    Placeholder node splitting a connection that spans multiple layers.
+    """
+
+    __slots__ = ()
+
+
+def _unique_edges(node_ids, connections):
+    nodes = set(node_ids)
+    edges = []
+    seen = set()
+    for out_id, in_id in connections:
+        if out_id == in_id or out_id not in nodes or in_id not in nodes:
+            continue
+        if (out_id, in_id) not in seen:
+            seen.add((out_id, in_id))
+            edges.append((out_id, in_id))
+    return edges
+
+
+def _greedy_order(node_ids, successors, predecessors, priority):
+    """
+    Greedy feedback arc set ordering (Eades, Lin and Smyth), sinks are
+    moved to the end and sources to the start of the order, when only
+    cycles are left the node with the fewest remaining inputs (then the
+    lowest priority) is moved to the start.
+
+    Returns:
+        dict: {<node_id>: <order index>}
+    """
+    out_degree = {n: len(successors[n]) for n in node_ids}
+    in_degree = {n: len(predecessors[n]) for n in node_ids}
+    sinks = deque(n for n in node_ids if not out_degree[n])
+    sources = deque(n for n in node_ids
+                    if not in_degree[n] and out_degree[n])
+    # stale entries are skipped when popped.
+    heap = [(in_degree[n], priority[n], n) for n in node_ids]
+    heapq.heapify(heap)
+
+    removed = set()
+    head = []
+    tail = []
+    while len(removed) < len(node_ids):
+        if sinks:
+            node_id = sinks.popleft()
+            if node_id in removed:
+                continue
+            tail.append(node_id)
+        elif sources:
+            node_id = sources.popleft()
+            if node_id in removed:
+                continue
+            head.append(node_id)
+        else:
+            degree, _, node_id = heapq.heappop(heap)
+            if node_id in removed or degree != in_degree[node_id]:
+                continue
+            head.append(node_id)
+        removed.add(node_id)
+        for child in successors[node_id]:
+            if child in removed:
+                continue
+            in_degree[child] -= 1
+            if not in_degree[child]:
+                sources.append(child)
+            else:
+                heapq.heappush(
+                    heap, (in_degree[child], priority[child], child))
+        for parent in predecessors[node_id]:
+            if parent in removed:
+                continue
+            out_degree[parent] -= 1
+            if not out_degree[parent]:
+                sinks.append(parent)
+    return {n: i for i, n in enumerate(head + tail[::-1])}
+
+
+def _flow_depth(node_ids, successors, predecessors, rank, sweeps):
+    """
+    Depth of the nodes along the main flow of the graph, the longest path
+    depth in the order is smoothed so every connection pulls its input
+    node one step after its output node, a few connections closing cycles
+    barely shift the depths of the nodes around them.
+    """
+    order = sorted(node_ids, key=rank.__getitem__)
+    depth = dict.fromkeys(node_ids, 0.0)
+    for node_id in order:
+        for child in successors[node_id]:
+            if rank[child] > rank[node_id] and \
+                    depth[child] < depth[node_id] + 1.0:
+                depth[child] = depth[node_id] + 1.0
+    for sweep in range(sweeps):
+        for node_id in (order if sweep % 2 == 0 else reversed(order)):
+            parents = predecessors[node_id]
+            children = successors[node_id]
+            count = len(parents) + len(children)
+            if count:
+                total = sum(depth[n] for n in parents) + \
+                    sum(depth[n] for n in children) + \
+                    len(parents) - len(children)
+                depth[node_id] = total / float(count)
+    return depth
+
+
+def break_cycles(node_ids, edges, sweeps=20):
+    """
+    Reverse a small set of edges so the graph becomes acyclic while the
+    main flow of the graph keeps its direction.
+
+    The nodes are ordered with a greedy feedback arc set heuristic, the
+    depth of each node along the flow is then estimated from that order
+    and the heuristic is run again preferring the shallow nodes, so the
+    result doesn't depend on the node order. Only the edges pointing
+    backwards in the final order are reversed.
+
+    Args:
+        node_ids (list[str]): node ids.
+        edges (list[tuple]): (out_id, in_id) edges without duplicates.
+        sweeps (int): depth smoothing iterations.
+
+    Returns:
+        list[tuple]: acyclic edges.
+    """
+    successors = {n: [] for n in node_ids}
+    predecessors = {n: [] for n in node_ids}
+    for out_id, in_id in edges:
+        successors[out_id].append(in_id)
+        predecessors[in_id].append(out_id)
+    index = {n: i for i, n in enumerate(node_ids)}
+    rank = _greedy_order(node_ids, successors, predecessors, index)
+    if all(rank[o] < rank[i] for o, i in edges):
+        return list(edges)
+    depth = _flow_depth(node_ids, successors, predecessors, rank, sweeps)
+    # the node order only breaks the ties within a depth.
+    rank = _greedy_order(node_ids, successors, predecessors,
+                         {n: (round(depth[n]), index[n]) for n in node_ids})
+
+    acyclic = []
+    seen = set()
+    for edge in edges:
+        if rank[edge[0]] > rank[edge[1]]:
+            edge = (edge[1], edge[0])
+        if edge not in seen:
+            seen.add(edge)
+            acyclic.append(edge)
+    return acyclic
+
+
+def assign_layers(node_ids, edges):
+    """
+    Longest path layering of an acyclic graph, the nodes with more
+    outputs than inputs are then moved down next to their outputs to
+    shorten the connections.
+
+    Args:
+        node_ids (list[str]): node ids.
+        edges (list[tuple]): acyclic (out_id, in_id) edges.
+
+    Returns:
+        tuple: ({<node_id>: <layer>}, [<node_id>] in topological order)
+    """
+    successors = {n: [] for n in node_ids}
+    in_degree = dict.fromkeys(node_ids, 0)
+    for out_id, in_id in edges:
+        successors[out_id].append(in_id)
+        in_degree[in_id] += 1
+    layers = dict.fromkeys(node_ids, 0)
+    queue = deque(n for n in node_ids if not in_degree[n])
+    order = []
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+        layer = layers[node_id] + 1
+        for child in successors[node_id]:
+            if layers[child] < layer:
+                layers[child] = layer
+            in_degree[child] -= 1
+            if not in_degree[child]:
+                queue.append(child)
+    inputs = dict.fromkeys(node_ids, 0)
+    for _, in_id in edges:
+        inputs[in_id] += 1
+    for node_id in reversed(order):
+        children = successors[node_id]
+        if children and len(children) > inputs[node_id]:
+            layer = min(layers[n] for n in children) - 1
+            if layer > layers[node_id]:
+                layers[node_id] = layer
+    return layers, order
+
+
+def _split_long_edges(edges, layers, max_span=MAX_ROUTED_SPAN):
+    """
+    Insert dummy nodes so every edge connects adjacent layers, the edges
+    spanning more than "max_span" layers link their nodes directly so the
+    number of dummy nodes stays bounded.
+    """
+    predecessors = {}
+    successors = {}
+    for node_id in layers:
+        predecessors[node_id] = []
+        successors[node_id] = []
+    for out_id, in_id in edges:
+        prev_id = out_id
+        if layers[in_id] - layers[out_id] > max_span:
+            successors[out_id].append(in_id)
+            predecessors[in_id].append(out_id)
+            continue
+        for layer in range(layers[out_id] + 1, layers[in_id]):
+            dummy = _Dummy()
+            layers[dummy] = layer
+            predecessors[dummy] = [prev_id]
+            successors[dummy] = []
+            successors[prev_id].append(dummy)
+            prev_id = dummy
+        successors[prev_id].append(in_id)
+        predecessors[in_id].append(prev_id)
+    return predecessors, successors
+
+
+def _sort_layer(layer, neighbours, index):
+    keys = {}
+    for i, node_id in enumerate(layer):
+        linked = neighbours[node_id]
+        if len(linked) == 1:
+            # dummy nodes always have a single neighbour.
+            keys[node_id] = index[linked[0]]
+        elif linked:
+            keys[node_id] = sum(index[n] for n in linked) / float(len(linked))
+        else:
+            keys[node_id] = i
+    layer.sort(key=keys.__getitem__)
+    for i, node_id in enumerate(layer):
+        index[node_id] = i
+
+
+def order_layers(ranks, predecessors, successors, iterations=4):
+    """
+    Reduce the edge crossings with the barycenter heuristic, alternating
+    downward and upward sweeps over the layers.
+
+    Args:
+        ranks (list[list]): nodes in each layer in their initial order.
+        predecessors (dict): node predecessors in the previous layer.
+        successors (dict): node successors in the next layer.
+        iterations (int): number of down and up sweeps.
+
+    Returns:
+        list[list]: ordered layers.
+    """
+    index = {}
+    for layer in ranks:
+        for i, node_id in enumerate(layer):
+            index[node_id] = i
+    for _ in range(iterations):
+        for layer in ranks[1:]:
+            _sort_layer(layer, predecessors, index)
+        for layer in reversed(ranks[:-1]):
+            _sort_layer(layer, successors, index)
+    return ranks
+
+
+def _place_layer(layer, heights, centers, neighbours, spacing):
+    """
+    Move the nodes towards the mean center of their neighbours while
+    keeping their order and the minimum spacing.
+    """
+    count = len(layer)
+    desired = []
+    for node_id in layer:
+        linked = neighbours[node_id]
+        if len(linked) == 1:
+            center = centers[linked[0]]
+        elif linked:
+            center = sum(centers[n] for n in linked) / float(len(linked))
+        else:
+            center = centers[node_id]
+        desired.append(center - heights[node_id] / 2.0)
+
+    # the forward and backward packings each keep the spacing so their
+    # average does too, and it isn't biased to either end of the layer.
+    forward = list(desired)
+    for i in range(1, count):
+        limit = forward[i - 1] + heights[layer[i - 1]] + spacing
+        if forward[i] < limit:
+            forward[i] = limit
+    backward = list(desired)
+    for i in range(count - 2, -1, -1):
+        limit = backward[i + 1] - heights[layer[i]] - spacing
+        if backward[i] > limit:
+            backward[i] = limit
+    for i, node_id in enumerate(layer):
+        y = (forward[i] + backward[i]) / 2.0
+        centers[node_id] = y + heights[node_id] / 2.0
+
+
+def layered_layout(node_ids, connections, sizes=None, origin=(0.0, 0.0),
+                   layer_spacing=LAYER_SPACING, node_spacing=NODE_SPACING,
+                   iterations=4):
+    """
+    Layered (Sugiyama style) layout flowing from left to right, the
+    outputs of a node are placed in the layers to its right.
+
+    Args:
+        node_ids (list[str]): node ids.
+        connections (list[tuple]): (out_node_id, in_node_id) connections.
+        sizes (dict): node (width, height) sizes {<node_id>: (w, h)}.
+        origin (tuple): top left (x, y) position of the layout.
+        layer_spacing (float): horizontal space between the layers.
+        node_spacing (float): vertical space between the nodes of a layer.
+        iterations (int): crossing reduction and placement iterations.
+
+    Returns:
+        dict: node (x, y) positions {<node_id>: (x, y)}.
+    """
+    node_ids = list(node_ids)
+    if not node_ids:
+        return {}
+    sizes = sizes or {}
+    edges = break_cycles(node_ids, _unique_edges(node_ids, connections))
+    layers, order = assign_layers(node_ids, edges)
+    predecessors, successors = _split_long_edges(edges, layers)
+
+    ranks = [[] for _ in range(max(layers.values()) + 1)]
+    # dummy nodes follow their source so the initial order keeps the
+    # connected nodes together.
+    visited = set()
+    for node_id in order:
+        stack = [node_id]
+        while stack:
+            n = stack.pop()
+            if n in visited:
+                continue
+            visited.add(n)
+            ranks[layers[n]].append(n)
+            stack.extend(s for s in successors[n] if isinstance(s, _Dummy))
+    order_layers(ranks, predecessors, successors, iterations)
+
+    heights = {}
+    widths = {}
+    for n in layers:
+        width, height = sizes.get(n, (0.0, 0.0)) \
+            if not isinstance(n, _Dummy) else (0.0, 0.0)
+        widths[n] = float(width)
+        heights[n] = float(height)
+
+    # initial stacked placement centered on the layer.
+    centers = {}
+    for layer in ranks:
+        total = sum(heights[n] for n in layer) + \
+            node_spacing * (len(layer) - 1)
+        y = -total / 2.0
+        for n in layer:
+            centers[n] = y + heights[n] / 2.0
+            y += heights[n] + node_spacing
+
+    for _ in range(iterations):
+        for layer in ranks[1:]:
+            _place_layer(layer, heights, centers, predecessors, node_spacing)
+        for layer in reversed(ranks[:-1]):
+            _place_layer(layer, heights, centers, successors, node_spacing)
+
+    positions = {}
+    x = 0.0
+    for layer in ranks:
+        layer_width = max(widths[n] for n in layer) if layer else 0.0
+        for n in layer:
+            if not isinstance(n, _Dummy):
+                positions[n] = (x + (layer_width - widths[n]) / 2.0,
+                                centers[n] - heights[n] / 2.0)
+        x += layer_width + layer_spacing
+
+    left = min(p[0] for p in positions.values())
+    top = min(p[1] for p in positions.values())
+    dx = origin[0] - left
+    dy = origin[1] - top
+    return {n: (p[0] + dx, p[1] + dy) for n, p in positions.items()}
+
+
+def _cell_index(cells):
+    # sorts the nodes by grid cell, returns the cell key of each node, the
+    # node order and the (key, first, count) of the occupied cells.
+    cells = cells - cells.min(axis=0)
+    stride = int(cells[:, 1].max()) + 3
+    keys = (cells[:, 0] + 1) * stride + cells[:, 1] + 1
+    order = numpy.argsort(keys, kind='stable')
+    cell_keys, cell_start, cell_count = numpy.unique(
+        keys[order], return_index=True, return_counts=True)
+    return keys, stride, order, cell_keys, cell_start, cell_count
+
+
+def _grid_pairs(cells, limit=FORCE_CELL_LIMIT, random=None):
+    """
+    Returns the (i, j) index pairs of the nodes in the same or adjacent
+    grid cells.
+
+    A node is paired with at most "limit" nodes of each cell, crowded cells
+    are subsampled (from a random offset when a random state is given) and
+    the pairs are weighted by the number of nodes they stand for, so the
+    number of pairs stays linear however the nodes are stacked.
+
+    Args:
+        cells (numpy.ndarray): (n, 2) integer grid cell of each node.
+        limit (int): max number of nodes paired from each cell.
+        random (numpy.random.RandomState): subsampling random state.
+
+    Returns:
+        tuple: (i, j, weight) arrays.
+    """
+    count = len(cells)
+    keys, stride, order, cell_keys, cell_start, cell_count = \
+        _cell_index(cells)
+    if random is not None:
+        cell_shift = random.randint(0, 1 << 30, len(cell_keys)) % cell_count
+    else:
+        cell_shift = numpy.zeros(len(cell_keys), dtype=int)
+
+    pairs_i = []
+    pairs_j = []
+    weights = []
+    nodes = numpy.arange(count)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            target = keys + dx * stride + dy
+            found = numpy.searchsorted(cell_keys, target)
+            found = numpy.minimum(found, len(cell_keys) - 1)
+            exists = cell_keys[found] == target
+            full = numpy.where(exists, cell_count[found], 0)
+            counts = numpy.minimum(full, limit)
+            total = counts.sum()
+            if not total:
+                continue
+            ends = numpy.cumsum(counts)
+            i = numpy.repeat(nodes, counts)
+            offsets = numpy.arange(total) - numpy.repeat(ends - counts, counts)
+            cell = numpy.repeat(found, counts)
+            offsets = (offsets + cell_shift[cell]) % cell_count[cell]
+            j = order[cell_start[cell] + offsets]
+            pairs_i.append(i)
+            pairs_j.append(j)
+            weights.append(numpy.repeat(
+                full.astype(float) / numpy.maximum(counts, 1), counts))
+    i = numpy.concatenate(pairs_i)
+    j = numpy.concatenate(pairs_j)
+    weight = numpy.concatenate(weights)
+    mask = i != j
+    return i[mask], j[mask], weight[mask]
+
+
+def _spread_stacks(pos, spacing):
+    """
+    Spread the nodes sharing a grid cell over a square grid centered on
+    the cell, so stacked nodes (pasted or created at the same position)
+    start apart.
+
+    Args:
+        pos (numpy.ndarray): (n, 2) node positions.
+        spacing (float): grid cell size and spacing between the nodes.
+
+    Returns:
+        numpy.ndarray: spread positions.
+    """
+    cells = numpy.floor(pos / spacing).astype(int)
+    keys, _, order, cell_keys, cell_start, cell_count = _cell_index(cells)
+    if cell_count.max() < 2:
+        return pos
+    cell = numpy.searchsorted(cell_keys, keys[order])
+    rank = numpy.arange(len(order)) - cell_start[cell]
+    side = numpy.ceil(numpy.sqrt(cell_count[cell])).astype(int)
+    grid = numpy.stack([rank % side, rank // side], axis=1).astype(float)
+    grid -= (side[:, None] - 1) / 2.0
+    spread = pos.copy()
+    center = (cells[order] + 0.5) * spacing
+    stacked = cell_count[cell] > 1
+    spread[order[stacked]] = center[stacked] + grid[stacked] * spacing
+    return spread
+
+
+def _sum_at(indices, values, count):
+    # faster than "numpy.add.at" for summing the (x, y) values per node.
+    return numpy.stack([
+        numpy.bincount(indices, values[:, 0], minlength=count),
+        numpy.bincount(indices, values[:, 1], minlength=count)], axis=1)
+
+
+def force_layout(node_ids, connections, sizes=None, positions=None,
+                 groups=None, iterations=100, node_spacing=NODE_SPACING,
+                 callback=None):
+    """
+    Force directed (Fruchterman-Reingold) layout, the repulsion between the
+    nodes is only computed for the nodes in the neighbouring cells of a
+    uniform grid, crowded cells are subsampled so each iteration scales
+    linearly. Nodes starting stacked on the same spot are spread over a
+    grid first (requires numpy).
+
+    Args:
+        node_ids (list[str]): node ids.
+        connections (list[tuple]): (out_node_id, in_node_id) connections.
+        sizes (dict): node (width, height) sizes {<node_id>: (w, h)}.
+        positions (dict): initial (x, y) positions {<node_id>: (x, y)}.
+        groups (dict): nodes kept together eg. the nodes on a backdrop
+            {<group_id>: [<node_id>]}, a group with an initial position
+            is moved along with its nodes.
+        iterations (int): number of iterations.
+        node_spacing (float): minimum space between the nodes.
+        callback (function): called with the (n, 2) array of the node
+            positions after each iteration, the layout stops early when the
+            callback returns False.
+
+    Returns:
+        dict: node (x, y) positions {<node_id>: (x, y)}.
+    """
+    if numpy is None:
+        raise ImportError('the force directed layout requires numpy.')
+    node_ids = list(node_ids)
+    count = len(node_ids)
+    if not count:
+        return {}
+    sizes = sizes or {}
+    positions = positions or {}
+    groups = groups or {}
+    index = {n: i for i, n in enumerate(node_ids)}
+
+    size = numpy.array([sizes.get(n, (0.0, 0.0)) for n in node_ids],
+                       dtype=float).reshape(-1, 2)
+    radius = numpy.hypot(size[:, 0], size[:, 1]) / 2.0
+    # the positions are the node top left corners, simulate the centers.
+    random = numpy.random.RandomState(0)
+    pos = numpy.array([positions.get(n, (0.0, 0.0)) for n in node_ids],
+                      dtype=float).reshape(-1, 2) + size / 2.0
+    start_center = pos.mean(axis=0)
+
+    edges = _unique_edges(node_ids, connections)
+    edge_i = numpy.array([index[e[0]] for e in edges], dtype=int)
+    edge_j = numpy.array([index[e[1]] for e in edges], dtype=int)
+
+    group_of = numpy.full(count, -1, dtype=int)
+    group_ids = list(groups.keys())
+    for g, group_id in enumerate(group_ids):
+        for node_id in groups[group_id]:
+            if node_id in index:
+                group_of[index[node_id]] = g
+    grouped = group_of >= 0
+    group_start = [pos[group_of == g].mean(axis=0)
+                   if (group_of == g).any() else None
+                   for g in range(len(group_ids))]
+
+    # ideal distance between connected nodes.
+    k = float(radius.mean()) * 2.0 + node_spacing
+    cell_size = k * 1.5
+    temperature = k * 2.0
+    pos = _spread_stacks(pos, k)
+    pos += random.uniform(-1.0, 1.0, pos.shape)
+
+    for step in range(iterations):
+        disp = numpy.zeros_like(pos)
+
+        # repulsion from the nodes in the neighbouring cells.
+        i, j, weight = _grid_pairs(
+            numpy.floor(pos / cell_size).astype(int), random=random)
+        delta = pos[i] - pos[j]
+        dist = numpy.hypot(delta[:, 0], delta[:, 1])
+        dist = numpy.maximum(dist, 0.01)
+        # distance between the node outlines so large nodes keep apart.
+        gap = numpy.maximum(
+            dist - radius[i] - radius[j] - node_spacing, k * 0.01)
+        force = numpy.where(dist < cell_size + radius[i] + radius[j],
+                            k * k / gap, 0.0) * weight
+        disp += _sum_at(i, delta * (force / dist)[:, None], count)
+
+        # attraction along the connections.
+        if len(edge_i):
+            delta = pos[edge_j] - pos[edge_i]
+            dist = numpy.hypot(delta[:, 0], delta[:, 1])[:, None]
+            pull = delta * dist / k
+            disp += _sum_at(edge_i, pull, count)
+            disp -= _sum_at(edge_j, pull, count)
+
+        # keep the grouped nodes together and the graph centered.
+        if grouped.any():
+            centers = numpy.zeros((len(group_ids), 2))
+            numpy.add.at(centers, group_of[grouped], pos[grouped])
+            totals = numpy.bincount(group_of[grouped],
+                                    minlength=len(group_ids))
+            centers /= numpy.maximum(totals, 1)[:, None]
+            disp[grouped] += (centers[group_of[grouped]] - pos[grouped]) \
+                * 0.5
+        disp += (start_center - pos) * 0.01
+
+        length = numpy.hypot(disp[:, 0], disp[:, 1])
+        limit = temperature * (1.0 - float(step) / iterations) + 0.1
+        scale = numpy.minimum(length, limit) / numpy.maximum(length, 1e-9)
+        pos += disp * scale[:, None]
+
+        if callback and callback(pos - size / 2.0) is False:
+            break
+
+    top_left = pos - size / 2.0
+    result = {n: (float(top_left[i, 0]), float(top_left[i, 1]))
+              for i, n in enumerate(node_ids)}
+    for g, group_id in enumerate(group_ids):
+        if group_id in positions and group_start[g] is not None:
+            offset = pos[group_of == g].mean(axis=0) - group_start[g]
+            x, y = positions[group_id]
+            result[group_id] = (x + float(offset[0]), y + float(offset[1]))
+    return result
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+"""
+Node manifests declare node types without importing their modules.
+
+A manifest is a json file listing the node types with their module path,
+the module is only imported when the node type is first created:
+
+    {
+        "version": 1,
+        "signature": [],
+        "paths": [],
+        "nodes": [
+            {"type": "com.studio.MathNode", "name": "Math",
+             "module": "studio_nodes.math", "class": "MathNode",
+             "alias": "math"}
+        ]
+    }
+
+Node types can also be published by packages through the
+"nodegraphqt.nodes" entry point group, each entry point references a node
+class ("studio_nodes.math:MathNode"). The entry points are resolved once
+and cached to a manifest which is reused as long as the installed entry
+points are unchanged, the entry points are only listed again when the
+modification time of a "sys.path" directory has changed.
+"""
+import json
+import os
+import sys
+
+MANIFEST_VERSION = 1
+ENTRY_POINT_GROUP = 'nodegraphqt.nodes'
+
+
+def manifest_entry(node_cls, alias=None):
+    """
+    Args:
+        node_cls (NodeGraphQt.Node): node class.
+        alias (str): node alias (optional).
+
+    Returns:
+        dict: manifest entry of the node class.
+    """
+    entry = {
+        'type': node_cls.type,
+        'name': node_cls.NODE_NAME,
+        'module': node_cls.__module__,
+        'class': node_cls.__name__,
+    }
+    if alias:
+        entry['alias'] = alias
+    return entry
+
+
+def read_manifest(file_path):
+    """
+    Args:
+        file_path (str): manifest file path.
+
+    Returns:
+        dict: manifest data or None if the file doesn't exist or can't be
+            read.
+    """
+    if not os.path.isfile(file_path):
+        return None
+    try:
+        with open(file_path) as data_file:
+            data = json.load(data_file)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or \
+            data.get('version') != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def write_manifest(file_path, entries, signature=None, paths=None):
+    """
+    Args:
+        file_path (str): manifest file path.
+        entries (list[dict]): manifest entries.
+        signature (list): entry points the manifest was built from.
+        paths (list): "sys.path" modification times from "path_signature".
+    """
+    data = {
+        'version': MANIFEST_VERSION,
+        'signature': signature or [],
+        'paths': paths or [],
+        'nodes': sorted(entries, key=lambda e: e['type']),
+    }
+    dir_path = os.path.dirname(file_path)
+    if dir_path and not os.path.isdir(dir_path):
+        os.makedirs(dir_path)
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'w') as data_file:
+        json.dump(data, data_file, indent=2, sort_keys=True)
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    os.rename(temp_path, file_path)
+
+
+def _entry_points(group):
+    """
+    Returns:
+        list[tuple]: (entry point, distribution name, distribution version)
+            of the installed entry points in the group.
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        metadata = None
+    if metadata:
+        found = []
+        for dist in metadata.distributions():
+            for ep in dist.entry_points:
+                if ep.group == group:
+                    found.append((ep, dist.metadata['Name'], dist.version))
+        return found
+    try:
+        import pkg_resources
+    except ImportError:
+        return []
+    return [(ep, ep.dist.project_name, ep.dist.version)
+            for ep in pkg_resources.iter_entry_points(group)]
+
+
+def _entry_point_value(entry_point):
+    if hasattr(entry_point, 'value'):
+        return entry_point.value
+    # pkg_resources entry point.
+    return '{}:{}'.format(entry_point.module_name,
+                          '.'.join(entry_point.attrs))
+
+
+def path_signature():
+    """
+    Returns:
+        list[list]: [<path>, <mtime>] of the "sys.path" entries, installing
+            or removing a package changes the modification time of its
+            site-packages directory (nothing is listed or imported).
+    """
+    signature = []
+    # the current directory ("") isn't a package install location.
+    for path in filter(None, sys.path):
+        try:
+            signature.append([path, os.stat(path).st_mtime])
+        except (IOError, OSError):
+            continue
+    return signature
+
+
+def entry_point_signature(group=ENTRY_POINT_GROUP):
+    """
+    Args:
+        group (str): entry point group.
+
+    Returns:
+        list[str]: sorted "<dist>==<version> <name>=<module>:<class>" of the
+            installed entry points, upgrading a package that publishes
+            nodes changes the signature (nothing is imported).
+    """
+    return sorted('{}=={} {}={}'.format(dist, version, ep.name,
+                                        _entry_point_value(ep))
+                  for ep, dist, version in _entry_points(group))
+
+
+def entry_point_entries(group=ENTRY_POINT_GROUP):
+    """
+    Import the node classes of the entry points, the entry points that
+    can't be loaded are reported and skipped.
+
+    Args:
+        group (str): entry point group.
+
+    Returns:
+        list[dict]: manifest entries.
+    """
+    entries = []
+    for ep, dist, _ in _entry_points(group):
+        try:
+            entries.append(manifest_entry(ep.load()))
+        except Exception as e:
+            # a broken package must not break the other node types.
+            print('can\'t load node entry point {} from {}: {}'.format(
+                ep.name, dist, e))
+    return entries
@@ -1,4 +1,5 @@
 #!/usr/bin/python
+from .node_property import compile_schema
 
 
 class classproperty(object):
@@ -19,11 +20,29 @@ class NodePlugin(object):
 
     NODE_NAME = None
 
+    # typed node properties {<name>: <NodeGraphQt.NodeProperty>}
+    PROPERTIES = {}
+
     def __init__(self, node=None):
         assert node, 'node cannot be None.'
         self._item = node
         self._item.type = self.type
         self._item.name = self.NODE_NAME
+        self._init_properties()
+
+    def _init_properties(self):
+        cls = self.__class__
+        if '_property_schema' not in cls.__dict__:
+            # node class that wasn't registered with the node vendor.
+            compile_schema(cls)
+        if not len(cls._property_schema):
+            return
+        item_cls = self._item.__class__
+        schema = cls._item_schemas.get(item_cls)
+        if schema is None:
+            schema = self._item.property_schema.merged(cls._property_schema)
+            cls._item_schemas[item_cls] = schema
+        self._item.set_property_schema(schema)
 
     def __repr__(self):
         return '{}(\'{}\')'.format(self.type, self.NODE_NAME)
@@ -197,12 +216,15 @@ class NodePlugin(object):
             name (str): name of the property.
             value: the new property value.
         """
-        if not self.item.properties.get(name):
+        if not self.item.has_property(name):
             raise KeyError('node has no property "{}"'.format(name))
-        if not isinstance(value, type(self.item.properties[name])):
-            te = 'property "{}" value type must be of {}'
-            raise TypeError(te.format(name, type(self.item.properties[name])))
-        self.item.set_property(name, value)
+        value = self.item.validate_property(name, value)
+        viewer = self.item.viewer()
+        if viewer:
+            # undoable and recorded to the session journal.
+            viewer.set_node_property(self.item, name, value)
+        else:
+            self.item.set_property(name, value)
 
     def has_property(self, name):
         """
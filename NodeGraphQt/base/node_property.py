@@ -0,0 +1,206 @@
+#!/usr/bin/python
+import copy
+from collections import OrderedDict
+
+try:
+    _string_types = (basestring,)
+except NameError:
+    _string_types = (str,)
+
+_mutable = (list, dict, set)
+
+
+class NodeProperty(object):
+    """
+    Typed node property declaration.
+
+    eg.
+        class FooNode(Node):
+            PROPERTIES = {
+                'size': NodeProperty(1.0),
+                'label': NodeProperty('foo'),
+                'cache': NodeProperty({}, serialize=False),
+                'icon': NodeProperty('', nullable=True)
+            }
+    """
+
+    __slots__ = ('name', 'default', 'value_type', 'serialize', 'nullable')
+
+    def __init__(self, default, value_type=None, serialize=True,
+                 nullable=False):
+        """
+        Args:
+            default: default value.
+            value_type (type): value type (defaults to the default type).
+            serialize (bool): false to leave the property out of the
+                saved session.
+            nullable (bool): true to also accept None as a value.
+        """
+        self.name = None
+        self.default = default
+        self.value_type = value_type or type(default)
+        self.serialize = serialize
+        self.nullable = nullable
+
+    def __repr__(self):
+        return '{}(\'{}\', {})'.format(
+            self.__class__.__name__, self.name, self.value_type.__name__)
+
+    def validate(self, value):
+        """
+        Returns the value as the property type.
+
+        Args:
+            value: new property value.
+
+        Returns:
+            object: validated value.
+        """
+        value_type = self.value_type
+        if type(value) is value_type or isinstance(value, value_type):
+            return value
+        if value is None and self.nullable:
+            return value
+        # values coming back from json.
+        if value_type is tuple and isinstance(value, list):
+            return tuple(value)
+        if value_type is float and isinstance(value, int) \
+                and not isinstance(value, bool):
+            return float(value)
+        if issubclass(value_type, _string_types) \
+                and isinstance(value, _string_types):
+            return value
+        raise TypeError('property "{}" has to be a {} type not {}.'.format(
+            self.name, value_type.__name__, type(value).__name__))
+
+
+def _compile_setter(item_cls, prop):
+    name = prop.name
+    validate = prop.validate
+    attr = getattr(item_cls, name, None)
+    if isinstance(attr, property) and attr.fset:
+        fset = attr.fset
+
+        def setter(item, value):
+            value = validate(value)
+            fset(item, value)
+            return value
+    else:
+        def setter(item, value):
+            value = validate(value)
+            item._properties[name] = value
+            return value
+    return setter
+
+
+class PropertySchema(object):
+    """
+    The typed properties of a node, the validated setters are compiled
+    once per node item class.
+    """
+
+    def __init__(self, properties=None):
+        """
+        Args:
+            properties (dict): {<name>: <NodeProperty>}
+        """
+        self._properties = OrderedDict()
+        self._serialized = ()
+        self._setters = {}
+        for name, prop in (properties or {}).items():
+            self.add(name, prop)
+
+    def __contains__(self, name):
+        return name in self._properties
+
+    def __iter__(self):
+        return iter(self._properties.values())
+
+    def __len__(self):
+        return len(self._properties)
+
+    def add(self, name, prop):
+        """
+        Add a property to the schema.
+
+        Args:
+            name (str): property name.
+            prop (NodeProperty): property declaration.
+        """
+        prop.name = name
+        self._properties[name] = prop
+        self._serialized = tuple(
+            n for n, p in self._properties.items() if p.serialize)
+        self._setters = {}
+
+    def get(self, name):
+        """
+        Args:
+            name (str): property name.
+
+        Returns:
+            NodeProperty: property declaration or None.
+        """
+        return self._properties.get(name)
+
+    def merged(self, other):
+        """
+        Returns:
+            PropertySchema: new schema with the properties of both schemas.
+        """
+        schema = PropertySchema(self._properties)
+        for prop in other:
+            schema.add(prop.name, prop)
+        return schema
+
+    def defaults(self):
+        """
+        Returns:
+            dict: default property values.
+        """
+        return {n: copy.copy(p.default) if isinstance(p.default, _mutable)
+                else p.default for n, p in self._properties.items()}
+
+    def serialized(self):
+        """
+        Returns:
+            tuple: names of the properties saved with the session.
+        """
+        return self._serialized
+
+    def setters(self, item_cls):
+        """
+        Returns the validated property setters for the node item class.
+
+        Args:
+            item_cls (type): node item class.
+
+        Returns:
+            dict: {<name>: <function(item, value)>}
+        """
+        setters = self._setters.get(item_cls)
+        if setters is None:
+            setters = {n: _compile_setter(item_cls, p)
+                       for n, p in self._properties.items()}
+            self._setters[item_cls] = setters
+        return setters
+
+
+def compile_schema(node_cls):
+    """
+    Compile the properties declared on the node class and its base classes
+    with the "PROPERTIES" attribute into the class property schema.
+
+    Args:
+        node_cls (NodeGraphQt.base.node_plugin.NodePlugin): node class.
+
+    Returns:
+        PropertySchema: compiled schema.
+    """
+    properties = OrderedDict()
+    for cls in reversed(node_cls.__mro__):
+        properties.update(cls.__dict__.get('PROPERTIES') or {})
+    schema = PropertySchema(properties)
+    node_cls._property_schema = schema
+    node_cls._item_schemas = {}
+    return schema
@@ -1,15 +1,30 @@
 #!/usr/bin/python
+import importlib
+
+from .node_manifest import (ENTRY_POINT_GROUP,
+                            entry_point_entries,
+                            entry_point_signature,
+                            manifest_entry,
+                            path_signature,
+                            read_manifest,
+                            write_manifest)
+from .node_property import compile_schema
 
 
 class _NodeVendor(object):
     """
     Node manager that stores all the node types.
+
+    Node types can be registered lazily from a manifest, their module is
+    imported the first time the node type is created.
     """
 
     def __init__(self):
         self._aliases = {}
         self._names = {}
         self._nodes = {}
+        self._lazy = {}
+        self._revision = 0
 
     @property
     def names(self):
@@ -23,6 +38,30 @@ class _NodeVendor(object):
     def nodes(self):
         return self._nodes
 
+    @property
+    def lazy_nodes(self):
+        """
+        Returns:
+            dict: {<node type>: <manifest entry>} of the node types that
+                haven't been imported yet.
+        """
+        return self._lazy
+
+    def node_types(self):
+        """
+        Returns:
+            list[str]: registered node types including the lazy node types.
+        """
+        return list(self._nodes.keys()) + list(self._lazy.keys())
+
+    @property
+    def revision(self):
+        """
+        Returns:
+            int: counter incremented every time a node is registered.
+        """
+        return self._revision
+
     def create_node_instance(self, node_type=None, alias=None):
         """
         create node class by the node type identifier or alias.
@@ -37,6 +76,8 @@ class _NodeVendor(object):
         if alias and self.aliases.get(alias):
             node_type = self.aliases[alias]
 
+        if node_type in self._lazy:
+            self._import_node(node_type)
         NodeInstance = self._nodes.get(node_type)
         if not NodeInstance:
             print('can\'t find node type {}'.format(node_type))
@@ -55,6 +96,9 @@ class _NodeVendor(object):
 
         name = node.NODE_NAME
         node_type = node.type
+        if node_type in self._lazy:
+            entry = self._unregister_lazy(node_type)
+            alias = alias or entry.get('alias')
 
         if self._nodes.get(node_type):
             raise AssertionError(
@@ -62,6 +106,7 @@ class _NodeVendor(object):
                 'Please specify a new plugin class name or identifier.'
                 .format(node_type))
         self._nodes[node_type] = node
+        compile_schema(node)
 
         if self._names.get(node_type):
             raise AssertionError(
@@ -75,6 +120,138 @@ class _NodeVendor(object):
                 raise AssertionError(
                     'Node Alias: {} already taken!'.format(alias))
             self._aliases[alias] = node_type
+        self._revision += 1
+
+    def register_lazy(self, node_type, name, module, class_name,
+                      alias=None):
+        """
+        register a node type without importing its module, the module is
+        imported when the node type is first created.
+
+        Args:
+            node_type (str): node type identifier.
+            name (str): node name.
+            module (str): module path of the node class.
+            class_name (str): node class name.
+            alias (str): custom alias for the node (optional).
+        """
+        if node_type in self._nodes or node_type in self._lazy:
+            raise AssertionError(
+                'Node: {} already exists! '
+                'Please specify a new plugin class name or identifier.'
+                .format(node_type))
+        if alias and self._aliases.get(alias):
+            raise AssertionError(
+                'Node Alias: {} already taken!'.format(alias))
+        self._lazy[node_type] = {
+            'type': node_type, 'name': name, 'module': module,
+            'class': class_name, 'alias': alias
+        }
+        self._names[name] = node_type
+        if alias:
+            self._aliases[alias] = node_type
+        self._revision += 1
+
+    def _unregister_lazy(self, node_type):
+        entry = self._lazy.pop(node_type)
+        if self._names.get(entry['name']) == node_type:
+            del self._names[entry['name']]
+        alias = entry.get('alias')
+        if alias and self._aliases.get(alias) == node_type:
+            del self._aliases[alias]
+        return entry
+
+    def _import_node(self, node_type):
+        """
+        Import and register the node class of a lazy node type, the lazy
+        entry is kept if the node class can't be imported.
+
+        Returns:
+            bool: true if the node type has been registered.
+        """
+        entry = self._lazy[node_type]
+        try:
+            module = importlib.import_module(entry['module'])
+            node = getattr(module, entry['class'])
+        except Exception as e:
+            # a missing or broken node module must not break node creation.
+            print('can\'t import node type {} from {}.{}: {}'.format(
+                node_type, entry['module'], entry['class'], e))
+            return False
+        if node.type != node_type:
+            print('node class {}.{} has the type {} not {}'.format(
+                entry['module'], entry['class'], node.type, node_type))
+            return False
+        self.register_node(node)
+        return True
+
+    def load_manifest(self, file_path):
+        """
+        register the node types declared in a manifest file lazily.
+
+        Args:
+            file_path (str): manifest file path.
+
+        Returns:
+            bool: false if the manifest couldn't be read.
+        """
+        data = read_manifest(file_path)
+        if data is None:
+            return False
+        self._register_entries(data.get('nodes', []))
+        return True
+
+    def _register_entries(self, entries):
+        for entry in entries:
+            if entry['type'] in self._nodes or entry['type'] in self._lazy:
+                continue
+            self.register_lazy(entry['type'], entry['name'],
+                               entry['module'], entry['class'],
+                               entry.get('alias'))
+
+    def save_manifest(self, file_path):
+        """
+        Write all the registered node types to a manifest file.
+
+        Args:
+            file_path (str): manifest file path.
+        """
+        aliases = dict((v, k) for k, v in self._aliases.items())
+        entries = [manifest_entry(node, aliases.get(node_type))
+                   for node_type, node in self._nodes.items()]
+        for entry in self._lazy.values():
+            entries.append(dict((k, v) for k, v in entry.items() if v))
+        write_manifest(file_path, entries)
+
+    def load_entry_points(self, group=ENTRY_POINT_GROUP, cache_path=None):
+        """
+        register the node types published by the installed packages under
+        the entry point group.
+
+        With a cache path the node types are registered lazily from the
+        cache while the "sys.path" directories are unmodified, otherwise
+        the entry points are listed and only imported when they differ
+        from the cached manifest.
+
+        Args:
+            group (str): entry point group.
+            cache_path (str): manifest cache file path (optional).
+        """
+        data = None
+        if cache_path:
+            paths = path_signature()
+            data = read_manifest(cache_path)
+            if data and data.get('paths') == paths:
+                self._register_entries(data.get('nodes', []))
+                return
+        signature = entry_point_signature(group)
+        if data and data.get('signature') == signature:
+            entries = data.get('nodes', [])
+        else:
+            entries = entry_point_entries(group)
+        if cache_path:
+            write_manifest(cache_path, entries, signature, paths)
+        self._register_entries(entries)
 
 
 NodeVendor = _NodeVendor()
@@ -0,0 +1,248 @@
+#!/usr/bin/python
+"""
+Fuzzy search index for the registered node types.
+
+The index is built once from the node names, aliases and type
+identifiers and only needs rebuilding when the node registry changes.
+A query matches a key when its characters appear in order, each matched
+character scores bonuses for contiguous runs, word starts and the prefix,
+then the matches are boosted by how recently the node type was used.
+
+    index = SearchIndex()
+    index.build(NodeVendor.names, NodeVendor.aliases)
+    index.search('mth add', limit=10)
+"""
+import heapq
+
+_SEPARATORS = ' ._-/:'
+
+# key weights of the node (name, alias, type identifier).
+_NAME_WEIGHT = 1.0
+_ALIAS_WEIGHT = 0.9
+_TYPE_WEIGHT = 0.6
+
+# match scores of each query character.
+_CHAR_SCORE = 10.0
+_WORD_START_BONUS = 25.0
+_RUN_BONUS = 15.0
+_PREFIX_BONUS = 20.0
+_LENGTH_PENALTY = 0.5
+
+
+def _word_starts(text):
+    """
+    Returns:
+        frozenset: indexes of the first character of each word in the text
+            (after a separator or a lower to upper case change).
+    """
+    starts = set()
+    prev = ''
+    for i, char in enumerate(text):
+        if not prev or prev in _SEPARATORS:
+            starts.add(i)
+        elif char.isupper() and prev.islower():
+            starts.add(i)
+        prev = char
+    return frozenset(starts)
+
+
+def _positions(text, char):
+    positions = []
+    i = text.find(char)
+    while i != -1:
+        positions.append(i)
+        i = text.find(char, i + 1)
+    return positions
+
+
+def _score_char(i, starts):
+    if i in starts:
+        return _CHAR_SCORE + _WORD_START_BONUS
+    return _CHAR_SCORE
+
+
+def fuzzy_score(query, text, starts=frozenset()):
+    """
+    Score the query as an in order subsequence of the text.
+
+    Every matched character scores on the same scale, with bonuses for
+    matching a word start, continuing a contiguous run and matching the
+    first character of the text. The best alignment of the query is
+    scored so "ti" prefers the word starts of "Text Input" over the
+    substring in "Multiply".
+
+    Args:
+        query (str): lower case search text.
+        text (str): lower case key.
+        starts (frozenset): word start indexes of the key.
+
+    Returns:
+        float: match score or None if the query doesn't match.
+    """
+    if not query:
+        return 0.0
+    # quick in order check before scoring the alignments.
+    start = 0
+    for char in query:
+        start = text.find(char, start) + 1
+        if not start:
+            return None
+
+    # [(text index, best score of the query so far ending there), ...]
+    prev = [(i, _score_char(i, starts) + (_PREFIX_BONUS if i == 0 else 0.0))
+            for i in _positions(text, query[0])]
+    for char in query[1:]:
+        row = []
+        k = 0
+        best = None
+        for i in _positions(text, char):
+            # best score of the previous character before "i - 1".
+            while k < len(prev) and prev[k][0] < i - 1:
+                if best is None or prev[k][1] > best:
+                    best = prev[k][1]
+                k += 1
+            score = best
+            if k < len(prev) and prev[k][0] == i - 1:
+                run = prev[k][1] + _RUN_BONUS
+                if score is None or run > score:
+                    score = run
+            if score is not None:
+                row.append((i, score + _score_char(i, starts)))
+        if not row:
+            return None
+        prev = row
+    return max(score for _, score in prev) - len(text) * _LENGTH_PENALTY
+
+
+class _Entry(object):
+
+    __slots__ = ('node_type', 'label', 'keys')
+
+    def __init__(self, node_type, label):
+        self.node_type = node_type
+        self.label = label
+        # [(weight, lower case key, word starts), ...]
+        self.keys = []
+
+    def add_key(self, key, weight):
+        self.keys.append((weight, key.lower(), _word_starts(key)))
+
+    def score(self, query):
+        best = None
+        for weight, key, starts in self.keys:
+            score = fuzzy_score(query, key, starts)
+            if score is None:
+                continue
+            score *= weight
+            if best is None or score > best:
+                best = score
+        return best
+
+
+class SearchIndex(object):
+    """
+    Prebuilt fuzzy search index over the node names, aliases and type
+    identifiers.
+
+    Each keystroke only rescores the entries matched by the previous query
+    when the new query extends it, and only the top results are sorted.
+    """
+
+    def __init__(self, recent_limit=10):
+        """
+        Args:
+            recent_limit (int): number of recently used node types boosted
+                in the results.
+        """
+        self._entries = []
+        self._revision = None
+        self._recent = []
+        self._recent_limit = recent_limit
+        self._last_query = None
+        self._last_matches = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def revision(self):
+        return self._revision
+
+    def build(self, names, aliases=None, revision=None):
+        """
+        Rebuild the index.
+
+        Args:
+            names (dict): {<node name>: <node type>}
+            aliases (dict): {<alias>: <node type>} (optional).
+            revision (int): node registry revision the index is built from.
+        """
+        entries = {}
+        for name, node_type in names.items():
+            entry = _Entry(node_type, name)
+            entry.add_key(name, _NAME_WEIGHT)
+            entry.add_key(node_type, _TYPE_WEIGHT)
+            entries[node_type] = entry
+        for alias, node_type in (aliases or {}).items():
+            if node_type in entries:
+                entries[node_type].add_key(alias, _ALIAS_WEIGHT)
+        self._entries = sorted(entries.values(), key=lambda e: e.label)
+        self._revision = revision
+        self._last_query = None
+        self._last_matches = None
+
+    def record_use(self, node_type):
+        """
+        Boost the node type in the following searches.
+
+        Args:
+            node_type (str): node type identifier.
+        """
+        if node_type in self._recent:
+            self._recent.remove(node_type)
+        self._recent.insert(0, node_type)
+        del self._recent[self._recent_limit:]
+
+    def _boost(self, node_type):
+        if node_type not in self._recent:
+            return 0.0
+        return (self._recent_limit - self._recent.index(node_type)) * 10.0
+
+    def _match(self, query):
+        candidates = self._entries
+        if self._last_query is not None and \
+                query.startswith(self._last_query):
+            # a longer query can only match a subset of the previous one.
+            candidates = self._last_matches
+        matches = []
+        for entry in candidates:
+            score = entry.score(query)
+            if score is not None:
+                matches.append((entry, score))
+        self._last_query = query
+        self._last_matches = [entry for entry, _ in matches]
+        return matches
+
+    def search(self, query, limit=10):
+        """
+        Args:
+            query (str): search text.
+            limit (int): max number of results.
+
+        Returns:
+            list[tuple]: best matches [(<node name>, <node type>), ...].
+        """
+        # white space is ignored so "mth add" matches "MathAdd".
+        query = ''.join(query.split()).lower()
+        if not query:
+            recent = [e for e in self._entries if e.node_type in self._recent]
+            recent.sort(key=lambda e: self._recent.index(e.node_type))
+            others = [e for e in self._entries
+                      if e.node_type not in self._recent]
+            return [(e.label, e.node_type)
+                    for e in (recent + others)[:limit]]
+        scored = [(score + self._boost(entry.node_type), entry)
+                  for entry, score in self._match(query)]
+        best = heapq.nlargest(limit, scored, key=lambda s: s[0])
+        best.sort(key=lambda s: (-s[0], s[1].label))
+        return [(entry.label, entry.node_type) for _, entry in best]
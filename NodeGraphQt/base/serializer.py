@@ -1,7 +1,11 @@
 import json
 import os
+import zlib
 
 from ..base.node_vendor import NodeVendor
+from ..base.session_journal import load_session
+from ..base.session_reader import INDEXED_SESSION_EXT, write_indexed_session
+from ..base.session_schema import SCHEMA_VERSION, upgrade_session
 
 
 class SessionSerializer(object):
@@ -58,6 +62,7 @@ class SessionSerializer(object):
         Returns:
             dict: serialized session layout.
                 {
+                    'schema_version': <int>,
                     'nodes': {<node_id>: <node_dict>},
                         'connections': [{
                             'in': [<node_id>, <input_port.name>],
@@ -69,7 +74,9 @@ class SessionSerializer(object):
         pipes = pipes or self.pipes
         node_serials = self.serialize_nodes(nodes)
         pipe_serials = [self.serialize_pipe_connection(p) for p in pipes]
-        return {'nodes': node_serials, 'connections': pipe_serials}
+        return {'schema_version': SCHEMA_VERSION,
+                'nodes': node_serials,
+                'connections': pipe_serials}
 
     def serialize_to_str(self):
         """
@@ -78,8 +85,41 @@ class SessionSerializer(object):
         """
         return json.dumps(self.serialize_layout(), indent=2)
 
+    def serialize_to_bytes(self):
+        """
+        Returns:
+            bytes: compact zlib compressed json session layout.
+        """
+        return self.layout_to_bytes(self.serialize_layout())
+
+    @staticmethod
+    def layout_to_bytes(layout):
+        """
+        Args:
+            layout (dict): session layout from "serialize_layout".
+
+        Returns:
+            bytes: compact zlib compressed json session layout.
+        """
+        data = json.dumps(layout, separators=(',', ':'))
+        return zlib.compress(data.encode('utf-8'))
+
+    @staticmethod
+    def deserialize_bytes(data):
+        """
+        Args:
+            data (bytes): data from "serialize_to_bytes".
+
+        Returns:
+            dict: session layout.
+        """
+        return json.loads(zlib.decompress(data).decode('utf-8'))
+
     def write(self, file_path):
         file_path = file_path.strip()
+        if file_path.endswith(INDEXED_SESSION_EXT):
+            write_indexed_session(file_path, self.serialize_layout())
+            return
         with open(file_path, 'w') as file_out:
             json.dump(
                 self.serialize_layout(),
@@ -156,7 +196,7 @@ class SessionLoader(object):
                 connection_ports.append((in_port, out_port))
         return connection_ports
 
-    def load_data(self, data):
+    def load_data(self, data, restore_ids=False):
         """
         build the node layout from dict.
 
@@ -171,7 +211,10 @@ class SessionLoader(object):
 
         Args:
             data (dict): node id and object {node_id: node_item}
+            restore_ids (bool): give the nodes their ids from the data so
+                the change journal records match the session file.
         """
+        data = upgrade_session(data)
         nodes = {}
 
         # parse the nodes.
@@ -187,13 +230,15 @@ class SessionLoader(object):
 
             # set the attributes.
             node.from_dict(attrs)
+            if restore_ids and not self.viewer.scene().get_node(node_id):
+                node.id = node_id
             nodes[node_id] = node
 
         # parse the connections.
         for connection in data.get('connections', []):
             node_start = nodes.get(connection['in'][0])
             node_end = nodes.get(connection['out'][0])
-            if not node_start and node_end:
+            if not (node_start and node_end):
                 continue
             port_in = None
             if node_start.inputs:
@@ -248,9 +293,9 @@ class SessionLoader(object):
         if not os.path.isfile(file_path):
             return
         try:
-            with open(file_path) as data_file:
-                data = json.load(data_file)
+            # the session file with its change journal replayed on top.
+            data = load_session(file_path)
         except Exception as e:
             print('Cannot read data from clipboard.\n{}'.format(e))
 
-        return [node for nid, node in self.load_data(data).items()]
+        return [node for nid, node in self.load_data(data, True).items()]
@@ -0,0 +1,177 @@
+#!/usr/bin/python
+import json
+import os
+from collections import OrderedDict
+
+from .session_reader import SessionReader, is_indexed_session
+from .session_schema import upgrade_session
+
+JOURNAL_EXT = '.journal'
+
+# number of records after which the journal should be compacted into a
+# full session snapshot.
+JOURNAL_COMPACT_LIMIT = 5000
+
+
+class SessionJournal(object):
+    """
+    Append only change log stored next to a session file.
+
+    Each change is written as a json line record, the session is the last
+    full snapshot with the journal records replayed on top:
+
+        {"op": "create", "nodes": {<node_id>: <node_dict>}}
+        {"op": "delete", "ids": [<node_id>]}
+        {"op": "connect", "in": [<node_id>, <port>], "out": [...]}
+        {"op": "disconnect", "in": [<node_id>, <port>], "out": [...]}
+        {"op": "move", "ids": [<node_id>], "pos": [x0, y0, x1, y1...]}
+        {"op": "property", "id": <node_id>, "name": <name>, "value": ...}
+        {"op": "widget", "id": <node_id>, "name": <name>, "value": ...}
+    """
+
+    def __init__(self, session_path, compact_limit=JOURNAL_COMPACT_LIMIT):
+        self._path = session_path + JOURNAL_EXT
+        self._compact_limit = compact_limit
+        self._file = None
+        self._count = 0
+        if os.path.isfile(self._path):
+            with open(self._path) as journal_file:
+                self._count = sum(1 for _ in journal_file)
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def path(self):
+        return self._path
+
+    def needs_compaction(self):
+        """
+        Returns:
+            bool: true if the journal is over the compaction limit.
+        """
+        return self._count >= self._compact_limit
+
+    def record(self, op, **data):
+        """
+        Append a change record to the journal.
+
+        Args:
+            op (str): change operation.
+            **data: record data.
+        """
+        data['op'] = op
+        if self._file is None:
+            self._file = open(self._path, 'a')
+        self._file.write(json.dumps(data, separators=(',', ':')) + '\n')
+        self._count += 1
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def records(self):
+        """
+        Returns:
+            list[dict]: journal records, a truncated last record from an
+                interrupted write is ignored.
+        """
+        self.flush()
+        records = []
+        if not os.path.isfile(self._path):
+            return records
+        with open(self._path) as journal_file:
+            for line in journal_file:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return records
+
+    def clear(self):
+        """
+        Empty the journal once the session has been saved in full.
+        """
+        self.close()
+        if os.path.isfile(self._path):
+            os.remove(self._path)
+        self._count = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+
+
+def replay(data, records):
+    """
+    Apply the journal records to a serialized session layout.
+
+    Args:
+        data (dict): session layout from "SessionSerializer".
+        records (list[dict]): journal records.
+
+    Returns:
+        dict: updated session layout.
+    """
+    nodes = data.setdefault('nodes', {})
+    connections = OrderedDict()
+    for conn in data.get('connections', []):
+        key = tuple(conn['in']) + tuple(conn['out'])
+        connections[key] = conn
+
+    for record in records:
+        op = record.get('op')
+        if op == 'create':
+            nodes.update(record['nodes'])
+        elif op == 'delete':
+            ids = set(record['ids'])
+            for node_id in ids:
+                nodes.pop(node_id, None)
+            for key in [k for k in connections
+                        if k[0] in ids or k[2] in ids]:
+                del connections[key]
+        elif op == 'connect':
+            key = tuple(record['in']) + tuple(record['out'])
+            connections[key] = {'in': record['in'], 'out': record['out']}
+        elif op == 'disconnect':
+            key = tuple(record['in']) + tuple(record['out'])
+            connections.pop(key, None)
+        elif op == 'move':
+            pos = record['pos']
+            for i, node_id in enumerate(record['ids']):
+                if node_id in nodes:
+                    nodes[node_id]['pos'] = [pos[i * 2], pos[i * 2 + 1]]
+        elif op == 'property':
+            if record['id'] in nodes:
+                nodes[record['id']][record['name']] = record['value']
+        elif op == 'widget':
+            if record['id'] in nodes:
+                widgets = nodes[record['id']].setdefault('widgets', {})
+                widgets[record['name']] = record['value']
+
+    data['connections'] = list(connections.values())
+    return data
+
+
+def load_session(file_path):
+    """
+    Read the session file with its journal replayed on top.
+
+    Args:
+        file_path (str): session file path.
+
+    Returns:
+        dict: session layout.
+    """
+    data = {}
+    if is_indexed_session(file_path):
+        with SessionReader(file_path) as reader:
+            data = reader.layout()
+    elif os.path.isfile(file_path):
+        with open(file_path) as data_file:
+            data = json.load(data_file)
+    # the journal records are always written with the current schema.
+    data = upgrade_session(data)
+    journal = SessionJournal(file_path)
+    return replay(data, journal.records())
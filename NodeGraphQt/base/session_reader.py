@@ -0,0 +1,357 @@
+#!/usr/bin/python
+import json
+import mmap
+import struct
+from collections import Counter
+
+INDEXED_SESSION_EXT = '.ngqtx'
+INDEXED_SESSION_MAGIC = b'NGQTIDX\x00'
+INDEXED_SESSION_VERSION = 3
+
+# magic and format version shared by all the versions.
+_PREFIX = struct.Struct('<8sI')
+# magic, version, session schema version, node count, connection count
+# then the (offset, length) of the node ids, node types, offset table,
+# connections, connection offset table and node connection table sections.
+_HEADER = struct.Struct('<8sIIII12Q')
+# version 2 headers have no connection tables.
+_HEADER_V2 = struct.Struct('<8sIII8Q')
+# version 1 headers have no session schema version.
+_HEADER_V1 = struct.Struct('<8sII8Q')
+
+
+def _dumps(data):
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def write_indexed_session(file_path, data):
+    """
+    Write the session layout to the indexed session format.
+
+    The node records are stored as separate compact json blobs followed
+    by the node ids, the node types and a table with the offset, length
+    and type of each record so nodes can be read without parsing the
+    whole file.
+
+    The connections are written as a json list followed by a table with
+    the offset and length of each connection record and a table with the
+    connections of each node, so the connections of a node can be read
+    without parsing the others.
+
+    Args:
+        file_path (str): file path.
+        data (dict): session layout from "SessionSerializer".
+    """
+    nodes = data.get('nodes', {})
+    node_ids = list(nodes.keys())
+    types = []
+    type_indices = {}
+    offsets = []
+    lengths = []
+    node_types = []
+    with open(file_path, 'wb') as file_out:
+        file_out.write(b'\x00' * _HEADER.size)
+        for node_id in node_ids:
+            node_data = nodes[node_id]
+            node_type = node_data.get('type', '')
+            if node_type not in type_indices:
+                type_indices[node_type] = len(types)
+                types.append(node_type)
+            record = _dumps(node_data)
+            offsets.append(file_out.tell())
+            lengths.append(len(record))
+            node_types.append(type_indices[node_type])
+            file_out.write(record)
+
+        count = len(node_ids)
+        sections = [
+            _dumps(node_ids),
+            _dumps(types),
+            struct.pack('<{0}Q{0}I{0}I'.format(count),
+                        *(offsets + lengths + node_types)),
+        ]
+        header = []
+        for section in sections:
+            header += [file_out.tell(), len(section)]
+            file_out.write(section)
+
+        connections = data.get('connections', [])
+        node_indices = {nid: i for i, nid in enumerate(node_ids)}
+        node_links = [[] for _ in node_ids]
+        conn_offsets = []
+        conn_lengths = []
+        start = file_out.tell()
+        file_out.write(b'[')
+        for i, connection in enumerate(connections):
+            if i:
+                file_out.write(b',')
+            record = _dumps(connection)
+            conn_offsets.append(file_out.tell())
+            conn_lengths.append(len(record))
+            file_out.write(record)
+            for nid in set((connection['in'][0], connection['out'][0])):
+                if nid in node_indices:
+                    node_links[node_indices[nid]].append(i)
+        file_out.write(b']')
+        header += [start, file_out.tell() - start]
+
+        # node connection table: the start of the connections of each node
+        # followed by the connection indices of all the nodes.
+        starts = [0]
+        links = []
+        for node_link in node_links:
+            links += node_link
+            starts.append(len(links))
+        sections = [
+            struct.pack('<{0}Q{0}I'.format(len(connections)),
+                        *(conn_offsets + conn_lengths)),
+            struct.pack('<{}I{}I'.format(count + 1, len(links)),
+                        *(starts + links)),
+        ]
+        for section in sections:
+            header += [file_out.tell(), len(section)]
+            file_out.write(section)
+
+        file_out.seek(0)
+        file_out.write(_HEADER.pack(INDEXED_SESSION_MAGIC,
+                                    INDEXED_SESSION_VERSION,
+                                    data.get('schema_version', 0),
+                                    count, len(connections), *header))
+
+
+def is_indexed_session(file_path):
+    """
+    Args:
+        file_path (str): session file path.
+
+    Returns:
+        bool: true if the file is in the indexed session format.
+    """
+    try:
+        with open(file_path, 'rb') as file_in:
+            return file_in.read(len(INDEXED_SESSION_MAGIC)) == \
+                INDEXED_SESSION_MAGIC
+    except (IOError, OSError):
+        return False
+
+
+class SessionReader(object):
+    """
+    Read only random access to an indexed session file.
+
+    The file is memory mapped and only the requested records are parsed,
+    the reader has no Qt dependency so it can be used by pipeline tools.
+
+    eg.
+        with SessionReader('/path/to/session.ngqtx') as reader:
+            reader.type_histogram()
+            reader.node(reader.node_ids()[0])
+    """
+
+    def __init__(self, file_path):
+        self._file = open(file_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+            magic, version = _PREFIX.unpack_from(self._mmap, 0)
+        except (ValueError, struct.error, mmap.error):
+            self._file.close()
+            raise IOError('"{}" is not an indexed session file.'
+                          .format(file_path))
+        if magic != INDEXED_SESSION_MAGIC:
+            self.close()
+            raise IOError('"{}" is not an indexed session file.'
+                          .format(file_path))
+        try:
+            if version == INDEXED_SESSION_VERSION:
+                header = _HEADER.unpack_from(self._mmap, 0)
+            elif version == 2:
+                header = _HEADER_V2.unpack_from(self._mmap, 0)
+                header = header[:4] + (None,) + header[4:]
+            elif version == 1:
+                header = _HEADER_V1.unpack_from(self._mmap, 0)
+                header = header[:2] + (0,) + header[2:4] + (None,) + \
+                    header[4:]
+            else:
+                header = None
+        except struct.error:
+            header = None
+        if header is None:
+            self.close()
+            raise IOError('"{}" has the unsupported indexed session '
+                          'version {}.'.format(file_path, version))
+        self._version = header[1]
+        self._schema_version = header[2]
+        self._count = header[3]
+        # no connection tables before version 3.
+        self._connection_count = header[4]
+        self._sections = [header[i:i + 2]
+                          for i in range(5, len(header), 2)]
+        self._ids = None
+        self._types = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, node_id):
+        return node_id in self._index()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def schema_version(self):
+        return self._schema_version
+
+    def _section(self, index):
+        offset, length = self._sections[index]
+        return self._mmap[offset:offset + length]
+
+    def _index(self):
+        if self._ids is None:
+            node_ids = json.loads(self._section(0).decode('utf-8'))
+            self._ids = {nid: i for i, nid in enumerate(node_ids)}
+        return self._ids
+
+    def _table(self, column, index):
+        offset = self._sections[2][0]
+        if column == 0:
+            return struct.unpack_from('<Q', self._mmap, offset + index * 8)[0]
+        offset += self._count * 8 + (column - 1) * self._count * 4
+        return struct.unpack_from('<I', self._mmap, offset + index * 4)[0]
+
+    def types(self):
+        """
+        Returns:
+            list[str]: node types in the session.
+        """
+        if self._types is None:
+            self._types = json.loads(self._section(1).decode('utf-8'))
+        return list(self._types)
+
+    def node_ids(self):
+        """
+        Returns:
+            list[str]: node ids in the session.
+        """
+        index = self._index()
+        return sorted(index, key=index.get)
+
+    def node(self, node_id):
+        """
+        Returns the serialized node, only the node record is parsed.
+
+        Args:
+            node_id (str): node id.
+
+        Returns:
+            dict: node data or None if the node isn't in the session.
+        """
+        i = self._index().get(node_id)
+        if i is None:
+            return
+        offset = self._table(0, i)
+        length = self._table(1, i)
+        return json.loads(self._mmap[offset:offset + length].decode('utf-8'))
+
+    def node_type(self, node_id):
+        """
+        Args:
+            node_id (str): node id.
+
+        Returns:
+            str: node type or None if the node isn't in the session.
+        """
+        i = self._index().get(node_id)
+        if i is not None:
+            return self.types()[self._table(2, i)]
+
+    def nodes_of_type(self, node_type):
+        """
+        Args:
+            node_type (str): node type.
+
+        Returns:
+            list[str]: ids of the nodes of the type.
+        """
+        types = self.types()
+        if node_type not in types:
+            return []
+        type_index = types.index(node_type)
+        offset = self._sections[2][0] + self._count * 12
+        node_types = struct.unpack_from('<{}I'.format(self._count),
+                                        self._mmap, offset)
+        node_ids = self.node_ids()
+        return [node_ids[i] for i, t in enumerate(node_types)
+                if t == type_index]
+
+    def type_histogram(self):
+        """
+        Returns:
+            dict: number of nodes per node type.
+        """
+        offset = self._sections[2][0] + self._count * 12
+        node_types = struct.unpack_from('<{}I'.format(self._count),
+                                        self._mmap, offset)
+        types = self.types()
+        return {types[i]: n for i, n in Counter(node_types).items()}
+
+    def connections(self, node_id=None):
+        """
+        Args:
+            node_id (str): only return the connections of this node.
+
+        Returns:
+            list[dict]: connections
+                [{'in': [<node_id>, <port>], 'out': [<node_id>, <port>]}]
+        """
+        if node_id is None:
+            return json.loads(self._section(3).decode('utf-8'))
+        if self._connection_count is None:
+            connections = json.loads(self._section(3).decode('utf-8'))
+            return [c for c in connections
+                    if c['in'][0] == node_id or c['out'][0] == node_id]
+
+        i = self._index().get(node_id)
+        if i is None:
+            return []
+        offset = self._sections[5][0]
+        start, end = struct.unpack_from('<2I', self._mmap, offset + i * 4)
+        links = struct.unpack_from(
+            '<{}I'.format(end - start), self._mmap,
+            offset + (self._count + 1 + start) * 4)
+        table = self._sections[4][0]
+        lengths = table + self._connection_count * 8
+        connections = []
+        for link in links:
+            conn_offset = struct.unpack_from(
+                '<Q', self._mmap, table + link * 8)[0]
+            length = struct.unpack_from(
+                '<I', self._mmap, lengths + link * 4)[0]
+            record = self._mmap[conn_offset:conn_offset + length]
+            connections.append(json.loads(record.decode('utf-8')))
+        return connections
+
+    def layout(self):
+        """
+        Returns:
+            dict: the whole session layout.
+        """
+        return {
+            'schema_version': self._schema_version,
+            'nodes': {nid: self.node(nid) for nid in self.node_ids()},
+            'connections': self.connections()
+        }
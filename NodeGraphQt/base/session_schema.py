@@ -0,0 +1,79 @@
+#!/usr/bin/python
+"""
+Session schema version and the upgrade functions that migrate the raw
+session data from older versions before any node is created.
+"""
+
+# current session schema version, written to every saved session.
+SCHEMA_VERSION = 1
+
+_upgrades = {}
+
+
+def register_upgrade(from_version):
+    """
+    Decorator to register the function that upgrades the session data
+    from the schema version to the next version.
+
+    eg.
+        @register_upgrade(1)
+        def upgrade_v1(data):
+            for node in data['nodes'].values():
+                node['label'] = node.pop('text', '')
+            return data
+
+    Args:
+        from_version (int): schema version the function upgrades from.
+    """
+    def decorator(func):
+        if from_version in _upgrades:
+            raise AssertionError(
+                'upgrade from schema version {} already registered.'
+                .format(from_version))
+        _upgrades[from_version] = func
+        return func
+    return decorator
+
+
+def upgrade_session(data):
+    """
+    Upgrade the raw session data to the current schema version, sessions
+    already at the current version are returned as is.
+
+    Args:
+        data (dict): session layout.
+
+    Returns:
+        dict: upgraded session layout.
+    """
+    version = data.get('schema_version', 0)
+    if version == SCHEMA_VERSION:
+        return data
+    if version > SCHEMA_VERSION:
+        raise ValueError('session schema version {} is newer than the '
+                         'supported version {}.'
+                         .format(version, SCHEMA_VERSION))
+    while version < SCHEMA_VERSION:
+        upgrade = _upgrades.get(version)
+        if not upgrade:
+            raise ValueError('no upgrade from session schema version {}.'
+                             .format(version))
+        data = upgrade(data)
+        version += 1
+    data['schema_version'] = SCHEMA_VERSION
+    return data
+
+
+@register_upgrade(0)
+def _upgrade_v0(data):
+    # unversioned sessions could store the connections as
+    # {'in': {<node_id>: <port>}, 'out': {<node_id>: <port>}}
+    connections = data.get('connections', [])
+    if any(isinstance(c.get('in'), dict) for c in connections):
+        data['connections'] = [
+            {k: list(list(c[k].items())[0]) if isinstance(c[k], dict)
+             else c[k]
+             for k in ('in', 'out')}
+            for c in connections if c.get('in') and c.get('out')
+        ]
+    return data
@@ -0,0 +1,205 @@
+#!/usr/bin/python
+"""
+Batch validation of node graph session files.
+
+The session files are parsed and checked on a process pool without
+creating any Qt items, the results are streamed as json lines.
+
+    python -m NodeGraphQt.base.session_validator /path/to/sessions -r
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from collections import defaultdict, deque
+
+from .session_journal import load_session
+from .session_reader import INDEXED_SESSION_EXT
+
+SESSION_EXTS = ('.ngqt', INDEXED_SESSION_EXT)
+
+# the node types known to the worker processes.
+_node_types = None
+
+
+def _find_cycle_nodes(node_ids, connections):
+    """
+    Returns the nodes that are part of, or downstream of, a cycle.
+    """
+    downstream = defaultdict(list)
+    in_degree = dict.fromkeys(node_ids, 0)
+    for out_id, in_id in connections:
+        downstream[out_id].append(in_id)
+        in_degree[in_id] += 1
+    queue = deque(n for n, d in in_degree.items() if d == 0)
+    while queue:
+        node_id = queue.popleft()
+        for in_id in downstream[node_id]:
+            in_degree[in_id] -= 1
+            if in_degree[in_id] == 0:
+                queue.append(in_id)
+    return sorted(n for n, d in in_degree.items() if d > 0)
+
+
+def validate_session(file_path, node_types=None):
+    """
+    Validate a session file.
+
+    Args:
+        file_path (str): session file path.
+        node_types (set[str]): registered node types, node types are not
+            checked if not specified.
+
+    Returns:
+        dict: validation result eg.
+            {'path': <file_path>, 'ok': False, 'nodes': 2,
+             'connections': 1, 'errors': [{'error': 'missing_node_type',
+             'node': <node_id>, 'type': <node_type>}]}
+    """
+    result = {'path': file_path, 'ok': False,
+              'nodes': 0, 'connections': 0, 'errors': []}
+    try:
+        _check_session(file_path, node_types, result)
+    except Exception as e:
+        # a structurally invalid session must not stop the other files.
+        result['errors'].append({'error': 'invalid_session',
+                                 'message': '{}: {}'.format(
+                                     e.__class__.__name__, e)})
+    result['ok'] = not result['errors']
+    return result
+
+
+def _check_session(file_path, node_types, result):
+    errors = result['errors']
+    try:
+        data = load_session(file_path)
+        nodes = data.get('nodes', {})
+        connections = data.get('connections', [])
+    except Exception as e:
+        errors.append({'error': 'parse_error', 'message': str(e)})
+        return
+    result['nodes'] = len(nodes)
+    result['connections'] = len(connections)
+
+    if node_types is not None:
+        for node_id, attrs in nodes.items():
+            if attrs.get('type') not in node_types:
+                errors.append({'error': 'missing_node_type',
+                               'node': node_id, 'type': attrs.get('type')})
+
+    links = []
+    for connection in connections:
+        try:
+            in_id = connection['in'][0]
+            out_id = connection['out'][0]
+        except (KeyError, IndexError, TypeError):
+            errors.append({'error': 'invalid_connection',
+                           'connection': connection})
+            continue
+        missing = [n for n in (in_id, out_id) if n not in nodes]
+        if missing:
+            errors.append({'error': 'dangling_connection',
+                           'connection': connection, 'nodes': missing})
+            continue
+        links.append((out_id, in_id))
+
+    cycle_nodes = _find_cycle_nodes(nodes.keys(), links)
+    if cycle_nodes:
+        errors.append({'error': 'cycle', 'nodes': cycle_nodes})
+
+
+def _init_worker(node_types):
+    global _node_types
+    _node_types = node_types
+
+
+def _validate_worker(file_path):
+    return validate_session(file_path, _node_types)
+
+
+def find_sessions(paths, recursive=False):
+    """
+    Returns the session files from a list of files and directories.
+
+    Args:
+        paths (list[str]): file or directory paths.
+        recursive (bool): search the directories recursively.
+
+    Returns:
+        list[str]: session file paths.
+    """
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            files += [os.path.join(root, n) for n in sorted(names)
+                      if n.endswith(SESSION_EXTS)]
+            if not recursive:
+                break
+    return files
+
+
+def validate_sessions(file_paths, node_types=None, processes=None,
+                      chunksize=8):
+    """
+    Validate the session files on a process pool using all the cores.
+
+    Args:
+        file_paths (list[str]): session file paths.
+        node_types (set[str]): registered node types (optional)
+            eg. "NodeVendor.node_types()" in the application, it includes
+            the lazy node types that "NodeVendor.nodes" leaves out.
+        processes (int): number of worker processes (defaults to cpu count).
+        chunksize (int): number of files sent to a worker at a time.
+
+    Returns:
+        generator: validation results in completion order.
+    """
+    if node_types is not None:
+        node_types = set(node_types)
+    pool = multiprocessing.Pool(processes, _init_worker, (node_types,))
+    try:
+        for result in pool.imap_unordered(_validate_worker, file_paths,
+                                          chunksize):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        description='Validate node graph session files, the results are '
+                    'written to stdout as json lines.')
+    parser.add_argument('paths', nargs='+',
+                        help='session files or directories.')
+    parser.add_argument('-r', '--recursive', action='store_true',
+                        help='search the directories recursively.')
+    parser.add_argument('-t', '--types-file',
+                        help='file listing the registered node types one '
+                             'per line, enables the node type check.')
+    parser.add_argument('-p', '--processes', type=int,
+                        help='number of worker processes.')
+    args = parser.parse_args(args)
+
+    node_types = None
+    if args.types_file:
+        with open(args.types_file) as types_file:
+            node_types = set(l.strip() for l in types_file if l.strip())
+
+    file_paths = find_sessions(args.paths, args.recursive)
+    failed = 0
+    for result in validate_sessions(file_paths, node_types, args.processes):
+        if not result['ok']:
+            failed += 1
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
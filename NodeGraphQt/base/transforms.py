@@ -0,0 +1,185 @@
+#!/usr/bin/python
+"""
+Vectorized node position transforms.
+
+The functions work on (n, 2) arrays of node (x, y) positions as returned
+by "NodeGraphWidget.node_positions()" and return new arrays that can be
+applied with "NodeGraphWidget.set_node_positions()".
+
+    positions = graph.node_positions(nodes)
+    positions = transforms.snap_to_grid(positions, 20)
+    graph.set_node_positions(positions, nodes)
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_AXES = {'x': 0, 'y': 1}
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError('the node position transforms require numpy.')
+
+
+def as_positions(positions):
+    """
+    Args:
+        positions (array-like): node positions [(x, y), ...].
+
+    Returns:
+        numpy.ndarray: (n, 2) float array.
+    """
+    _require_numpy()
+    positions = numpy.asarray(positions, dtype=float)
+    if positions.ndim == 1:
+        positions = positions.reshape(-1, 2)
+    if positions.ndim != 2 or positions.shape[1] != 2:
+        raise ValueError('positions must be a (n, 2) array.')
+    return positions
+
+
+def _axis(axis):
+    if axis not in _AXES:
+        raise ValueError('axis must be "x" or "y" not "{}".'.format(axis))
+    return _AXES[axis]
+
+
+def _sizes(positions, sizes):
+    if sizes is None:
+        return numpy.zeros_like(positions)
+    return as_positions(sizes)
+
+
+def bounds(positions, sizes=None):
+    """
+    Args:
+        positions (array-like): node positions.
+        sizes (array-like): node (width, height) sizes (optional).
+
+    Returns:
+        tuple: (left, top, right, bottom) bounding box.
+    """
+    positions = as_positions(positions)
+    if not len(positions):
+        return 0.0, 0.0, 0.0, 0.0
+    corners = positions + _sizes(positions, sizes)
+    left, top = positions.min(axis=0)
+    right, bottom = corners.max(axis=0)
+    return float(left), float(top), float(right), float(bottom)
+
+
+def translate(positions, x=0.0, y=0.0):
+    """
+    Args:
+        positions (array-like): node positions.
+        x (float): horizontal offset.
+        y (float): vertical offset.
+
+    Returns:
+        numpy.ndarray: translated positions.
+    """
+    return as_positions(positions) + (x, y)
+
+
+def scale(positions, x=1.0, y=None, origin=None):
+    """
+    Args:
+        positions (array-like): node positions.
+        x (float): horizontal scale.
+        y (float): vertical scale (defaults to the horizontal scale).
+        origin (tuple): scale origin (defaults to the positions center).
+
+    Returns:
+        numpy.ndarray: scaled positions.
+    """
+    positions = as_positions(positions)
+    if not len(positions):
+        return positions.copy()
+    if origin is None:
+        origin = (positions.min(axis=0) + positions.max(axis=0)) / 2.0
+    origin = numpy.asarray(origin, dtype=float)
+    factor = (x, x if y is None else y)
+    return (positions - origin) * factor + origin
+
+
+def snap_to_grid(positions, grid_size=50.0):
+    """
+    Args:
+        positions (array-like): node positions.
+        grid_size (float or tuple): grid cell size.
+
+    Returns:
+        numpy.ndarray: positions rounded to the nearest grid point.
+    """
+    grid_size = numpy.asarray(grid_size, dtype=float)
+    return numpy.round(as_positions(positions) / grid_size) * grid_size
+
+
+def align(positions, axis='x', anchor='min', sizes=None):
+    """
+    Align the nodes on one axis.
+
+    Args:
+        positions (array-like): node positions.
+        axis (str): "x" to align horizontally (left, center, right edges),
+            "y" to align vertically (top, center, bottom edges).
+        anchor (str): "min", "center" or "max".
+        sizes (array-like): node (width, height) sizes, required to
+            align the center or max edges.
+
+    Returns:
+        numpy.ndarray: aligned positions.
+    """
+    positions = as_positions(positions)
+    result = positions.copy()
+    if not len(positions):
+        return result
+    i = _axis(axis)
+    extent = _sizes(positions, sizes)[:, i]
+    if anchor == 'min':
+        result[:, i] = positions[:, i].min()
+    elif anchor == 'max':
+        edges = positions[:, i] + extent
+        result[:, i] = edges.max() - extent
+    elif anchor == 'center':
+        centers = positions[:, i] + extent / 2.0
+        middle = (centers.min() + centers.max()) / 2.0
+        result[:, i] = middle - extent / 2.0
+    else:
+        raise ValueError('anchor must be "min", "center" or "max".')
+    return result
+
+
+def distribute(positions, axis='x', sizes=None, spacing=None):
+    """
+    Distribute the nodes on one axis keeping their order, the gaps between
+    the nodes are made equal.
+
+    Args:
+        positions (array-like): node positions.
+        axis (str): "x" or "y".
+        sizes (array-like): node (width, height) sizes.
+        spacing (float): fixed gap between the nodes (defaults to spreading
+            the nodes over their current extent).
+
+    Returns:
+        numpy.ndarray: distributed positions.
+    """
+    positions = as_positions(positions)
+    result = positions.copy()
+    if len(positions) < 2:
+        return result
+    i = _axis(axis)
+    extent = _sizes(positions, sizes)[:, i]
+    order = numpy.argsort(positions[:, i], kind='stable')
+    start = positions[order[0], i]
+    if spacing is None:
+        end = (positions[:, i] + extent).max()
+        spacing = (end - start - extent.sum()) / (len(positions) - 1)
+    ordered_extent = extent[order]
+    offsets = numpy.concatenate(
+        ([0.0], numpy.cumsum(ordered_extent[:-1] + spacing)))
+    result[order, i] = start + offsets
+    return result
@@ -1,8 +1,18 @@
 #!/usr/bin/python
 from PySide2 import QtWidgets
 
+from ..base.node_manifest import ENTRY_POINT_GROUP
 from ..base.node_vendor import NodeVendor
 from ..base.node_plugin import NodePlugin
+from ..base import transforms
+from ..widgets.autosave import AutoSave
+from ..widgets.constants import (UNDO_MEMORY_LIMIT,
+                                 NODE_CULL_MARGIN,
+                                 MINIMAP_SIZE,
+                                 PIPE_BUNDLE_THRESHOLD,
+                                 AUTOSAVE_INTERVAL,
+                                 AUTOSAVE_BACKUPS)
+from ..widgets.node_widgets import install_node_widget_style
 from ..widgets.scene import NodeScene
 from ..widgets.viewer import NodeViewer
 from ..interfaces.node import Backdrop
@@ -18,6 +28,7 @@ class NodeGraphWidget(QtWidgets.QWidget):
         layout = QtWidgets.QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.addWidget(self._viewer)
+        self._autosave = AutoSave(self._viewer)
 
         if Backdrop not in NodeVendor.nodes.values():
             NodeVendor.register_node(Backdrop, 'Backdrop')
@@ -66,6 +77,14 @@ class NodeGraphWidget(QtWidgets.QWidget):
         """
         return self._viewer.get_menu(name)
 
+    def install_widget_style(self):
+        """
+        Install the node widget stylesheet on the QApplication so it's parsed
+        once for all the node widgets instead of once per widget.
+        (only applies to node widgets created after it's installed)
+        """
+        install_node_widget_style()
+
     def set_acyclic(self, mode=True):
         """
         Set the node graph to be acyclic or not. (default=True)
@@ -85,6 +104,117 @@ class NodeGraphWidget(QtWidgets.QWidget):
         """
         self._viewer.set_pipe_layout(layout)
 
+    def property_bus(self):
+        """
+        Returns the node property change event bus, the coalesced changes
+        are emitted with the "properties_changed" signal.
+
+        Returns:
+            NodeGraphQt.widgets.property_bus.PropertyBus: property bus.
+        """
+        return self._scene.property_bus
+
+    def transaction(self, text=None):
+        """
+        Context manager that batches the node property changes into a
+        single notification and undo command.
+
+        eg.
+            with graph.transaction('scale nodes'):
+                for node in graph.all_nodes():
+                    node.set_property('size', 2.0)
+
+        Args:
+            text (str): undo command text.
+        """
+        return self._scene.property_bus.transaction(text)
+
+    def auto_layout(self, nodes=None, mode='layered', **options):
+        """
+        Arrange the nodes, the layout runs on a worker thread and is
+        applied as a single undoable move.
+
+        Args:
+            nodes (list[NodeGraphQt.Node]): nodes (default: all nodes).
+            mode (str): "layered" for directed graphs or "force" for the
+                force directed layout (requires numpy).
+            **options: keyword arguments of the "layered_layout" or
+                "force_layout" function in "NodeGraphQt.base.graph_layout"
+                eg. "node_spacing".
+
+        Returns:
+            bool: false if a layout is already running.
+        """
+        items = [n.item for n in nodes] if nodes else None
+        return self._viewer.auto_layout(items, mode, **options)
+
+    def layout_runner(self):
+        """
+        Returns the layout runner, connect to its "finished" and "failed"
+        signals to know when an auto layout is done.
+
+        Returns:
+            NodeGraphQt.widgets.layout_runner.LayoutRunner: layout runner.
+        """
+        return self._viewer.layout_runner()
+
+    def set_pipe_bundling(self, mode=True, threshold=PIPE_BUNDLE_THRESHOLD):
+        """
+        Merge the pipes of output ports with a large fan out into a single
+        bundle item that expands to the individual pipes on hover.
+
+        Args:
+            mode (bool): true to bundle the pipes.
+            threshold (int): min number of connections on a port to bundle.
+        """
+        self._viewer.set_pipe_bundling(mode, threshold)
+
+    def set_minimap(self, mode=True, size=MINIMAP_SIZE):
+        """
+        Show a minimap overview of the node graph, click or drag in the
+        minimap to navigate.
+
+        Args:
+            mode (bool): true to show the minimap.
+            size (tuple): minimap (width, height) in pixels.
+        """
+        self._viewer.set_minimap(mode, size)
+
+    def set_node_culling(self, mode=True, margin=NODE_CULL_MARGIN):
+        """
+        Hide the node labels, port names and widgets of the nodes outside
+        the visible area to save memory and idle cpu on large graphs.
+
+        Args:
+            mode (bool): true to cull the off screen nodes.
+            margin (float): scene distance around the viewport that is
+                kept unculled.
+        """
+        self._viewer.set_node_culling(mode, margin)
+
+    def set_pipe_layer(self, mode=True):
+        """
+        Draw all the pipes with a single batched layer item, for graphs with
+        a large number of connections.
+
+        Args:
+            mode (bool): true to use the pipe layer.
+        """
+        self._viewer.set_pipe_layer(mode)
+
+    def set_undo_limits(self, memory=UNDO_MEMORY_LIMIT, history=0, spill=True):
+        """
+        Set the memory budget of the undo history, once over the budget the
+        oldest undo commands are compacted to serialized node data and
+        spilled to a temp file then dropped from the history.
+
+        Args:
+            memory (int): memory budget in bytes (0 for unlimited).
+            history (int): max number of undo commands (0 for unlimited).
+            spill (bool): false to keep the compacted data in memory.
+        """
+        self._viewer.undo_stack().set_limits(memory, history, spill)
+
     def set_zoom(self, zoom=0):
         """
         Set the zoom factor of the Node Graph the default is 0.
@@ -128,6 +258,24 @@ class NodeGraphWidget(QtWidgets.QWidget):
         """
         self._viewer.save(path)
 
+    def save_changes(self):
+        """
+        Save the changes to the current session file, with the journal
+        enabled only the edits since the last save are written.
+        """
+        self._viewer.save_changes()
+
+    def set_journal(self, enabled=True):
+        """
+        Record every graph change to a journal file next to the current
+        session file, the journal is replayed when the session is loaded
+        and compacted into the session file on a full save.
+
+        Args:
+            enabled (bool): false to disable the journal.
+        """
+        self._viewer.set_journal(enabled)
+
     def load(self, path):
         """
         Load node graph session layout file.
@@ -137,6 +285,61 @@ class NodeGraphWidget(QtWidgets.QWidget):
         """
         self._viewer.load(path)
 
+    def set_autosave(self, enabled=True, interval=AUTOSAVE_INTERVAL,
+                     directory=None, backups=AUTOSAVE_BACKUPS):
+        """
+        Enable or disable the periodic autosave, the session is written on
+        a background thread with rotating backups.
+
+        Args:
+            enabled (bool): false to stop the autosave.
+            interval (int): autosave interval in milliseconds.
+            directory (str): autosave directory (defaults to temp dir).
+            backups (int): number of previous autosaves to keep.
+        """
+        if directory:
+            self._autosave.directory = directory
+        self._autosave.backups = backups
+        if enabled:
+            self._autosave.start(interval)
+        else:
+            self._autosave.stop()
+
+    def autosave(self):
+        """
+        Returns the autosave object, connect to its "saved" and "failed"
+        signals to be notified of the autosave results.
+
+        Returns:
+            NodeGraphQt.widgets.autosave.AutoSave: autosave object.
+        """
+        return self._autosave
+
+    def autosave_file(self):
+        """
+        Returns the newest autosave file that can be recovered, to offer
+        the recovery on startup.
+
+        Returns:
+            str: autosave file path or None.
+        """
+        return self._autosave.latest()
+
+    def recover_autosave(self, path=None):
+        """
+        Load the session from an autosave file.
+
+        Args:
+            path (str): autosave file (defaults to the newest autosave).
+
+        Returns:
+            str: recovered autosave file path or None.
+        """
+        path = path or self._autosave.latest()
+        if path:
+            self._viewer.load(path, set_current=False)
+        return path
+
     def clear(self):
         """
         Clears the node graph.
@@ -151,7 +354,7 @@ class NodeGraphWidget(QtWidgets.QWidget):
         Returns:
             list[str]: node types.
         """
-        return sorted(NodeVendor.nodes.keys())
+        return sorted(NodeVendor.node_types())
 
     def register_node(self, node, alias=None):
         """
@@ -164,6 +367,42 @@ class NodeGraphWidget(QtWidgets.QWidget):
         """
         NodeVendor.register_node(node, alias)
 
+    def load_node_manifest(self, file_path):
+        """
+        Register the node types declared in a manifest file, the node
+        modules are only imported when the node types are first created.
+
+        Args:
+            file_path (str): manifest file path.
+
+        Returns:
+            bool: false if the manifest couldn't be read.
+        """
+        return NodeVendor.load_manifest(file_path)
+
+    def save_node_manifest(self, file_path):
+        """
+        Write all the registered node types to a manifest file that can be
+        loaded with "NodeGraphWidget.load_node_manifest()".
+
+        Args:
+            file_path (str): manifest file path.
+        """
+        NodeVendor.save_manifest(file_path)
+
+    def load_node_entry_points(self, group=ENTRY_POINT_GROUP,
+                               cache_path=None):
+        """
+        Register the node types published by the installed packages with
+        the "nodegraphqt.nodes" entry points.
+
+        Args:
+            group (str): entry point group.
+            cache_path (str): manifest cache file, the entry points are
+                only imported when the installed packages have changed.
+        """
+        NodeVendor.load_entry_points(group, cache_path)
+
     def create_node(self, node_type, name=None, selected=True, color=None, pos=None):
         """
         Create a new node in the node graph.
@@ -217,6 +456,18 @@ class NodeGraphWidget(QtWidgets.QWidget):
         item = node.item
         self._viewer.delete_node(item)
 
+    def delete_nodes(self, nodes):
+        """
+        Remove the nodes from the node graph as a single undo command.
+
+        Args:
+            nodes (list[NodeGraphQt.Node]): node objects.
+        """
+        for node in nodes:
+            assert isinstance(node, NodePlugin), \
+                'node must be a Node instance.'
+        self._viewer.delete_nodes([n.item for n in nodes])
+
     def all_nodes(self):
         """
         Return all nodes that are in the node graph.
@@ -284,8 +535,56 @@ class NodeGraphWidget(QtWidgets.QWidget):
             list[NodeGraphQt.Node]: list of duplicated node instances.
         """
         new_nodes = []
-        duplicated_nodes = self._viewer.duplicate_nodes(nodes)
-        for node in duplicated_nodes:
-            node_instance = NodeVendor.create_node_instance(node.type)
-            new_nodes.append(node_instance)
+        items = [n.item for n in nodes]
+        for node_item in self._viewer.duplicate_nodes(items):
+            NodeInstance = NodeVendor.create_node_instance(node_item.type)
+            node = NodeInstance()
+            node.set_item(node_item)
+            new_nodes.append(node)
         return new_nodes
+
+    def node_positions(self, nodes):
+        """
+        Returns the node positions as an array for the bulk transforms in
+        "NodeGraphQt.base.transforms" (requires numpy).
+
+        Args:
+            nodes (list[NodeGraphQt.Node]): node objects.
+
+        Returns:
+            numpy.ndarray: (n, 2) array of the node (x, y) positions.
+        """
+        return transforms.as_positions(
+            [xy for n in nodes for xy in n.item.pos])
+
+    def node_sizes(self, nodes):
+        """
+        Returns the node sizes as an array (requires numpy).
+
+        Args:
+            nodes (list[NodeGraphQt.Node]): node objects.
+
+        Returns:
+            numpy.ndarray: (n, 2) array of the node (width, height) sizes.
+        """
+        return transforms.as_positions(
+            [wh for n in nodes for wh in n.item.size])
+
+    def set_node_positions(self, positions, nodes):
+        """
+        Move the nodes to the positions as a single undo command, the
+        scene index is suspended while moving a large number of nodes.
+
+        Args:
+            positions (numpy.ndarray): (n, 2) array of (x, y) positions.
+            nodes (list[NodeGraphQt.Node]): node objects in the same order
+                as the positions.
+        """
+        positions = transforms.as_positions(positions)
+        if len(positions) != len(nodes):
+            raise ValueError('expected {} positions got {}.'
+                             .format(len(nodes), len(positions)))
+        items = [n.item for n in nodes]
+        prev_pos = [xy for n in items for xy in n.pos]
+        self._viewer.push_nodes_moved(
+            [n.id for n in items], prev_pos, positions.ravel().tolist())
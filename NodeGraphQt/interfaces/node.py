@@ -13,8 +13,18 @@ class Node(NodePlugin):
 
     NODE_NAME = 'Base node'
 
+    # paint the ports and port labels on the node item instead of adding
+    # a graphics item per port (recommended for nodes with many ports).
+    PAINTED_PORTS = False
+
+    # paint the embedded widgets as static placeholders and only create the
+    # real widgets while they're hovered or focused.
+    LAZY_WIDGETS = False
+
     def __init__(self):
-        super(Node, self).__init__(NodeItem())
+        item = NodeItem(painted_ports=self.PAINTED_PORTS,
+                        lazy_widgets=self.LAZY_WIDGETS)
+        super(Node, self).__init__(item)
 
     def set_icon(self, icon=None):
         """
@@ -25,6 +35,21 @@ class Node(NodePlugin):
         """
         self.item.icon = icon
 
+    def deferred_layout(self):
+        """
+        Context manager to relayout the node only once when adding many
+        ports to a node that is already in the node graph.
+
+        eg.
+            with node.deferred_layout():
+                for i in range(50):
+                    node.add_input('in {}'.format(i))
+
+        Returns:
+            contextmanager: deferred layout context.
+        """
+        return self.item.deferred_layout()
+
     def add_input(self, name='input', multi_input=False, display_name=True):
         """
         Adds a input port the the node.
@@ -0,0 +1,195 @@
+#!/usr/bin/python
+import json
+import os
+import tempfile
+import threading
+
+from PySide2 import QtCore
+
+from ..base.serializer import SessionSerializer
+from .constants import FILE_IO_EXT, AUTOSAVE_INTERVAL, AUTOSAVE_BACKUPS
+
+
+class AutoSave(QtCore.QObject):
+    """
+    Periodic autosave of the node graph session.
+
+    The session is snapshot to plain data on the GUI thread and written to
+    disk on a worker thread, a tick is skipped while the previous write is
+    still running so saving never blocks the graph.
+    """
+
+    saved = QtCore.Signal(str)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, viewer, directory=None, backups=AUTOSAVE_BACKUPS):
+        """
+        Args:
+            viewer (NodeGraphQt.widgets.viewer.NodeViewer): node viewer.
+            directory (str): autosave directory (defaults to temp dir).
+            backups (int): number of previous autosaves to keep.
+        """
+        super(AutoSave, self).__init__(viewer)
+        self._viewer = viewer
+        self._directory = directory or os.path.join(
+            tempfile.gettempdir(), 'nodegraphqt_autosave')
+        self._backups = backups
+        self._dirty = False
+        self._thread = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.autosave)
+        viewer.undo_stack().indexChanged.connect(self._on_graph_changed)
+
+    def _on_graph_changed(self, index):
+        self._dirty = True
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @directory.setter
+    def directory(self, directory):
+        self._directory = directory
+
+    @property
+    def backups(self):
+        return self._backups
+
+    @backups.setter
+    def backups(self, backups=AUTOSAVE_BACKUPS):
+        self._backups = max(0, backups)
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    def start(self, interval=AUTOSAVE_INTERVAL):
+        """
+        Start the periodic autosave.
+
+        Args:
+            interval (int): autosave interval in milliseconds.
+        """
+        self._timer.start(interval)
+
+    def stop(self):
+        self._timer.stop()
+
+    def file_path(self, backup=0):
+        """
+        Returns the autosave file path for the current session.
+
+        Args:
+            backup (int): backup number (0 for the latest autosave).
+
+        Returns:
+            str: file path.
+        """
+        current_file = self._viewer.current_loaded_file()
+        name = 'untitled'
+        if current_file:
+            name = os.path.splitext(os.path.basename(current_file))[0]
+        name = '{}.autosave'.format(name)
+        if backup:
+            name = '{}.{}'.format(name, backup)
+        return os.path.join(self._directory, name + FILE_IO_EXT)
+
+    def snapshot(self):
+        """
+        Returns the session layout as plain data, no Qt objects are
+        referenced so the data can be written from another thread.
+
+        Returns:
+            dict: serialized session layout.
+        """
+        viewer = self._viewer
+        serializer = SessionSerializer(viewer.all_nodes(), viewer.all_pipes())
+        return serializer.serialize_layout()
+
+    def autosave(self, force=False):
+        """
+        Snapshot the session and write it on a worker thread.
+
+        Args:
+            force (bool): save even if the graph hasn't changed.
+
+        Returns:
+            bool: false if the save was skipped.
+        """
+        if not (self._dirty or force):
+            return False
+        if self._thread and self._thread.is_alive():
+            return False
+        data = self.snapshot()
+        self._dirty = False
+        paths = [self.file_path(i) for i in range(self._backups + 1)]
+        self._thread = threading.Thread(target=self._write, args=(data, paths))
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def wait(self, timeout=None):
+        """
+        Block until the running autosave has been written.
+
+        Args:
+            timeout (float): max time to wait in seconds.
+        """
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _write(self, data, paths):
+        # runs on the worker thread.
+        path = paths[0]
+        tmp_path = path + '.tmp'
+        try:
+            if not os.path.isdir(self._directory):
+                os.makedirs(self._directory)
+            with open(tmp_path, 'w') as file_out:
+                json.dump(data, file_out, separators=(',', ':'))
+            if os.path.isfile(paths[-1]):
+                os.remove(paths[-1])
+            for i in reversed(range(len(paths) - 1)):
+                if os.path.isfile(paths[i]):
+                    os.rename(paths[i], paths[i + 1])
+            os.rename(tmp_path, path)
+        except (IOError, OSError, TypeError, ValueError) as e:
+            self._dirty = True
+            self.failed.emit('autosave failed: {}'.format(e))
+            return
+        self.saved.emit(path)
+
+    def autosave_files(self):
+        """
+        Returns all the autosave files in the autosave directory.
+
+        Returns:
+            list[str]: file paths, newest first.
+        """
+        if not os.path.isdir(self._directory):
+            return []
+        suffix = FILE_IO_EXT
+        paths = [os.path.join(self._directory, f)
+                 for f in os.listdir(self._directory)
+                 if '.autosave' in f and f.endswith(suffix)]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def latest(self):
+        """
+        Returns the newest autosave file to recover from.
+
+        Returns:
+            str: file path or None.
+        """
+        paths = self.autosave_files()
+        if paths:
+            return paths[0]
+
+    def clear(self):
+        """
+        Remove the autosave files of the current session.
+        """
+        self.wait()
+        for i in range(self._backups + 1):
+            path = self.file_path(i)
+            if os.path.isfile(path):
+                os.remove(path)
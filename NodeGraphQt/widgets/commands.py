@@ -1,9 +1,276 @@
 #!/usr/bin/python
+import json
+from array import array
+
 from PySide2 import QtWidgets
 
+from ..base.node_vendor import NodeVendor
 from .constants import IN_PORT, OUT_PORT
 from .pipe import Pipe
 
+# rough estimate in bytes of the memory held by a live node item.
+NODE_ITEM_COST = 8192
+PORT_ITEM_COST = 2048
+NODE_WIDGET_COST = 32768
+# node id string and its reference held by a command.
+NODE_ID_COST = 96
+
+
+def node_memory_cost(node):
+    """
+    Returns a rough estimate of the memory held by a node item.
+
+    Args:
+        node (AbstractNodeItem): node item.
+
+    Returns:
+        int: estimated size in bytes.
+    """
+    ports = getattr(node, 'inputs', []) + getattr(node, 'outputs', [])
+    widgets = getattr(node, 'widgets', {})
+    return (NODE_ITEM_COST +
+            PORT_ITEM_COST * len(ports) +
+            NODE_WIDGET_COST * len(widgets))
+
+
+def _port_key(port):
+    return port.node.id, port.port_type, port.name
+
+
+def _get_port(scene, key):
+    """
+    Returns the port in the scene from a (node_id, port_type, name) key.
+    """
+    node = scene.get_node(key[0])
+    if not node:
+        return
+    ports = getattr(node, 'inputs' if key[1] == IN_PORT else 'outputs', [])
+    for port in ports:
+        if port.name == key[2]:
+            return port
+
+
+def _record_connection(scene, op, start_key, end_key):
+    keys = {start_key[1]: start_key, end_key[1]: end_key}
+    in_key, out_key = keys.get(IN_PORT), keys.get(OUT_PORT)
+    if in_key and out_key:
+        scene.record_change(op, **{'in': [in_key[0], in_key[2]],
+                                   'out': [out_key[0], out_key[2]]})
+
+
+def _connect_ports(scene, start_key, end_key):
+    _record_connection(scene, 'connect', start_key, end_key)
+    start_port = _get_port(scene, start_key)
+    end_port = _get_port(scene, end_key)
+    if not (start_port and end_port):
+        return
+    if end_port in start_port.connected_ports:
+        return
+    ports = {
+        start_port.port_type: start_port,
+        end_port.port_type: end_port
+    }
+    pipe = Pipe()
+    scene.add_pipe(pipe)
+    pipe.set_connections(ports[IN_PORT], ports[OUT_PORT])
+    pipe.draw_path(pipe.input_port, pipe.output_port)
+
+
+def _disconnect_ports(scene, start_key, end_key):
+    _record_connection(scene, 'disconnect', start_key, end_key)
+    start_port = _get_port(scene, start_key)
+    end_port = _get_port(scene, end_key)
+    if not (start_port and end_port):
+        return
+    for pipe in start_port.connected_pipes:
+        if end_port in [pipe.input_port, pipe.output_port]:
+            pipe.delete()
+            break
+
+
+def _node_ports(node):
+    ports = []
+    if hasattr(node, 'inputs'):
+        ports += node.inputs
+    if hasattr(node, 'outputs'):
+        ports += node.outputs
+    return ports
+
+
+def _node_connections(nodes):
+    """
+    Returns the connections of the nodes as port keys, pipes between the
+    nodes are only listed once.
+    """
+    connections = []
+    visited = set()
+    for node in nodes:
+        for port in _node_ports(node):
+            for pipe in port.connected_pipes:
+                if id(pipe) in visited:
+                    continue
+                visited.add(id(pipe))
+                connections.append((_port_key(pipe.input_port),
+                                    _port_key(pipe.output_port)))
+    return connections
+
+
+def _remove_nodes(scene, nodes):
+    """
+    Remove the nodes and all their pipes from the scene, the pipe lists of
+    the ports outside the nodes are only filtered once.
+    """
+    pipes = set()
+    ports = []
+    for node in nodes:
+        for port in _node_ports(node):
+            ports.append(port)
+            pipes.update(port.connected_pipes)
+    outside_ports = set()
+    for pipe in pipes:
+        outside_ports.add(pipe.input_port)
+        outside_ports.add(pipe.output_port)
+    outside_ports.difference_update(ports)
+    for port in outside_ports:
+        port.remove_pipes(pipes)
+    for port in ports:
+        port.remove_pipes(pipes)
+    for pipe in pipes:
+        if pipe.scene():
+            scene.removeItem(pipe)
+    for node in nodes:
+        scene.removeItem(node)
+
+
+class NodeSnapshot(object):
+    """
+    Serialized copy of node items that have been removed from the scene
+    used by the undo commands in place of the node items once compacted.
+    """
+
+    __slots__ = ('node_ids', '_data', '_handle', '_spill')
+
+    def __init__(self, nodes):
+        self.node_ids = [n.id for n in nodes]
+        data = [n.to_dict()[n.id] for n in nodes]
+        self._data = json.dumps(data, separators=(',', ':'))
+        self._handle = None
+        self._spill = None
+
+    def memory_cost(self):
+        return len(self._data) if self._data else 64
+
+    def spill(self, spill_file):
+        """
+        Move the serialized data out of memory to the spill file.
+
+        Args:
+            spill_file (NodeGraphQt.widgets.undo_stack.UndoSpillFile):
+                spill file.
+        """
+        if self._data is None:
+            return
+        self._handle = spill_file.write(self._data)
+        self._spill = spill_file
+        self._data = None
+
+    def data(self):
+        """
+        Returns:
+            list[dict]: serialized nodes.
+        """
+        if self._data is None:
+            return json.loads(self._spill.read(self._handle))
+        return json.loads(self._data)
+
+    def build(self, scene):
+        """
+        Create the node items from the snapshot and add them to the scene.
+
+        Args:
+            scene (NodeGraphQt.widgets.scene.NodeScene): node scene.
+
+        Returns:
+            list[AbstractNodeItem]: new node items.
+        """
+        nodes = []
+        for node_id, data in zip(self.node_ids, self.data()):
+            NodeInstance = NodeVendor.create_node_instance(data.get('type'))
+            node = NodeInstance().item
+            node.id = node_id
+            scene.addItem(node)
+            node.from_dict(data)
+            node.post_init(scene.viewer())
+            nodes.append(node)
+        return nodes
+
+
+class _NodeOwnerMixin(object):
+    """
+    Shared node handling for the commands that add or remove nodes.
+
+    The command only holds a reference to the node items while they're
+    out of the scene, once compacted the items are replaced by a
+    NodeSnapshot and rebuilt when the command is undone or redone.
+    """
+
+    # only suspend the scene index when handling more nodes than this.
+    INDEX_THRESHOLD = 100
+
+    def _init_owner(self, scene, nodes):
+        self.scene = scene
+        self.node_ids = [n.id for n in nodes]
+        self.nodes = None
+        self.snapshot = None
+
+    def _take_nodes(self):
+        nodes = [self.scene.get_node(i) for i in self.node_ids]
+        nodes = [n for n in nodes if n]
+        suspend = len(nodes) > self.INDEX_THRESHOLD
+        with self.scene.suspended_index(suspend):
+            if len(nodes) == 1:
+                nodes[0].delete()
+            else:
+                _remove_nodes(self.scene, nodes)
+        self.nodes = nodes
+        self.scene.record_change('delete', ids=[n.id for n in nodes])
+
+    def _restore_nodes(self):
+        nodes = []
+        suspend = len(self.node_ids) > self.INDEX_THRESHOLD
+        with self.scene.suspended_index(suspend):
+            if self.nodes is not None:
+                nodes = self.nodes
+                for node in nodes:
+                    self.scene.addItem(node)
+            elif self.snapshot is not None:
+                nodes = self.snapshot.build(self.scene)
+        self.nodes = None
+        self.snapshot = None
+        self.scene.record_change('create', ids=[n.id for n in nodes])
+        return nodes
+
+    def memory_cost(self):
+        if self.nodes is not None:
+            return sum(node_memory_cost(n) for n in self.nodes)
+        if self.snapshot is not None:
+            return self.snapshot.memory_cost()
+        return 0
+
+    def compact(self, spill_file=None):
+        """
+        Replace the removed node items with a serialized snapshot.
+
+        Args:
+            spill_file (NodeGraphQt.widgets.undo_stack.UndoSpillFile):
+                optional spill file for the snapshot data.
+        """
+        if self.nodes is not None:
+            self.snapshot = NodeSnapshot(self.nodes)
+            self.nodes = None
+        if self.snapshot is not None and spill_file is not None:
+            self.snapshot.spill(spill_file)
+
 
 class NodeDisabledCmd(QtWidgets.QUndoCommand):
     """
@@ -12,19 +279,59 @@ class NodeDisabledCmd(QtWidgets.QUndoCommand):
 
     def __init__(self, node):
         QtWidgets.QUndoCommand.__init__(self)
-        self.node = node
+        self.scene = node.scene()
+        self.node_id = node.id
         self.mode = node.disabled
         mode = 'enabled' if self.mode else 'disabled'
         self.setText('{} node'.format(mode))
 
+    def set_disabled(self, mode):
+        node = self.scene.get_node(self.node_id)
+        if node:
+            node.disabled = mode
+            self.scene.record_change('property', id=self.node_id,
+                                     name='disabled', value=mode)
+
+    def undo(self):
+        self.set_disabled(not self.mode)
+
+    def redo(self):
+        self.set_disabled(self.mode)
+
+
+class NodePropertiesChangedCmd(QtWidgets.QUndoCommand):
+    """
+    Node properties changed command, pushed for a committed property bus
+    transaction with the changes already applied.
+    """
+
+    def __init__(self, scene, changes, text=None):
+        QtWidgets.QUndoCommand.__init__(self)
+        self.setText(text or 'set node properties')
+        self.scene = scene
+        self.changes = changes
+        self.applied = True
+
+    def set_node_properties(self, index):
+        with self.scene.property_bus.transaction(undoable=False):
+            for node_id, node_changes in self.changes.items():
+                node = self.scene.get_node(node_id)
+                if not node:
+                    continue
+                for name, values in node_changes.items():
+                    node.set_property(name, values[index])
+
     def undo(self):
-        self.node.disabled = not self.mode
+        self.set_node_properties(0)
 
     def redo(self):
-        self.node.disabled = self.mode
+        if self.applied:
+            self.applied = False
+            return
+        self.set_node_properties(1)
 
 
-class NodeCreatedCommand(QtWidgets.QUndoCommand):
+class NodeCreatedCommand(_NodeOwnerMixin, QtWidgets.QUndoCommand):
     """
     Node created command.
     """
@@ -32,17 +339,49 @@ class NodeCreatedCommand(QtWidgets.QUndoCommand):
     def __init__(self, node, scene):
         QtWidgets.QUndoCommand.__init__(self)
         self.setText('created node')
-        self.scene = scene
-        self.node = node
+        self._init_owner(scene, [node])
+        self.nodes = [node]
+
+    def undo(self):
+        self._take_nodes()
+
+    def redo(self):
+        self._restore_nodes()
+
+
+class NodesCreatedCmd(_NodeOwnerMixin, QtWidgets.QUndoCommand):
+    """
+    Nodes created command.
+
+    Adds the nodes and the connections between them in a single command.
+    """
+
+    def __init__(self, nodes, scene, connections=None):
+        """
+        Args:
+            nodes (list[AbstractNodeItem]): new node items.
+            scene (NodeGraphQt.widgets.scene.NodeScene): node scene.
+            connections (list[tuple]): connections as port key pairs
+                ((node_id, port_type, port_name), (node_id, ...))
+        """
+        QtWidgets.QUndoCommand.__init__(self)
+        self.setText('created {} node(s)'.format(len(nodes)))
+        self._init_owner(scene, nodes)
+        self.nodes = list(nodes)
+        self.connections = connections or []
 
     def undo(self):
-        self.node.delete()
+        self._take_nodes()
 
     def redo(self):
-        self.scene.addItem(self.node)
+        suspend = len(self.connections) > self.INDEX_THRESHOLD
+        with self.scene.suspended_index(suspend):
+            self._restore_nodes()
+            for start_key, end_key in self.connections:
+                _connect_ports(self.scene, start_key, end_key)
 
 
-class NodeDeletedCmd(QtWidgets.QUndoCommand):
+class NodeDeletedCmd(_NodeOwnerMixin, QtWidgets.QUndoCommand):
     """
     Node deleted command.
     """
@@ -50,24 +389,36 @@ class NodeDeletedCmd(QtWidgets.QUndoCommand):
     def __init__(self, node, scene):
         QtWidgets.QUndoCommand.__init__(self)
         self.setText('deleted node')
-        self.scene = scene
-        self.node = node
-        self.inputs = {}
-        self.outputs = {}
-        if hasattr(self.node, 'inputs'):
-            self.inputs = {p: p.connected_ports for p in self.node.inputs}
-        if hasattr(self.node, 'outputs'):
-            self.outputs = {p: p.connected_ports for p in self.node.outputs}
+        self._init_owner(scene, [node])
+        self.connections = _node_connections([node])
 
     def undo(self):
-        self.scene.addItem(self.node)
-        for p, ports in self.inputs.items():
-            [p.connect_to(cp) for cp in ports]
-        for p, ports in self.outputs.items():
-            [p.connect_to(cp) for cp in ports]
+        self._restore_nodes()
+        for start_key, end_key in self.connections:
+            _connect_ports(self.scene, start_key, end_key)
 
     def redo(self):
-        self.node.delete()
+        self._take_nodes()
+
+
+class NodesDeletedCmd(NodeDeletedCmd):
+    """
+    Nodes deleted command.
+
+    Deletes the nodes and their pipes in a single pass and restores them
+    in one go, in place of a NodeDeletedCmd per node.
+    """
+
+    def __init__(self, nodes, scene):
+        QtWidgets.QUndoCommand.__init__(self)
+        self.setText('deleted {} node(s)'.format(len(nodes)))
+        self._init_owner(scene, nodes)
+        self.connections = _node_connections(nodes)
+
+    def undo(self):
+        suspend = len(self.connections) > self.INDEX_THRESHOLD
+        with self.scene.suspended_index(suspend):
+            super(NodesDeletedCmd, self).undo()
 
 
 class NodeConnectedCmd(QtWidgets.QUndoCommand):
@@ -78,29 +429,15 @@ class NodeConnectedCmd(QtWidgets.QUndoCommand):
     def __init__(self, start_port, end_port):
         QtWidgets.QUndoCommand.__init__(self)
         self.setText('connected node')
-        self.start_port = start_port
-        self.end_port = end_port
-        self.pipe = Pipe()
-
-    def establish_connection(self, start_port, end_port, pipe):
-        ports = {
-            start_port.port_type: start_port,
-            end_port.port_type: end_port
-        }
-        scene = start_port.scene()
-        scene.addItem(pipe)
-        pipe.set_connections(ports[IN_PORT], ports[OUT_PORT])
-        pipe.draw_path(pipe.input_port, pipe.output_port)
+        self.scene = start_port.scene()
+        self.start_port = _port_key(start_port)
+        self.end_port = _port_key(end_port)
 
     def undo(self):
-        self.pipe.delete()
+        _disconnect_ports(self.scene, self.start_port, self.end_port)
 
     def redo(self):
-        if self.end_port in self.start_port.connected_ports:
-            return
-        self.establish_connection(self.start_port,
-                                  self.end_port,
-                                  self.pipe)
+        _connect_ports(self.scene, self.start_port, self.end_port)
 
 
 class NodeDisconnectedCmd(QtWidgets.QUndoCommand):
@@ -111,33 +448,15 @@ class NodeDisconnectedCmd(QtWidgets.QUndoCommand):
     def __init__(self, start_port, end_port):
         QtWidgets.QUndoCommand.__init__(self)
         self.setText('disconnected node')
-        self.start_port = start_port
-        self.end_port = end_port
-        self.pipe = Pipe()
-
-    def establish_connection(self, start_port, end_port, pipe):
-        ports = {
-            start_port.port_type: start_port,
-            end_port.port_type: end_port
-        }
-        scene = start_port.scene()
-        scene.addItem(pipe)
-        pipe.set_connections(ports[IN_PORT], ports[OUT_PORT])
-        pipe.draw_path(pipe.input_port, pipe.output_port)
+        self.scene = start_port.scene()
+        self.start_port = _port_key(start_port)
+        self.end_port = _port_key(end_port)
 
     def undo(self):
-        self.establish_connection(self.start_port,
-                                  self.end_port,
-                                  self.pipe)
+        _connect_ports(self.scene, self.start_port, self.end_port)
 
     def redo(self):
-        if self.end_port not in self.start_port.connected_ports:
-            return
-        for pipe in self.start_port.connected_pipes:
-            if self.end_port in [pipe.input_port, pipe.output_port]:
-                self.pipe = pipe
-                self.pipe.delete()
-                break
+        _disconnect_ports(self.scene, self.start_port, self.end_port)
 
 
 class NodePositionChangedCmd(QtWidgets.QUndoCommand):
@@ -157,3 +476,65 @@ class NodePositionChangedCmd(QtWidgets.QUndoCommand):
 
     def redo(self):
         self.node.pos = self.pos
+
+
+class NodesMovedCmd(QtWidgets.QUndoCommand):
+    """
+    Nodes moved command.
+
+    Stores the node ids with the packed previous and new (x, y) positions
+    instead of a command and node reference per moved node.
+    """
+
+    CMD_ID = 1
+
+    # only suspend the scene index when moving more nodes than this.
+    INDEX_THRESHOLD = 100
+
+    def __init__(self, scene, node_ids, prev_pos, pos, merge=False):
+        """
+        Args:
+            scene (NodeGraphQt.widgets.scene.NodeScene): node scene.
+            node_ids (list[str]): node ids.
+            prev_pos (list[float]): flat previous positions [x0, y0, x1...]
+            pos (list[float]): flat new positions [x0, y0, x1, y1...]
+            merge (bool): merge with the following move of the same nodes.
+        """
+        QtWidgets.QUndoCommand.__init__(self)
+        self.setText('move nodes')
+        self.scene = scene
+        self.node_ids = tuple(node_ids)
+        self.prev_pos = array('d', prev_pos)
+        self.pos = array('d', pos)
+        self.merge = merge
+
+    def id(self):
+        return self.CMD_ID if self.merge else -1
+
+    def mergeWith(self, other):
+        if not (self.merge and getattr(other, 'merge', False)):
+            return False
+        if other.node_ids != self.node_ids:
+            return False
+        self.pos = other.pos
+        return True
+
+    def memory_cost(self):
+        return (NODE_ID_COST * len(self.node_ids) +
+                self.pos.itemsize * (len(self.pos) + len(self.prev_pos)))
+
+    def set_positions(self, positions):
+        suspend = len(self.node_ids) > self.INDEX_THRESHOLD
+        with self.scene.suspended_index(suspend):
+            for i, node_id in enumerate(self.node_ids):
+                node = self.scene.get_node(node_id)
+                if node:
+                    node.setPos(positions[i * 2], positions[i * 2 + 1])
+        self.scene.record_change('move', ids=list(self.node_ids),
+                                 pos=positions.tolist())
+
+    def undo(self):
+        self.set_positions(self.prev_pos)
+
+    def redo(self):
+        self.set_positions(self.pos)
@@ -3,6 +3,7 @@ import os
 
 # FILE FORMAT
 FILE_IO_EXT = '.ngqt'
+CLIPBOARD_MIME_TYPE = 'application/x-nodegraphqt-nodes'
 
 # PIPE
 PIPE_WIDTH = 1.2
@@ -14,6 +15,7 @@ PIPE_ACTIVE_COLOR = (70, 255, 220, 255)
 PIPE_HIGHLIGHT_COLOR = (232, 184, 13, 255)
 PIPE_LAYOUT_STRAIGHT = 0
 PIPE_LAYOUT_CURVED = 1
+PIPE_BUNDLE_THRESHOLD = 16
 
 # PORT DEFAULTS
 IN_PORT = 'in'
@@ -26,13 +28,27 @@ PORT_HOVER_BORDER_COLOR = (136, 255, 35, 255)
 
 # NODE DEFAULTS
 NODE_ICON_SIZE = 24
+PIXMAP_CACHE_LIMIT = 256
+NODE_WIDGET_RELEASE_DELAY = 2000
+NODE_CULL_MARGIN = 200.0
+NODE_NUDGE_STEP = 1.0
+NODE_NUDGE_STEP_LARGE = 10.0
 NODE_SEL_COLOR = (255, 255, 255, 30)
 NODE_SEL_BORDER_COLOR = (254, 207, 42, 255)
 
+# AUTOSAVE
+AUTOSAVE_INTERVAL = 60000
+AUTOSAVE_BACKUPS = 3
+
+# UNDO
+UNDO_MEMORY_LIMIT = 256 * 1024 * 1024
+
 # NODE GRAPH VIEWER DEFAULTS
 VIEWER_BG_COLOR = (35, 35, 35)
 VIEWER_GRID_COLOR = (40, 40, 40)
 VIEWER_GRID_OVERLAY = True
+MINIMAP_SIZE = (200, 150)
+TAB_SEARCH_LIMIT = 20
 
 # GRAPH PATHS
 BASE_PATH = os.path.split(os.path.dirname(os.path.abspath(__file__)))[0]
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+import threading
+import time
+
+from PySide2 import QtCore
+
+
+class LayoutRunner(QtCore.QObject):
+    """
+    Runs a graph layout function on a worker thread.
+
+    The layout works on a plain data snapshot of the graph taken on the GUI
+    thread and the resulting positions are emitted back to the GUI thread
+    with the "finished" signal.
+
+    Iterative layouts report their intermediate positions with "report()",
+    the "progress" signal is emitted at most once per preview interval and
+    only after the GUI thread has taken the previous preview.
+    """
+
+    #: {<node_id>: (x, y)}
+    finished = QtCore.Signal(object)
+    failed = QtCore.Signal(str)
+    progress = QtCore.Signal()
+
+    def __init__(self, parent=None, preview_interval=1.0 / 60):
+        """
+        Args:
+            parent (QtCore.QObject): parent object.
+            preview_interval (float): min seconds between previews.
+        """
+        super(LayoutRunner, self).__init__(parent)
+        self._thread = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._preview = None
+        self._preview_time = 0.0
+        self.preview_interval = preview_interval
+
+    def is_running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self, func, *args, **kwargs):
+        """
+        Run the layout function on the worker thread.
+
+        Args:
+            func (function): layout function returning the node positions.
+            *args: function arguments.
+            **kwargs: function keyword arguments.
+
+        Returns:
+            bool: false if a layout is already running.
+        """
+        if self.is_running():
+            return False
+        self._cancel.clear()
+        self._preview = None
+        self._thread = threading.Thread(
+            target=self._run, args=(func, args, kwargs))
+        self._thread.daemon = True
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        """
+        Stop the running layout, the "failed" signal is emitted once the
+        layout has stopped.
+        """
+        self._cancel.set()
+
+    def report(self, positions):
+        """
+        Called from the layout on the worker thread with the intermediate
+        node positions.
+
+        Args:
+            positions (numpy.ndarray): (n, 2) array of node positions.
+
+        Returns:
+            bool: false if the layout has been cancelled.
+        """
+        now = time.time()
+        if now - self._preview_time >= self.preview_interval:
+            self._preview_time = now
+            with self._lock:
+                emit = self._preview is None
+                self._preview = positions.copy()
+            if emit:
+                self.progress.emit()
+        return not self._cancel.is_set()
+
+    def take_preview(self):
+        """
+        Returns:
+            numpy.ndarray: latest intermediate node positions or None.
+        """
+        with self._lock:
+            preview, self._preview = self._preview, None
+        return preview
+
+    def wait(self, timeout=None):
+        """
+        Block until the running layout has finished.
+
+        Args:
+            timeout (float): max time to wait in seconds.
+        """
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self, func, args, kwargs):
+        # runs on the worker thread.
+        try:
+            positions = func(*args, **kwargs)
+        except Exception as e:
+            self.failed.emit('layout failed: {}'.format(e))
+            return
+        self.take_preview()
+        if self._cancel.is_set():
+            self.failed.emit('layout cancelled.')
+            return
+        self.finished.emit(positions)
@@ -0,0 +1,143 @@
+#!/usr/bin/python
+from PySide2 import QtCore, QtGui, QtWidgets
+
+from .constants import (MINIMAP_SIZE, NODE_SEL_BORDER_COLOR,
+                        VIEWER_BG_COLOR)
+from .node_abstract import AbstractNodeItem
+
+
+class NodeMinimap(QtWidgets.QWidget):
+    """
+    Overview of the node graph drawn from the node rects and colors.
+
+    The overview is cached in an image at the minimap resolution and only
+    the areas of the scene that have changed are redrawn, painting the
+    widget is a single image blit plus the viewport rect. Click or drag
+    in the minimap to center the viewer.
+    """
+
+    def __init__(self, viewer, size=MINIMAP_SIZE):
+        """
+        Args:
+            viewer (NodeGraphQt.widgets.viewer.NodeViewer): node viewer.
+            size (tuple): minimap (width, height) in pixels.
+        """
+        super(NodeMinimap, self).__init__(viewer)
+        self.setFixedSize(*size)
+        self.setCursor(QtCore.Qt.PointingHandCursor)
+        self._viewer = viewer
+        self._image = QtGui.QImage()
+        self._transform = QtGui.QTransform()
+        self._inverted = QtGui.QTransform()
+        self._dirty = QtGui.QRegion()
+        self._scheduled = False
+        viewer.scene().changed.connect(self._on_scene_changed)
+        viewer.viewport_changed.connect(self.update)
+
+    def _update_transform(self):
+        rect = self._viewer.sceneRect()
+        width, height = self.width(), self.height()
+        scale = min(width / rect.width(), height / rect.height())
+        offset_x = (width - rect.width() * scale) / 2
+        offset_y = (height - rect.height() * scale) / 2
+        self._transform = QtGui.QTransform(
+            scale, 0.0, 0.0, scale,
+            offset_x - rect.left() * scale, offset_y - rect.top() * scale)
+        self._inverted = self._transform.inverted()[0]
+
+    def rebuild(self):
+        """
+        Redraw the whole overview image.
+        """
+        self._update_transform()
+        self._image = QtGui.QImage(self.size(), QtGui.QImage.Format_RGB32)
+        self._dirty = QtGui.QRegion()
+        self._draw_rect(self._image.rect())
+        self.update()
+
+    def _draw_rect(self, rect):
+        # redraws the nodes of the scene area under the image rect.
+        scene_rect = self._inverted.mapRect(QtCore.QRectF(rect))
+        nodes = [i for i in self._viewer.scene().items(scene_rect)
+                 if isinstance(i, AbstractNodeItem)]
+        painter = QtGui.QPainter(self._image)
+        painter.setClipRect(rect)
+        painter.fillRect(rect, QtGui.QColor(*VIEWER_BG_COLOR).darker(120))
+        painter.setPen(QtCore.Qt.NoPen)
+        select_color = QtGui.QColor(*NODE_SEL_BORDER_COLOR)
+        # items are returned top to bottom.
+        for node in reversed(nodes):
+            node_rect = self._transform.mapRect(node.sceneBoundingRect())
+            if node_rect.width() < 1.0:
+                node_rect.setWidth(1.0)
+            if node_rect.height() < 1.0:
+                node_rect.setHeight(1.0)
+            if node.isSelected():
+                painter.setBrush(select_color)
+            else:
+                painter.setBrush(QtGui.QColor(*node.color).lighter(150))
+            painter.drawRect(node_rect)
+        painter.end()
+
+    def _on_scene_changed(self, rects):
+        if self._image.isNull() or not self.isVisible():
+            return
+        for rect in rects:
+            rect = self._transform.mapRect(rect).toAlignedRect()
+            self._dirty = self._dirty.united(rect.adjusted(-1, -1, 1, 1))
+        if not self._scheduled and not self._dirty.isEmpty():
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self._flush)
+
+    def _flush(self):
+        self._scheduled = False
+        dirty, self._dirty = self._dirty, QtGui.QRegion()
+        dirty = dirty.intersected(self._image.rect())
+        for rect in dirty.rects():
+            self._draw_rect(rect)
+        self.update()
+
+    def viewport_rect(self):
+        """
+        Returns:
+            QtCore.QRectF: viewer viewport rect in minimap coordinates.
+        """
+        viewer = self._viewer
+        rect = viewer.mapToScene(viewer.viewport().rect()).boundingRect()
+        return self._transform.mapRect(rect)
+
+    def showEvent(self, event):
+        super(NodeMinimap, self).showEvent(event)
+        self.rebuild()
+
+    def resizeEvent(self, event):
+        super(NodeMinimap, self).resizeEvent(event)
+        if self.isVisible():
+            self.rebuild()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.drawImage(0, 0, self._image)
+        painter.setBrush(QtGui.QColor(255, 255, 255, 20))
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 150), 1))
+        painter.drawRect(self.viewport_rect())
+        painter.setBrush(QtCore.Qt.NoBrush)
+        painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 255), 1))
+        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
+        painter.end()
+
+    def _navigate(self, pos):
+        self._viewer.centerOn(self._inverted.map(QtCore.QPointF(pos)))
+
+    def mousePressEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton:
+            self._navigate(event.pos())
+        event.accept()
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & QtCore.Qt.LeftButton:
+            self._navigate(event.pos())
+        event.accept()
+
+    def wheelEvent(self, event):
+        event.accept()
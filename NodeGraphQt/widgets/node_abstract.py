@@ -1,7 +1,12 @@
 #!/usr/bin/python
+import copy
+import uuid
+from collections import OrderedDict
+
 from PySide2 import QtCore, QtWidgets
 
 from .constants import Z_VAL_NODE
+from ..base.node_property import NodeProperty, PropertySchema
 
 
 class AbstractNodeItem(QtWidgets.QGraphicsItem):
@@ -9,23 +14,32 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
     The abstract base class of a node.
     """
 
+    # built-in node properties.
+    PROPERTY_SCHEMA = PropertySchema(OrderedDict([
+        ('id', NodeProperty('', serialize=False)),
+        ('name', NodeProperty('node')),
+        ('color', NodeProperty((48, 58, 69, 255))),
+        ('border_color', NodeProperty((85, 100, 100, 255))),
+        ('text_color', NodeProperty((255, 255, 255, 180))),
+        ('type', NodeProperty('AbstractBaseNode')),
+        ('selected', NodeProperty(False)),
+        ('disabled', NodeProperty(False)),
+    ]))
+
     def __init__(self, name='node', parent=None):
         super(AbstractNodeItem, self).__init__(parent)
         self.setFlags(self.ItemIsSelectable | self.ItemIsMovable)
         self.setZValue(Z_VAL_NODE)
         self.prev_pos = self.pos
-        self._properties = {
-            'id': hex(id(self)),
-            'name': name.strip(),
-            'color': (48, 58, 69, 255),
-            'border_color': (85, 100, 100, 255),
-            'text_color': (255, 255, 255, 180),
-            'type': 'AbstractBaseNode',
-            'selected': False,
-            'disabled': False,
-        }
+        self._schema = self.PROPERTY_SCHEMA
+        self._setters = self._schema.setters(type(self))
+        self._properties = self._schema.defaults()
+        # unique across sessions, object ids are reused by python.
+        self._properties['id'] = uuid.uuid4().hex
+        self._properties['name'] = name.strip()
         self._width = 120
         self._height = 80
+        self._culled = False
 
     def __str__(self):
         return '{}.{}(\'{}\')'.format(
@@ -66,13 +80,30 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
         """
         pass
 
+    @property
+    def culled(self):
+        return self._culled
+
+    def set_culled(self, state=True):
+        """
+        Called by the viewer when the node leaves or enters the visible
+        area.
+
+        Args:
+            state (bool): true if the node is outside the visible area.
+        """
+        self._culled = state
+
     @property
     def id(self):
         return self._properties['id']
 
     @id.setter
     def id(self, unique_id=''):
+        old_id = self._properties['id']
         self._properties['id'] = unique_id
+        if self.scene():
+            self.scene().node_id_changed(self, old_id)
 
     @property
     def type(self):
@@ -171,31 +202,75 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
         """
         return self._properties
 
+    @property
+    def property_schema(self):
+        return self._schema
+
+    def set_property_schema(self, schema):
+        """
+        Set the typed property schema of the node, properties missing from
+        the node are added with their default values.
+
+        Args:
+            schema (NodeGraphQt.base.node_property.PropertySchema): schema.
+        """
+        self._schema = schema
+        self._setters = schema.setters(type(self))
+        for name, value in schema.defaults().items():
+            self._properties.setdefault(name, value)
+
     def has_property(self, name):
-        return name in self._properties.keys()
+        return name in self._properties
 
     def add_property(self, name, value):
-        if name in self._properties.keys():
-            raise AssertionError('property "{}" already exists!')
-        self._properties[name] = value
+        if name in self._properties:
+            raise AssertionError('property "{}" already exists!'.format(name))
+        schema = PropertySchema({name: NodeProperty(value)})
+        self.set_property_schema(self._schema.merged(schema))
 
     def get_property(self, name):
         return self._properties.get(name)
 
+    def validate_property(self, name, value):
+        """
+        Returns the value validated against the property type.
+
+        Args:
+            name (str): property name.
+            value: property value.
+
+        Returns:
+            object: validated value.
+        """
+        prop = self._schema.get(name)
+        if prop is None:
+            raise AssertionError('{} has no property "{}"'
+                                 .format(self.__class__.__name__, name))
+        return prop.validate(value)
+
     def set_property(self, name, value):
-        class_name = self.__class__.__name__
-        if not self._properties.get(name):
+        setter = self._setters.get(name)
+        if setter is None:
             raise AssertionError('{} has no property "{}"'
-                                 .format(class_name, name))
+                                 .format(self.__class__.__name__, name))
+        old_value = self._properties.get(name)
+        value = setter(self, value)
+        scene = self.scene()
+        if scene:
+            scene.property_bus.notify(self.id, name, old_value, value)
+
+    def port_at(self, pos, margin=2.0):
+        """
+        Returns the port painted by the node at the scene position.
 
-        if isinstance(value, type(self._properties[name])):
-            if hasattr(self, name):
-                setattr(self, name, value)
-            else:
-                self._properties[name] = value
-        else:
-            raise TypeError('{} property "{}" has to be a {} type.'
-                            .format(class_name, name, value))
+        Args:
+            pos (QtCore.QPointF): scene position.
+            margin (float): extra hit-test margin around the port.
+
+        Returns:
+            None: the abstract node has no ports.
+        """
+        return None
 
     def viewer(self):
         """
@@ -232,12 +307,27 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
                     }
                 }
         """
+        props = self._properties
         serial = {
-            self.id: {k: v for k, v in self._properties.items() if k != 'id'}
+            self.id: {n: props[n] for n in self._schema.serialized()}
         }
         serial[self.id]['pos'] = self.pos
         return serial
 
+    def copy_properties(self, node):
+        """
+        copy the serialized properties and position of a node of the same
+        type, used to duplicate the node without serializing the session.
+
+        Args:
+            node (AbstractNodeItem): source node item.
+        """
+        props = node.properties
+        state = {n: copy.copy(props[n])
+                 for n in node.property_schema.serialized()}
+        state['pos'] = node.pos
+        self.from_dict(state)
+
     def from_dict(self, node_dict):
         """
         deserialize dict to node.
@@ -245,8 +335,14 @@ class AbstractNodeItem(QtWidgets.QGraphicsItem):
         Args:
             node_dict (dict): serialized node dict.
         """
+        setters = self._setters
         for name, value in node_dict.items():
-            if hasattr(self, name):
+            setter = setters.get(name)
+            if setter:
+                setter(self, value)
+            elif hasattr(self, name):
                 setattr(self, name, value)
             else:
-                self.set_property(name, value)
+                # property added to the node at runtime.
+                self.add_property(name, value)
+                setters = self._setters
@@ -3,6 +3,7 @@ from PySide2 import QtGui, QtCore, QtWidgets
 
 from .constants import Z_VAL_PIPE, NODE_SEL_COLOR, NODE_SEL_BORDER_COLOR
 from .node_abstract import AbstractNodeItem
+from ..base.node_property import NodeProperty, PropertySchema
 from .pipe import Pipe
 from .port import PortItem
 
@@ -71,6 +72,9 @@ class BackdropNodeItem(AbstractNodeItem):
     Base Backdrop item.
     """
 
+    PROPERTY_SCHEMA = AbstractNodeItem.PROPERTY_SCHEMA.merged(
+        PropertySchema({'backdrop_text': NodeProperty('')}))
+
     def __init__(self, name='backdrop', text='', parent=None):
         super(BackdropNodeItem, self).__init__(name, parent)
         self.setZValue(Z_VAL_PIPE - 1)
@@ -229,6 +233,11 @@ class BackdropNodeItem(AbstractNodeItem):
         AbstractNodeItem.height.fset(self, height)
         self._sizer.set_pos(self._width, self._height)
 
+    def copy_properties(self, node):
+        super(BackdropNodeItem, self).copy_properties(node)
+        self.width = node.width
+        self.height = node.height
+
     def to_dict(self):
         serial = super(BackdropNodeItem, self).to_dict()
         serial[self.id]['backdrop_text'] = self.backdrop_text
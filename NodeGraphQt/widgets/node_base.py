@@ -1,5 +1,6 @@
 #!/usr/bin/python
 from collections import OrderedDict
+from contextlib import contextmanager
 
 from PySide2 import QtGui, QtCore, QtWidgets
 
@@ -9,9 +10,11 @@ from .constants import (IN_PORT, OUT_PORT,
                         Z_VAL_NODE, Z_VAL_NODE_WIDGET)
 
 from .node_abstract import AbstractNodeItem
+from ..base.node_property import NodeProperty, PropertySchema
 from .node_widgets import (NodeBaseWidget, NodeComboBox,
                            NodeLineEdit, NodeCheckBox)
-from .port import PortItem
+from .pixmap_cache import PixmapCache
+from .port import PortItem, PaintedPort, draw_port
 
 
 class XDisabledItem(QtWidgets.QGraphicsItem):
@@ -100,12 +103,13 @@ class NodeItem(AbstractNodeItem):
     Base Node item.
     """
 
-    def __init__(self, name='node', parent=None):
+    PROPERTY_SCHEMA = AbstractNodeItem.PROPERTY_SCHEMA.merged(
+        PropertySchema({'icon': NodeProperty(ICON_NODE_BASE, nullable=True)}))
+
+    def __init__(self, name='node', parent=None, painted_ports=False,
+                 lazy_widgets=False):
         super(NodeItem, self).__init__(name, parent)
-        pixmap = QtGui.QPixmap(ICON_NODE_BASE)
-        pixmap = pixmap.scaledToHeight(NODE_ICON_SIZE,
-                                       QtCore.Qt.SmoothTransformation)
-        self._properties['icon'] = ICON_NODE_BASE
+        pixmap = PixmapCache.pixmap(ICON_NODE_BASE, NODE_ICON_SIZE)
         self._icon_item = QtWidgets.QGraphicsPixmapItem(pixmap, self)
         self._text_item = QtWidgets.QGraphicsTextItem(self.name, self)
         self._x_item = XDisabledItem(self, 'node disabled')
@@ -114,6 +118,13 @@ class NodeItem(AbstractNodeItem):
         self._input_items = []
         self._output_items = []
         self._widgets = OrderedDict()
+        self._painted_ports = painted_ports
+        self._lazy_widgets = lazy_widgets
+        self._layout_locks = 0
+        self._layout_pending = False
+        if painted_ports:
+            self.setAcceptHoverEvents(True)
+            self.setFlag(self.ItemSendsScenePositionChanges, True)
 
     def paint(self, painter, option, widget):
         painter.save()
@@ -164,8 +175,62 @@ class NodeItem(AbstractNodeItem):
         painter.setPen(QtGui.QPen(border_color, border_width))
         painter.drawPath(path)
 
+        if self._painted_ports:
+            self._paint_ports(painter)
+
         painter.restore()
 
+    def _paint_ports(self, painter):
+        """
+        draw the ports and port labels when the node paints its own ports.
+
+        Args:
+            painter (QtGui.QPainter): painter object.
+        """
+        for port in self._input_items + self._output_items:
+            draw_port(painter, port.rect(), port.color, port.border_color,
+                      port.hovered, bool(port.connected_pipes))
+
+        painter.setFont(self._text_item.font())
+        painter.setPen(QtGui.QColor(*self.text_color))
+        metrics = QtGui.QFontMetricsF(painter.font())
+        txt_height = metrics.height()
+        for port in self._input_items:
+            if not port.display_name:
+                continue
+            rect = port.rect()
+            txt_rect = QtCore.QRectF(rect.right() + 7.0,
+                                     rect.center().y() - (txt_height / 2),
+                                     metrics.width(port.name) + 1.0,
+                                     txt_height)
+            painter.drawText(txt_rect, QtCore.Qt.AlignLeft, port.name)
+        for port in self._output_items:
+            if not port.display_name:
+                continue
+            rect = port.rect()
+            txt_width = metrics.width(port.name) + 1.0
+            txt_rect = QtCore.QRectF(rect.left() - 5.0 - txt_width,
+                                     rect.center().y() - (txt_height / 2),
+                                     txt_width,
+                                     txt_height)
+            painter.drawText(txt_rect, QtCore.Qt.AlignRight, port.name)
+
+    def _set_hovered_port(self, port):
+        for p in self._input_items + self._output_items:
+            if p.hovered != (p is port):
+                p.hovered = p is port
+                self.update(p.rect())
+
+    def hoverMoveEvent(self, event):
+        if self._painted_ports:
+            self._set_hovered_port(self.port_at(event.scenePos()))
+        super(NodeItem, self).hoverMoveEvent(event)
+
+    def hoverLeaveEvent(self, event):
+        if self._painted_ports:
+            self._set_hovered_port(None)
+        super(NodeItem, self).hoverLeaveEvent(event)
+
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.MouseButton.LeftButton:
             start = PortItem().boundingRect().width()
@@ -182,7 +247,10 @@ class NodeItem(AbstractNodeItem):
         super(NodeItem, self).mouseReleaseEvent(event)
 
     def itemChange(self, change, value):
-        if change == self.ItemSelectedChange and self.scene():
+        if change == self.ItemScenePositionHasChanged and self._painted_ports:
+            for port in self._input_items + self._output_items:
+                port.redraw_connected_pipes()
+        elif change == self.ItemSelectedChange and self.scene():
             self.reset_pipes()
             if value:
                 self.hightlight_pipes()
@@ -217,6 +285,8 @@ class NodeItem(AbstractNodeItem):
             color (tuple): color value in (r, g, b, a).
         """
         text_color = QtGui.QColor(*color)
+        if self._painted_ports:
+            self.update()
         for port, text in self._input_text_items.items():
             text.setDefaultTextColor(text_color)
         for port, text in self._output_text_items.items():
@@ -263,11 +333,25 @@ class NodeItem(AbstractNodeItem):
             width = self._text_item.boundingRect().width()
 
         port_height = 0.0
+        if self._painted_ports:
+            metrics = QtGui.QFontMetricsF(self._text_item.font())
+            for ports in (self._input_items, self._output_items):
+                if not ports:
+                    continue
+                port_widths = []
+                for port in ports:
+                    port_width = port.boundingRect().width() * 2
+                    if port.display_name:
+                        # matches the QGraphicsTextItem document margins.
+                        port_width += metrics.width(port.name) + 8.0
+                    port_widths.append(port_width)
+                width += max(port_widths)
+                port_height = ports[0].boundingRect().height() * 2
         if self._input_text_items:
             input_widths = []
             for port, text in self._input_text_items.items():
                 input_width = port.boundingRect().width() * 2
-                if text.isVisible():
+                if port.display_name:
                     input_width += text.boundingRect().width()
                 input_widths.append(input_width)
             width += max(input_widths)
@@ -277,7 +361,7 @@ class NodeItem(AbstractNodeItem):
             output_widths = []
             for port, text in self._output_text_items.items():
                 output_width = port.boundingRect().width() * 2
-                if text.isVisible():
+                if port.display_name:
                     output_width += text.boundingRect().width()
                 output_widths.append(output_width)
             width += max(output_widths)
@@ -416,6 +500,10 @@ class NodeItem(AbstractNodeItem):
             x (float): horizontal x offset
             y (float): vertical y offset
         """
+        if self._painted_ports:
+            for port in self._input_items + self._output_items:
+                port.setPos(port.x() + x, port.y() + y)
+            self.update()
         for port, text in self._input_text_items.items():
             port_x, port_y = port.pos().x(), port.pos().y()
             text_x, text_y = text.pos().x(), text.pos().y()
@@ -436,6 +524,8 @@ class NodeItem(AbstractNodeItem):
             viewer (NodeGraphQt.widgets.viewer.NodeViewer): not used
             pos (tuple): cursor position.
         """
+        self._layout_pending = False
+
         # set initial node position.
         if pos:
             self.setPos(pos[0], pos[1])
@@ -468,20 +558,53 @@ class NodeItem(AbstractNodeItem):
         self.arrange_ports(padding_y=35.0)
         self.offset_ports(0.0, 15.0)
 
+    def _flush_layout(self):
+        if self._layout_locks or not self._layout_pending:
+            return
+        self._layout_pending = False
+        if self.scene():
+            self.post_init()
+
+    def schedule_layout(self):
+        """
+        Mark the node layout dirty and relayout once on the next event loop
+        tick, or when the outer "deferred_layout" context exits.
+        """
+        if not self.scene() or self._layout_pending:
+            return
+        self._layout_pending = True
+        if not self._layout_locks:
+            QtCore.QTimer.singleShot(0, self._flush_layout)
+
+    @contextmanager
+    def deferred_layout(self):
+        """
+        Context manager that batches layout changes to the node and
+        relayouts once on exit.
+
+        eg.
+            with node_item.deferred_layout():
+                for i in range(50):
+                    node_item.add_input('in {}'.format(i))
+        """
+        self._layout_locks += 1
+        try:
+            yield self
+        finally:
+            self._layout_locks -= 1
+            self._flush_layout()
+
     @property
     def icon(self):
         return self._properties['icon']
 
     @icon.setter
     def icon(self, path=None):
-        self._properties['icon'] = path
         path = path or ICON_NODE_BASE
-        pixmap = QtGui.QPixmap(path)
-        pixmap = pixmap.scaledToHeight(NODE_ICON_SIZE,
-                                       QtCore.Qt.SmoothTransformation)
+        self._properties['icon'] = path
+        pixmap = PixmapCache.pixmap(path, NODE_ICON_SIZE)
         self._icon_item.setPixmap(pixmap)
-        if self.scene():
-            self.post_init()
+        self.schedule_layout()
 
     @AbstractNodeItem.width.setter
     def width(self, width=0.0):
@@ -498,11 +621,33 @@ class NodeItem(AbstractNodeItem):
         height = height if height > h else h
         AbstractNodeItem.height.fset(self, height)
 
+    def set_culled(self, state=True):
+        """
+        Hide the node label, port names and widgets while the node is
+        outside the visible area, lazy widgets also release their embedded
+        widget.
+
+        Args:
+            state (bool): true if the node is outside the visible area.
+        """
+        if state == self._culled:
+            return
+        AbstractNodeItem.set_culled(self, state)
+        self._text_item.setVisible(not state)
+        for text_items in (self._input_text_items, self._output_text_items):
+            for port, text in text_items.items():
+                text.setVisible(port.display_name and not state)
+        for widget in self._widgets.values():
+            if state and not widget.hasFocus():
+                widget.release()
+            widget.setVisible(not state)
+
     @AbstractNodeItem.disabled.setter
     def disabled(self, state=False):
         AbstractNodeItem.disabled.fset(self, state)
         for n, w in self._widgets.items():
-            w.widget.setDisabled(state)
+            if w.widget:
+                w.widget.setDisabled(state)
         self._tooltip_disable(state)
         self._x_item.setVisible(state)
 
@@ -516,8 +661,11 @@ class NodeItem(AbstractNodeItem):
     def name(self, name=''):
         AbstractNodeItem.name.fset(self, name)
         self._text_item.setPlainText(name)
-        if self.scene():
-            self.post_init()
+        self.schedule_layout()
+
+    @property
+    def painted_ports(self):
+        return self._painted_ports
 
     @property
     def inputs(self):
@@ -535,21 +683,24 @@ class NodeItem(AbstractNodeItem):
             display_name (bool): display the port name. 
 
         Returns:
-            PortItem: input item widget
+            PortItem or PaintedPort: input port
         """
-        port = PortItem(self)
+        if self._painted_ports:
+            port = PaintedPort(self)
+        else:
+            port = PortItem(self)
         port.name = name
         port.port_type = IN_PORT
         port.multi_connection = multi_port
         port.display_name = display_name
-        text = QtWidgets.QGraphicsTextItem(port.name, self)
-        text.font().setPointSize(8)
-        text.setFont(text.font())
-        text.setVisible(display_name)
-        self._input_text_items[port] = text
+        if not self._painted_ports:
+            text = QtWidgets.QGraphicsTextItem(port.name, self)
+            text.font().setPointSize(8)
+            text.setFont(text.font())
+            text.setVisible(display_name and not self._culled)
+            self._input_text_items[port] = text
         self._input_items.append(port)
-        if self.scene():
-            self.post_init()
+        self.schedule_layout()
         return port
 
     def add_output(self, name='output', multi_port=False, display_name=True):
@@ -560,46 +711,78 @@ class NodeItem(AbstractNodeItem):
             display_name (bool): display the port name. 
 
         Returns:
-            PortItem: output item widget
+            PortItem or PaintedPort: output port
         """
-        port = PortItem(self)
+        if self._painted_ports:
+            port = PaintedPort(self)
+        else:
+            port = PortItem(self)
         port.name = name
         port.port_type = OUT_PORT
         port.multi_connection = multi_port
         port.display_name = display_name
-        text = QtWidgets.QGraphicsTextItem(port.name, self)
-        text.font().setPointSize(8)
-        text.setFont(text.font())
-        text.setVisible(display_name)
-        self._output_text_items[port] = text
+        if not self._painted_ports:
+            text = QtWidgets.QGraphicsTextItem(port.name, self)
+            text.font().setPointSize(8)
+            text.setFont(text.font())
+            text.setVisible(display_name and not self._culled)
+            self._output_text_items[port] = text
         self._output_items.append(port)
-        if self.scene():
-            self.post_init()
+        self.schedule_layout()
         return port
 
+    def port_at(self, pos, margin=2.0):
+        """
+        Returns the painted port at the scene position.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+            margin (float): extra hit-test margin around the port.
+
+        Returns:
+            PaintedPort: port under the position or None.
+        """
+        if not self._painted_ports:
+            return
+        pos = self.mapFromScene(pos)
+        for port in self._input_items + self._output_items:
+            rect = port.rect().adjusted(-margin, -margin, margin, margin)
+            if rect.contains(pos):
+                return port
+
     @property
     def widgets(self):
         return dict(self._widgets)
 
     def add_combo_menu(self, name='', label='', items=None, tooltip=''):
         items = items or []
-        widget = NodeComboBox(self, name, label, items)
+        widget = NodeComboBox(self, name, label, items,
+                              lazy=self._lazy_widgets)
         widget.setToolTip(tooltip)
         self.add_widget(widget)
 
     def add_text_input(self, name='', label='', text='', tooltip=''):
-        widget = NodeLineEdit(self, name, label, text)
+        widget = NodeLineEdit(self, name, label, text,
+                              lazy=self._lazy_widgets)
         widget.setToolTip(tooltip)
         self.add_widget(widget)
 
     def add_checkbox(self, name='', label='', text='', state=False, tooltip=''):
-        widget = NodeCheckBox(self, name, label, text, state)
+        widget = NodeCheckBox(self, name, label, text, state,
+                              lazy=self._lazy_widgets)
         widget.setToolTip(tooltip)
         self.add_widget(widget)
 
     def add_widget(self, widget):
         if isinstance(widget, NodeBaseWidget):
             self._widgets[widget.name] = widget
+            widget.value_changed.connect(self._on_widget_value_changed)
+            widget.setVisible(not self._culled)
+
+    def _on_widget_value_changed(self, name, value):
+        if self.scene():
+            self.scene().record_change('widget', id=self.id, name=name,
+                                       value=self._widgets[name].value)
 
     def get_widget(self, name):
         return self._widgets[name]
@@ -611,6 +794,12 @@ class NodeItem(AbstractNodeItem):
             port.delete()
         super(NodeItem, self).delete()
 
+    def copy_properties(self, node):
+        super(NodeItem, self).copy_properties(node)
+        for name, widget in node.widgets.items():
+            if self._widgets.get(name):
+                self._widgets[name].value = widget.value
+
     def to_dict(self):
         serial = super(NodeItem, self).to_dict()
         if self._widgets:
@@ -0,0 +1,134 @@
+#!/usr/bin/python
+from PySide2 import QtCore
+
+from .constants import NODE_CULL_MARGIN
+from .node_abstract import AbstractNodeItem
+
+
+class NodeCuller(QtCore.QObject):
+    """
+    Culls the nodes outside the visible area of the viewer, a culled node
+    hides its text items and embedded widgets until it scrolls back into
+    view.
+
+    Only the nodes in the viewport (plus the margin) are queried from the
+    scene index, the nodes that are scrolled out of view are found from the
+    previous visible set so updates don't walk the whole graph.
+    """
+
+    def __init__(self, viewer, margin=NODE_CULL_MARGIN):
+        """
+        Args:
+            viewer (NodeGraphQt.widgets.viewer.NodeViewer): node viewer.
+            margin (float): scene distance around the viewport that is
+                kept unculled.
+        """
+        super(NodeCuller, self).__init__(viewer)
+        self._viewer = viewer
+        self._margin = margin
+        self._visible = set()
+        self._pending = set()
+        self._rect = QtCore.QRectF()
+        self._scheduled = False
+        viewer.viewport_changed.connect(self.schedule)
+        viewer.scene().changed.connect(self._on_scene_changed)
+
+    @property
+    def margin(self):
+        return self._margin
+
+    def visible_rect(self):
+        """
+        Returns:
+            QtCore.QRectF: scene rect of the viewport plus the margin.
+        """
+        viewer = self._viewer
+        rect = viewer.mapToScene(viewer.viewport().rect()).boundingRect()
+        margin = self._margin
+        return rect.adjusted(-margin, -margin, margin, margin)
+
+    def schedule(self):
+        """
+        Update the culled nodes on the next event loop tick.
+        """
+        if not self._scheduled:
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self.update)
+
+    def node_added(self, node):
+        """
+        Called by the scene when a node has been added.
+
+        Args:
+            node (AbstractNodeItem): node item.
+        """
+        self._pending.add(node)
+        self.schedule()
+
+    def node_removed(self, node):
+        """
+        Called by the scene when a node has been removed.
+
+        Args:
+            node (AbstractNodeItem): node item.
+        """
+        self._visible.discard(node)
+        self._pending.discard(node)
+
+    def _nodes_in(self, rect):
+        scene = self._viewer.scene()
+        return set(i for i in scene.items(rect)
+                   if isinstance(i, AbstractNodeItem))
+
+    def update(self):
+        """
+        Uncull the nodes that came into view and cull the nodes that left.
+        """
+        self._scheduled = False
+        rect = self.visible_rect()
+        pending, self._pending = self._pending, set()
+        if rect != self._rect:
+            self._rect = rect
+            visible = self._nodes_in(rect)
+            for node in self._visible - visible:
+                node.set_culled(True)
+            pending.update(visible)
+            self._visible = visible
+        for node in pending:
+            if node.scene() is not self._viewer.scene():
+                continue
+            if rect.intersects(node.sceneBoundingRect()):
+                node.set_culled(False)
+                self._visible.add(node)
+            else:
+                node.set_culled(True)
+                self._visible.discard(node)
+
+    def _on_scene_changed(self, rects):
+        # nodes moved into view are unculled, nodes moved out are left
+        # until the view is scrolled.
+        for rect in rects:
+            rect = rect.intersected(self._rect)
+            if rect.isEmpty():
+                continue
+            for node in self._nodes_in(rect) - self._visible:
+                node.set_culled(False)
+                self._visible.add(node)
+
+    def cull_all(self):
+        """
+        Cull every node outside the visible rect.
+        """
+        self._rect = QtCore.QRectF()
+        self._visible = set()
+        self._pending = set(self._viewer.all_nodes())
+        self.update()
+
+    def clear(self):
+        """
+        Uncull all the nodes.
+        """
+        self._pending = set()
+        self._visible = set()
+        for node in self._viewer.all_nodes():
+            node.set_culled(False)
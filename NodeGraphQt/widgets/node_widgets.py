@@ -1,23 +1,44 @@
 #!/usr/bin/python
-from PySide2 import QtCore, QtWidgets
+from PySide2 import QtCore, QtGui, QtWidgets
 
-from .constants import Z_VAL_NODE_WIDGET
+from .constants import Z_VAL_NODE_WIDGET, NODE_WIDGET_RELEASE_DELAY
 from .stylesheet import *
 
 
+def install_node_widget_style(app=None):
+    """
+    Add the node widget stylesheet to the application stylesheet so Qt
+    only parses it once, node widgets created afterwards no longer set
+    their own stylesheet.
+
+    Args:
+        app (QtWidgets.QApplication): application (defaults to the instance).
+    """
+    app = app or QtWidgets.QApplication.instance()
+    if not app or _NodeGroubBox.app_style:
+        return
+    app.setStyleSheet(app.styleSheet() + '\n' + STYLE_NODE_WIDGETS_APP)
+    _NodeGroubBox.app_style = True
+
+
 class _NodeGroubBox(QtWidgets.QGroupBox):
 
-    def __init__(self, label, parent=None):
+    # true when the stylesheet is installed on the application.
+    app_style = False
+
+    def __init__(self, label, widget_type='', parent=None):
         super(_NodeGroubBox, self).__init__(parent)
         margin = (0, 0, 0, 0)
-        padding_top = '14px'
         if label == '':
             margin = (0, 2, 0, 0)
-            padding_top = '2px'
-        style = STYLE_QGROUPBOX.replace('$PADDING_TOP', padding_top)
         self.setMaximumSize(120, 50)
         self.setTitle(label)
-        self.setStyleSheet(style)
+        if self.app_style:
+            self.setObjectName(NODE_WIDGET_GROUP)
+            self.setProperty('label', 'true' if label else 'false')
+        else:
+            self.setStyleSheet(
+                node_widget_stylesheet(widget_type, label != ''))
 
         self._layout = QtWidgets.QVBoxLayout(self)
         self._layout.setContentsMargins(*margin)
@@ -30,34 +51,241 @@ class _NodeGroubBox(QtWidgets.QGroupBox):
 class NodeBaseWidget(QtWidgets.QGraphicsProxyWidget):
     """
     Base Node Widget.
+
+    With "lazy" enabled the widget value is painted as a static placeholder
+    and the embedded QWidget is only created when the widget is hovered or
+    focused, then released again once it's idle.
     """
 
     value_changed = QtCore.Signal(str, str)
 
-    def __init__(self, parent=None, name='widget', label=''):
+    # placeholder sizes measured from the first real widget with the same
+    # content (see "_size_key").
+    _placeholder_sizes = {}
+
+    def __init__(self, parent=None, name='widget', label='', lazy=False):
         super(NodeBaseWidget, self).__init__(parent)
         self.setZValue(Z_VAL_NODE_WIDGET)
         self._name = name
         self._label = label
+        self._value = None
+        self._lazy = lazy
+        self._realized = False
+        self._release_timer = None
+        if lazy:
+            self.setAcceptHoverEvents(True)
+            self.setFlag(self.ItemIsFocusable, True)
+            self._release_timer = QtCore.QTimer(self)
+            self._release_timer.setSingleShot(True)
+            self._release_timer.setInterval(NODE_WIDGET_RELEASE_DELAY)
+            self._release_timer.timeout.connect(self._release_if_idle)
 
     def _value_changed(self):
         self.value_changed.emit(self.name, self.value)
-        
+
+    def _init_widget(self):
+        """
+        create the embedded widget or the placeholder.
+        (called at the end of the subclass constructor)
+        """
+        if not self._lazy:
+            self.realize()
+            return
+        self._fit_placeholder()
+
+    def _size_key(self):
+        """
+        key of the placeholder size cache, widgets with the same key are
+        the same size.
+        (subclasses add the content that changes the widget size)
+
+        Returns:
+            tuple: cache key.
+        """
+        return self.type, self._label
+
+    def _fit_placeholder(self):
+        """
+        resize the placeholder to the size of the real widget, the widget
+        is measured once per size key.
+        """
+        if self._realized:
+            return
+        key = self._size_key()
+        if key not in self._placeholder_sizes:
+            # realize and release the widget to measure it.
+            self.realize()
+            self.release()
+            return
+        self.resize(self._placeholder_sizes[key])
+
+    def _set_placeholder_value(self, value):
+        """
+        store the value while the widget is released and emit the
+        "value_changed" signal the real widget would have emitted.
+
+        Args:
+            value (object): new widget value.
+        """
+        if value == self._value:
+            return
+        self._value = value
+        self.update()
+        self._value_changed()
+
+    def _build_widget(self):
+        """
+        build the QWidget hierarchy embedded in the proxy.
+        (abstract, implemented by the subclasses)
+
+        Returns:
+            QtWidgets.QWidget: top level widget.
+        """
+        raise NotImplementedError
+
+    def _release_widget(self):
+        """
+        store the widget state in "self._value" and drop the references to
+        the widget before it is deleted.
+        (the default implementation keeps nothing)
+        """
+        return
+
+    def _is_busy(self):
+        """
+        Returns:
+            bool: true if the embedded widget is being interacted with.
+        """
+        return self.hasFocus()
+
+    def _release_if_idle(self):
+        if self.isUnderMouse() or self._is_busy():
+            self._release_timer.start()
+            return
+        self.release()
+
+    def _placeholder_text(self):
+        return str(self.value)
+
+    def _paint_placeholder(self, painter, rect):
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
+
+        font = painter.font()
+        font.setPointSize(10)
+        painter.setFont(font)
+        value_rect = QtCore.QRectF(rect)
+        if self._label:
+            label_rect = QtCore.QRectF(rect.x(), rect.y(), rect.width(), 14.0)
+            painter.setPen(QtGui.QColor(255, 255, 255, 85))
+            painter.drawText(label_rect, QtCore.Qt.AlignCenter, self._label)
+            value_rect.setTop(label_rect.bottom())
+        value_rect.adjust(4.0, 3.0, -4.0, -3.0)
+
+        painter.setBrush(QtGui.QColor(0, 0, 0, 80))
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 50), 1))
+        painter.drawRect(value_rect)
+        painter.setPen(QtGui.QColor(255, 255, 255, 150))
+        painter.drawText(value_rect, QtCore.Qt.AlignCenter,
+                         self._placeholder_text())
+
+        painter.restore()
+
+    def paint(self, painter, option, widget):
+        if self._realized or not self._lazy:
+            super(NodeBaseWidget, self).paint(painter, option, widget)
+            return
+        self._paint_placeholder(painter, self.boundingRect())
+
+    def hoverEnterEvent(self, event):
+        if self._lazy:
+            self._release_timer.stop()
+            self.realize()
+        super(NodeBaseWidget, self).hoverEnterEvent(event)
+
+    def hoverLeaveEvent(self, event):
+        if self._lazy:
+            self._release_timer.start()
+        super(NodeBaseWidget, self).hoverLeaveEvent(event)
+
+    def focusInEvent(self, event):
+        if self._lazy:
+            self.realize()
+        super(NodeBaseWidget, self).focusInEvent(event)
+
+    def focusOutEvent(self, event):
+        if self._lazy:
+            self._release_timer.start()
+        super(NodeBaseWidget, self).focusOutEvent(event)
+
     def setToolTip(self, tooltip):
         tooltip = tooltip.replace('\n', '<br/>')
         tooltip = '<b>{}</b><br/>{}'.format(self.name, tooltip)
         super(NodeBaseWidget, self).setToolTip(tooltip)
 
+    def realize(self):
+        """
+        Create the embedded widget if it's drawn as a placeholder.
+        """
+        if self._realized:
+            return
+        self._realized = True
+        group = self._build_widget()
+        node = self.parentItem()
+        if node is not None and getattr(node, 'disabled', False):
+            self.widget.setDisabled(True)
+        self.setWidget(group)
+        key = self._size_key()
+        if key not in self._placeholder_sizes:
+            self._placeholder_sizes[key] = self.size()
+
+    def release(self):
+        """
+        Delete the embedded widget and paint the widget as a placeholder
+        (only applies to lazy widgets).
+        """
+        if not (self._lazy and self._realized):
+            return
+        # the content may have changed since the widget was realized.
+        key = self._size_key()
+        if key not in self._placeholder_sizes:
+            self._placeholder_sizes[key] = self.size()
+        self._release_widget()
+        group = QtWidgets.QGraphicsProxyWidget.widget(self)
+        self._realized = False
+        self.setWidget(None)
+        if group:
+            group.hide()
+            group.deleteLater()
+        self.resize(self._placeholder_sizes[key])
+        self.update()
+
+    @property
+    def lazy(self):
+        return self._lazy
+
+    @property
+    def realized(self):
+        return self._realized
+
     @property
     def widget(self):
         return NotImplementedError
 
     @property
     def value(self):
+        """
+        Returns the widget value.
+        (abstract, implemented by the subclasses)
+        """
         raise NotImplementedError
 
     @value.setter
     def value(self, text):
+        """
+        Set the widget value.
+        (abstract, implemented by the subclasses)
+        """
         raise NotImplementedError
 
     @property
@@ -86,21 +314,41 @@ class NodeComboBox(NodeBaseWidget):
     ComboBox Node Widget.
     """
 
-    def __init__(self, parent=None, name='', label='', items=None):
-        super(NodeComboBox, self).__init__(parent, name, label)
+    def __init__(self, parent=None, name='', label='', items=None,
+                 lazy=False):
+        super(NodeComboBox, self).__init__(parent, name, label, lazy)
         self.setZValue(Z_VAL_NODE_WIDGET + 1)
+        self._combo = None
+        self._items = list(items or [])
+        self._value = self._items[0] if self._items else ''
+        self._init_widget()
+
+    def _build_widget(self):
         self._combo = QtWidgets.QComboBox()
-        self._combo.setStyleSheet(STYLE_QCOMBOBOX)
         self._combo.setMinimumHeight(24)
-        self._combo.activated.connect(self._value_changed)
         list_view = QtWidgets.QListView(self._combo)
-        list_view.setStyleSheet(STYLE_QLISTVIEW)
         self._combo.setView(list_view)
         self._combo.clearFocus()
-        group = _NodeGroubBox(label)
+        self._combo.addItems(self._items)
+        index = self._combo.findText(self._value, QtCore.Qt.MatchExactly)
+        self._combo.setCurrentIndex(index)
+        self._combo.activated.connect(self._value_changed)
+        group = _NodeGroubBox(self._label, 'combo')
         group.add_node_widget(self._combo)
-        self.setWidget(group)
-        self.add_items(items)
+        return group
+
+    def _release_widget(self):
+        self._value = str(self._combo.currentText())
+        self._combo = None
+
+    def _size_key(self):
+        key = super(NodeComboBox, self)._size_key()
+        return key + tuple(self._items)
+
+    def _is_busy(self):
+        if self._combo and self._combo.view().isVisible():
+            return True
+        return super(NodeComboBox, self)._is_busy()
 
     @property
     def type(self):
@@ -112,30 +360,52 @@ class NodeComboBox(NodeBaseWidget):
 
     @property
     def value(self):
+        if self._combo is None:
+            return self._value
         return str(self._combo.currentText())
 
     @value.setter
     def value(self, text=''):
+        if self._combo is None:
+            # like the real combo box only the user selection is emitted.
+            self._value = text if text in self._items else ''
+            self.update()
+            return
         index = self._combo.findText(text, QtCore.Qt.MatchExactly)
         self._combo.setCurrentIndex(index)
 
     def add_item(self, item):
-        self._combo.addItem(item)
+        self._items.append(item)
+        if self._combo is not None:
+            self._combo.addItem(item)
+            return
+        if len(self._items) == 1:
+            self._value = item
+        self._fit_placeholder()
 
     def add_items(self, items=None):
         if items:
-            self._combo.addItems(items)
+            for item in items:
+                self.add_item(item)
 
     def all_items(self):
-        return [self._combo.itemText(i) for i in range(self._combo.count)]
+        return list(self._items)
 
     def sort_items(self):
-        items = sorted(self.all_items())
-        self._combo.clear()
-        self._combo.addItems(items)
+        self._items = sorted(self._items)
+        if self._combo is not None:
+            self._combo.clear()
+            self._combo.addItems(self._items)
+            return
+        self._fit_placeholder()
 
     def clear(self):
-        self._combo.clear()
+        self._items = []
+        self._value = ''
+        if self._combo is not None:
+            self._combo.clear()
+            return
+        self._fit_placeholder()
 
 
 class NodeLineEdit(NodeBaseWidget):
@@ -143,17 +413,26 @@ class NodeLineEdit(NodeBaseWidget):
     LineEdit Node Widget.
     """
 
-    def __init__(self, parent=None, name='', label='', text=''):
-        super(NodeLineEdit, self).__init__(parent, name, label)
+    def __init__(self, parent=None, name='', label='', text='', lazy=False):
+        super(NodeLineEdit, self).__init__(parent, name, label, lazy)
+        self._ledit = None
+        self._value = text
+        self._init_widget()
+        self.text = text
+
+    def _build_widget(self):
         self._ledit = QtWidgets.QLineEdit()
-        self._ledit.setStyleSheet(STYLE_QLINEEDIT)
         self._ledit.setAlignment(QtCore.Qt.AlignCenter)
+        self._ledit.setText(self._value)
         self._ledit.textChanged.connect(self._value_changed)
         self._ledit.clearFocus()
-        group = _NodeGroubBox(label)
+        group = _NodeGroubBox(self._label, 'line_edit')
         group.add_node_widget(self._ledit)
-        self.setWidget(group)
-        self.text = text
+        return group
+
+    def _release_widget(self):
+        self._value = str(self._ledit.text())
+        self._ledit = None
 
     @property
     def type(self):
@@ -165,10 +444,15 @@ class NodeLineEdit(NodeBaseWidget):
 
     @property
     def value(self):
+        if self._ledit is None:
+            return self._value
         return str(self._ledit.text())
 
     @value.setter
     def value(self, text=''):
+        if self._ledit is None:
+            self._set_placeholder_value(text)
+            return
         self._ledit.setText(text)
 
 
@@ -177,21 +461,68 @@ class NodeCheckBox(NodeBaseWidget):
     CheckBox Node Widget.
     """
 
-    def __init__(self, parent=None, name='', label='', text='', state=False):
-        super(NodeCheckBox, self).__init__(parent, name, label)
-        self._cbox = QtWidgets.QCheckBox(text)
-        self._cbox.setChecked(state)
+    def __init__(self, parent=None, name='', label='', text='', state=False,
+                 lazy=False):
+        super(NodeCheckBox, self).__init__(parent, name, label, lazy)
+        self._cbox = None
+        self._text = text
+        self._value = state
+        self._init_widget()
+        self.text = text
+        self.state = state
+
+    def _build_widget(self):
+        self._cbox = QtWidgets.QCheckBox(self._text)
+        self._cbox.setChecked(self._value)
         self._cbox.setMinimumWidth(80)
-        self._cbox.setStyleSheet(STYLE_QCHECKBOX)
         font = self._cbox.font()
         font.setPointSize(11)
         self._cbox.setFont(font)
         self._cbox.stateChanged.connect(self._value_changed)
-        group = _NodeGroubBox(label)
+        group = _NodeGroubBox(self._label, 'checkbox')
         group.add_node_widget(self._cbox)
-        self.setWidget(group)
-        self.text = text
-        self.state = state
+        return group
+
+    def _release_widget(self):
+        self._value = self._cbox.isChecked()
+        self._cbox = None
+
+    def _size_key(self):
+        key = super(NodeCheckBox, self)._size_key()
+        return key + (self._text,)
+
+    def _paint_placeholder(self, painter, rect):
+        painter.save()
+
+        font = painter.font()
+        font.setPointSize(10)
+        painter.setFont(font)
+        top = rect.y()
+        if self._label:
+            label_rect = QtCore.QRectF(rect.x(), top, rect.width(), 14.0)
+            painter.setPen(QtGui.QColor(255, 255, 255, 85))
+            painter.drawText(label_rect, QtCore.Qt.AlignCenter, self._label)
+            top = label_rect.bottom()
+        body_rect = QtCore.QRectF(rect.x() + 4.0, top,
+                                  rect.width() - 8.0, rect.bottom() - top)
+        size = 13.0
+        box_rect = QtCore.QRectF(body_rect.x(),
+                                 body_rect.center().y() - (size / 2),
+                                 size, size)
+        painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255, 150), 1))
+        painter.setBrush(QtGui.QColor(0, 0, 0, 80))
+        painter.drawRect(box_rect)
+        if self._value:
+            painter.setBrush(QtGui.QColor(255, 255, 255, 150))
+            painter.drawRect(box_rect.adjusted(3.0, 3.0, -3.0, -3.0))
+        txt_rect = QtCore.QRectF(box_rect.right() + 8.0, body_rect.y(),
+                                 body_rect.right() - box_rect.right() - 8.0,
+                                 body_rect.height())
+        font.setPointSize(11)
+        painter.setFont(font)
+        painter.drawText(txt_rect, QtCore.Qt.AlignVCenter, self._text)
+
+        painter.restore()
 
     @property
     def type(self):
@@ -203,8 +534,13 @@ class NodeCheckBox(NodeBaseWidget):
 
     @property
     def value(self):
+        if self._cbox is None:
+            return self._value
         return self._cbox.isChecked()
 
     @value.setter
     def value(self, state=False):
+        if self._cbox is None:
+            self._set_placeholder_value(state)
+            return
         self._cbox.setChecked(state)
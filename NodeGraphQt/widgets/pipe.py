@@ -8,7 +8,7 @@ from .constants import (
     PIPE_STYLE_DASHED, PIPE_STYLE_DEFAULT, PIPE_STYLE_DOTTED,
     PIPE_LAYOUT_STRAIGHT, PIPE_WIDTH, IN_PORT, OUT_PORT, Z_VAL_PIPE
 )
-from .port import PortItem
+from .port import PortItem, PaintedPort
 
 PIPE_STYLES = {
     PIPE_STYLE_DEFAULT: QtCore.Qt.PenStyle.SolidLine,
@@ -32,6 +32,8 @@ class Pipe(QtWidgets.QGraphicsPathItem):
         self._highlight = False
         self._input_port = input_port
         self._output_port = output_port
+        # item drawing the pipe while it's not in the scene.
+        self._renderer = None
 
     def __str__(self):
         in_name = self._input_port.name if self._input_port else ''
@@ -104,7 +106,7 @@ class Pipe(QtWidgets.QGraphicsPathItem):
 
         if self.viewer_pipe_layout() == PIPE_LAYOUT_STRAIGHT:
             path.lineTo(pos2)
-            self.setPath(path)
+            self._set_path(path)
             return
 
         ctr_offset_x1, ctr_offset_x2 = pos1.x(), pos2.x()
@@ -124,7 +126,25 @@ class Pipe(QtWidgets.QGraphicsPathItem):
         ctr_point1 = QtCore.QPointF(ctr_offset_x1, pos1.y())
         ctr_point2 = QtCore.QPointF(ctr_offset_x2, pos2.y())
         path.cubicTo(ctr_point1, ctr_point2, pos2)
+        self._set_path(path)
+
+    def _set_path(self, path):
         self.setPath(path)
+        if self._renderer:
+            self._renderer.pipe_path_changed(self)
+
+    @property
+    def renderer(self):
+        """
+        Returns:
+            QtWidgets.QGraphicsItem: item that draws the pipe in place of
+                the pipe item eg. a pipe bundle.
+        """
+        return self._renderer
+
+    @renderer.setter
+    def renderer(self, renderer=None):
+        self._renderer = renderer
 
     def calc_distance(self, p1, p2):
         x = math.pow((p2.x() - p1.x()), 2)
@@ -143,15 +163,19 @@ class Pipe(QtWidgets.QGraphicsPathItem):
         return port
 
     def viewer_pipe_layout(self):
-        if self.scene():
-            viewer = self.scene().viewer()
-            return viewer.get_pipe_layout()
+        scene = self.scene()
+        if not scene and self._renderer:
+            scene = self._renderer.scene()
+        if scene:
+            return scene.viewer().get_pipe_layout()
 
     def activate(self):
         self._active = True
         pen = QtGui.QPen(QtGui.QColor(*PIPE_ACTIVE_COLOR), 2)
         pen.setStyle(PIPE_STYLES.get(PIPE_STYLE_DEFAULT))
         self.setPen(pen)
+        if self._renderer:
+            self._renderer.pipe_state_changed(self)
 
     def active(self):
         return self._active
@@ -161,6 +185,8 @@ class Pipe(QtWidgets.QGraphicsPathItem):
         pen = QtGui.QPen(QtGui.QColor(*PIPE_HIGHLIGHT_COLOR), 2)
         pen.setStyle(PIPE_STYLES.get(PIPE_STYLE_DEFAULT))
         self.setPen(pen)
+        if self._renderer:
+            self._renderer.pipe_state_changed(self)
 
     def highlighted(self):
         return self._highlight
@@ -171,6 +197,8 @@ class Pipe(QtWidgets.QGraphicsPathItem):
         pen = QtGui.QPen(QtGui.QColor(*self.color), 2)
         pen.setStyle(PIPE_STYLES.get(self.style))
         self.setPen(pen)
+        if self._renderer:
+            self._renderer.pipe_state_changed(self)
 
     def set_connections(self, port1, port2):
         ports = {
@@ -187,7 +215,7 @@ class Pipe(QtWidgets.QGraphicsPathItem):
 
     @input_port.setter
     def input_port(self, port):
-        if isinstance(port, PortItem) or not port:
+        if isinstance(port, (PortItem, PaintedPort)) or not port:
             self._input_port = port
         else:
             self._input_port = None
@@ -198,7 +226,7 @@ class Pipe(QtWidgets.QGraphicsPathItem):
 
     @output_port.setter
     def output_port(self, port):
-        if isinstance(port, PortItem) or not port:
+        if isinstance(port, (PortItem, PaintedPort)) or not port:
             self._output_port = port
         else:
             self._output_port = None
@@ -0,0 +1,276 @@
+#!/usr/bin/python
+from PySide2 import QtCore, QtGui, QtWidgets
+
+from .constants import (
+    PIPE_ACTIVE_COLOR, PIPE_HIGHLIGHT_COLOR, PIPE_LAYOUT_STRAIGHT,
+    PIPE_STYLE_DEFAULT, PIPE_BUNDLE_THRESHOLD, PIPE_WIDTH,
+    OUT_PORT, Z_VAL_PIPE
+)
+from .pipe import PIPE_STYLES
+
+
+def _pipe_ends(pipe):
+    # the pipe path is drawn from the input port to the output port.
+    path = pipe.path()
+    start = path.elementAt(0)
+    return QtCore.QPointF(start.x, start.y), path.currentPosition()
+
+
+class PipeBundle(QtWidgets.QGraphicsPathItem):
+    """
+    Draws all the pipes of an output port as a single item, the pipes are
+    merged into a trunk that splits into a branch per connection and are
+    expanded to the full pipes on hover.
+
+    The pipe items of the bundle are kept out of the scene.
+    """
+
+    def __init__(self, port):
+        super(PipeBundle, self).__init__()
+        self.setZValue(Z_VAL_PIPE)
+        self.setAcceptHoverEvents(True)
+        self._port = port
+        self._pipes = []
+        self._trunk = QtGui.QPainterPath()
+        self._expanded = False
+        self._dirty = False
+
+    def __repr__(self):
+        return '{}.PipeBundle(\'{}\', {})'.format(
+            self.__module__, self._port.name, len(self._pipes))
+
+    @property
+    def port(self):
+        return self._port
+
+    @property
+    def pipes(self):
+        return self._pipes
+
+    def set_pipes(self, pipes):
+        for pipe in self._pipes:
+            if pipe.renderer is self:
+                pipe.renderer = None
+        self._pipes = list(pipes)
+        for pipe in self._pipes:
+            pipe.renderer = self
+        self.rebuild()
+
+    def pipe_path_changed(self, pipe):
+        # the bundle is rebuilt once for all the pipes redrawn in a tick.
+        if not self._dirty:
+            self._dirty = True
+            QtCore.QTimer.singleShot(0, self.rebuild)
+
+    def pipe_state_changed(self, pipe):
+        self.update()
+
+    def rebuild(self):
+        self._dirty = False
+        if not self._pipes or not self.scene():
+            return
+        path = QtGui.QPainterPath()
+        if self._expanded:
+            self._trunk = QtGui.QPainterPath()
+            for pipe in self._pipes:
+                path.addPath(pipe.path())
+            self.setPath(path)
+            return
+
+        ends = [_pipe_ends(p) for p in self._pipes]
+        source = ends[0][1]
+        targets = [e[0] for e in ends]
+        target_x = min(t.x() for t in targets)
+        target_y = sum(t.y() for t in targets) / len(targets)
+        if target_x < source.x():
+            target_x = sum(t.x() for t in targets) / len(targets)
+        split = QtCore.QPointF(source.x() + (target_x - source.x()) / 2,
+                               target_y)
+
+        straight = self.scene().viewer().get_pipe_layout() == \
+            PIPE_LAYOUT_STRAIGHT
+        self._trunk = QtGui.QPainterPath(source)
+        if straight:
+            self._trunk.lineTo(split)
+        else:
+            ctr_x = (source.x() + split.x()) / 2
+            self._trunk.cubicTo(QtCore.QPointF(ctr_x, source.y()),
+                                QtCore.QPointF(ctr_x, split.y()), split)
+        path.addPath(self._trunk)
+        for target in targets:
+            path.moveTo(split)
+            if straight:
+                path.lineTo(target)
+                continue
+            ctr_x = (split.x() + target.x()) / 2
+            path.cubicTo(QtCore.QPointF(ctr_x, split.y()),
+                         QtCore.QPointF(ctr_x, target.y()), target)
+        self.setPath(path)
+
+    def pipe_at(self, pos, tolerance=3.0):
+        """
+        Returns the bundled pipe under the scene position.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+            tolerance (float): hit distance from the pipe.
+
+        Returns:
+            NodeGraphQt.widgets.pipe.Pipe: pipe or None.
+        """
+        rect = QtCore.QRectF(pos.x() - tolerance, pos.y() - tolerance,
+                             tolerance * 2, tolerance * 2)
+        stroker = QtGui.QPainterPathStroker()
+        stroker.setWidth(tolerance * 2)
+        for pipe in self._pipes:
+            path = pipe.path()
+            if not path.boundingRect().intersects(rect):
+                continue
+            if stroker.createStroke(path).contains(pos):
+                return pipe
+
+    def hoverEnterEvent(self, event):
+        self._expanded = True
+        self.rebuild()
+
+    def hoverLeaveEvent(self, event):
+        self._expanded = False
+        self.rebuild()
+
+    def paint(self, painter, option, widget):
+        pipe = self._pipes[0] if self._pipes else None
+        if not pipe:
+            return
+        color = QtGui.QColor(*pipe.color)
+        pen_style = PIPE_STYLES.get(pipe.style)
+        if self._expanded:
+            color = QtGui.QColor(*PIPE_ACTIVE_COLOR)
+        elif self._port.node.selected:
+            color = QtGui.QColor(*PIPE_HIGHLIGHT_COLOR)
+            pen_style = PIPE_STYLES.get(PIPE_STYLE_DEFAULT)
+
+        pen = QtGui.QPen(color, PIPE_WIDTH)
+        pen.setStyle(pen_style)
+        pen.setCapStyle(QtCore.Qt.RoundCap)
+        painter.setRenderHint(painter.Antialiasing, True)
+        painter.setPen(pen)
+        painter.drawPath(self.path())
+        if not self._trunk.isEmpty():
+            # the shared trunk is drawn thicker than the branches.
+            pen.setWidthF(PIPE_WIDTH * 3)
+            painter.setPen(pen)
+            painter.drawPath(self._trunk)
+
+
+class PipeBundler(QtCore.QObject):
+    """
+    Merges the pipes of the output ports with a large fan out into pipe
+    bundles, the ports are checked once per event loop tick after their
+    connections have changed.
+    """
+
+    def __init__(self, scene, threshold=PIPE_BUNDLE_THRESHOLD):
+        """
+        Args:
+            scene (NodeGraphQt.widgets.scene.NodeScene): node scene.
+            threshold (int): min number of pipes on a port to bundle.
+        """
+        super(PipeBundler, self).__init__(scene)
+        self._scene = scene
+        self._threshold = max(2, threshold)
+        self._bundles = {}
+        self._pending = set()
+
+    @property
+    def threshold(self):
+        return self._threshold
+
+    def bundles(self):
+        return list(self._bundles.values())
+
+    def pipe_at(self, pos, tolerance=3.0):
+        """
+        Returns the bundled pipe under the scene position.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+            tolerance (float): hit distance from the pipe.
+
+        Returns:
+            NodeGraphQt.widgets.pipe.Pipe: pipe or None.
+        """
+        for bundle in self._bundles.values():
+            pipe = bundle.pipe_at(pos, tolerance)
+            if pipe:
+                return pipe
+
+    def schedule(self, port):
+        """
+        Queue the port to be bundled or unbundled on the next tick.
+
+        Args:
+            port (PortItem or PaintedPort): port which pipes have changed.
+        """
+        if port.port_type != OUT_PORT:
+            return
+        if not self._pending:
+            QtCore.QTimer.singleShot(0, self.update_bundles)
+        self._pending.add(port)
+
+    def update_bundles(self):
+        ports, self._pending = self._pending, set()
+        for port in ports:
+            self.update_port(port)
+
+    def update_port(self, port):
+        """
+        Bundle or unbundle the pipes of the output port.
+
+        Args:
+            port (PortItem or PaintedPort): output port.
+        """
+        pipes = port.connected_pipes
+        bundle = self._bundles.get(port)
+        if port.scene() is not self._scene or len(pipes) < self._threshold:
+            if bundle:
+                self._unbundle(port)
+            return
+        if bundle is None:
+            bundle = PipeBundle(port)
+            self._scene.addItem(bundle)
+            self._bundles[port] = bundle
+        for pipe in pipes:
+            if pipe.scene() is self._scene:
+                self._scene.removeItem(pipe)
+        bundle.set_pipes(pipes)
+
+    def _unbundle(self, port):
+        bundle = self._bundles.pop(port)
+        pipes = bundle.pipes
+        bundle.set_pipes([])
+        self._scene.removeItem(bundle)
+        if port.scene() is not self._scene:
+            return
+        for pipe in pipes:
+            if pipe in port.connected_pipes and pipe.scene() is None:
+                self._scene.addItem(pipe)
+                pipe.draw_path(pipe.input_port, pipe.output_port)
+
+    def bundle_ports(self, ports):
+        """
+        Bundle the output ports that are over the threshold.
+
+        Args:
+            ports (list): output ports.
+        """
+        for port in ports:
+            if port.port_type == OUT_PORT:
+                self.update_port(port)
+
+    def clear(self):
+        """
+        Put all the bundled pipes back in the scene.
+        """
+        self._pending = set()
+        for port in list(self._bundles.keys()):
+            self._unbundle(port)
@@ -0,0 +1,352 @@
+#!/usr/bin/python
+import math
+from array import array
+from collections import defaultdict
+
+from PySide2 import QtCore, QtGui, QtWidgets
+
+from .constants import (
+    PIPE_ACTIVE_COLOR, PIPE_HIGHLIGHT_COLOR,
+    PIPE_STYLE_DEFAULT, PIPE_STYLE_DOTTED, PIPE_WIDTH, Z_VAL_PIPE
+)
+from .pipe import PIPE_STYLES
+
+# size of the spatial index grid cells.
+PIPE_LAYER_CELL_SIZE = 256.0
+
+
+def _pen_state(pipe):
+    """
+    Returns the pen (color, width, style) the pipe is drawn with, the same
+    as "Pipe.paint()".
+    """
+    color = tuple(pipe.color)
+    width = PIPE_WIDTH
+    style = pipe.style
+    if pipe.active():
+        color = PIPE_ACTIVE_COLOR
+    elif pipe.highlighted():
+        color = PIPE_HIGHLIGHT_COLOR
+        style = PIPE_STYLE_DEFAULT
+    in_port = pipe.input_port
+    out_port = pipe.output_port
+    if in_port and out_port:
+        if in_port.node.disabled or out_port.node.disabled:
+            color = color[:3] + (200,)
+            width += 0.2
+            style = PIPE_STYLE_DOTTED
+    return color, width, style
+
+
+class PipeLayer(QtWidgets.QGraphicsItem):
+    """
+    Single scene item that draws all the pipes in place of a pipe item per
+    connection.
+
+    The pipe bounds are packed in an array and indexed in a uniform grid,
+    only the pipes in the exposed rect are painted with one draw call per
+    pen state. The layer has no shape so it never takes the mouse events
+    of the items below, the viewer hit-tests the pipes with "pipe_at()".
+
+    The Pipe items stay connected to their ports as handles but are kept
+    out of the scene.
+    """
+
+    def __init__(self, cell_size=PIPE_LAYER_CELL_SIZE):
+        super(PipeLayer, self).__init__()
+        self.setZValue(Z_VAL_PIPE)
+        self.setFlag(self.ItemUsesExtendedStyleOption, True)
+        self._cell_size = cell_size
+        self._slots = {}
+        self._pipes = []
+        self._bounds = array('d')
+        self._cells = []
+        self._free = []
+        self._grid = defaultdict(set)
+        self._rect = QtCore.QRectF()
+        self._dirty = set()
+        self._pending = set()
+        self._scheduled = False
+        self._port_pipes = {}
+        self._hovered = None
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, pipe):
+        return pipe in self._slots
+
+    def boundingRect(self):
+        return self._rect
+
+    def shape(self):
+        return QtGui.QPainterPath()
+
+    def pipes(self):
+        return list(self._slots.keys())
+
+    # --- storage -------------------------------------------------------
+
+    def add_pipe(self, pipe):
+        """
+        Take over drawing the pipe, the pipe item is removed from the scene.
+
+        Args:
+            pipe (NodeGraphQt.widgets.pipe.Pipe): pipe item.
+        """
+        if pipe in self._slots:
+            return
+        if pipe.scene():
+            pipe.scene().removeItem(pipe)
+        if self._free:
+            slot = self._free.pop()
+            self._pipes[slot] = pipe
+        else:
+            slot = len(self._pipes)
+            self._pipes.append(pipe)
+            self._bounds.extend((0.0, 0.0, 0.0, 0.0))
+            self._cells.append(())
+        self._slots[pipe] = slot
+        pipe.renderer = self
+        self._dirty.add(pipe)
+        self._schedule()
+        for port in (pipe.input_port, pipe.output_port):
+            if port:
+                self._port_pipes.setdefault(port, set()).add(pipe)
+
+    def add_pipes(self, pipes):
+        for pipe in pipes:
+            self.add_pipe(pipe)
+
+    def remove_pipe(self, pipe, restore=False):
+        """
+        Stop drawing the pipe.
+
+        Args:
+            pipe (NodeGraphQt.widgets.pipe.Pipe): pipe item.
+            restore (bool): put the pipe item back in the scene.
+        """
+        slot = self._slots.pop(pipe, None)
+        if slot is None:
+            return
+        self._update_rect(slot)
+        self._index(slot, ())
+        self._pipes[slot] = None
+        self._free.append(slot)
+        self._dirty.discard(pipe)
+        if self._hovered is pipe:
+            self._hovered = None
+        if pipe.renderer is self:
+            pipe.renderer = None
+        for port in (pipe.input_port, pipe.output_port):
+            port_pipes = self._port_pipes.get(port)
+            if port_pipes:
+                port_pipes.discard(pipe)
+                if not port_pipes:
+                    del self._port_pipes[port]
+        if restore and self.scene():
+            self.scene().addItem(pipe)
+            pipe.draw_path(pipe.input_port, pipe.output_port)
+
+    def clear(self, restore=False):
+        """
+        Remove all the pipes from the layer.
+
+        Args:
+            restore (bool): put the pipe items back in the scene.
+        """
+        for pipe in list(self._slots.keys()):
+            self.remove_pipe(pipe, restore)
+        self.prepareGeometryChange()
+        self._rect = QtCore.QRectF()
+
+    def schedule(self, port):
+        """
+        Queue the port to have its pipes added or removed on the next tick.
+
+        Args:
+            port (PortItem or PaintedPort): port which pipes have changed.
+        """
+        self._pending.add(port)
+        self._schedule()
+
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self.sync)
+
+    def pipe_path_changed(self, pipe):
+        self._dirty.add(pipe)
+        self._schedule()
+
+    def pipe_state_changed(self, pipe):
+        slot = self._slots.get(pipe)
+        if slot is not None:
+            self._update_rect(slot)
+
+    def sync(self):
+        """
+        Apply the queued connection and path changes.
+        """
+        self._scheduled = False
+        ports, self._pending = self._pending, set()
+        for port in ports:
+            connected = set(port.connected_pipes)
+            known = self._port_pipes.get(port, set())
+            for pipe in known - connected:
+                if pipe not in self._connected(pipe):
+                    self.remove_pipe(pipe)
+            if port.scene() is self.scene():
+                for pipe in connected - known:
+                    self.add_pipe(pipe)
+                    self._port_pipes.setdefault(port, set()).add(pipe)
+
+        dirty, self._dirty = self._dirty, set()
+        for pipe in dirty:
+            slot = self._slots.get(pipe)
+            if slot is None:
+                continue
+            self._update_rect(slot)
+            rect = pipe.path().boundingRect().adjusted(-2, -2, 2, 2)
+            i = slot * 4
+            self._bounds[i:i + 4] = array(
+                'd', (rect.left(), rect.top(), rect.right(), rect.bottom()))
+            self._index(slot, self._rect_cells(rect))
+            if not self._rect.contains(rect):
+                self.prepareGeometryChange()
+                self._rect = self._rect.united(rect)
+            self._update_rect(slot)
+
+    @staticmethod
+    def _connected(pipe):
+        pipes = []
+        for port in (pipe.input_port, pipe.output_port):
+            if port:
+                pipes += port.connected_pipes
+        return pipes
+
+    # --- spatial index -------------------------------------------------
+
+    def _rect_cells(self, rect):
+        size = self._cell_size
+        x1 = int(math.floor(rect.left() / size))
+        x2 = int(math.floor(rect.right() / size))
+        y1 = int(math.floor(rect.top() / size))
+        y2 = int(math.floor(rect.bottom() / size))
+        return tuple((x, y) for x in range(x1, x2 + 1)
+                     for y in range(y1, y2 + 1))
+
+    def _index(self, slot, cells):
+        grid = self._grid
+        for cell in self._cells[slot]:
+            slots = grid.get(cell)
+            if slots is not None:
+                slots.discard(slot)
+                if not slots:
+                    del grid[cell]
+        for cell in cells:
+            grid[cell].add(slot)
+        self._cells[slot] = cells
+
+    def _slot_rect(self, slot):
+        i = slot * 4
+        x1, y1, x2, y2 = self._bounds[i:i + 4]
+        return QtCore.QRectF(x1, y1, x2 - x1, y2 - y1)
+
+    def _update_rect(self, slot):
+        rect = self._slot_rect(slot)
+        if not rect.isEmpty():
+            self.update(rect)
+
+    def pipes_in_rect(self, rect):
+        """
+        Args:
+            rect (QtCore.QRectF): scene rect.
+
+        Returns:
+            list[NodeGraphQt.widgets.pipe.Pipe]: pipes which bounds
+                intersect the rect.
+        """
+        return [self._pipes[s] for s in self._query(rect)]
+
+    def _query(self, rect):
+        grid = self._grid
+        slots = set()
+        for cell in self._rect_cells(rect):
+            cell_slots = grid.get(cell)
+            if cell_slots:
+                slots.update(cell_slots)
+        bounds = self._bounds
+        left, top = rect.left(), rect.top()
+        right, bottom = rect.right(), rect.bottom()
+        found = []
+        for slot in slots:
+            i = slot * 4
+            if bounds[i] <= right and bounds[i + 2] >= left and \
+                    bounds[i + 1] <= bottom and bounds[i + 3] >= top:
+                found.append(slot)
+        return found
+
+    def pipe_at(self, pos, tolerance=3.0):
+        """
+        Returns the pipe under the scene position.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+            tolerance (float): hit distance from the pipe.
+
+        Returns:
+            NodeGraphQt.widgets.pipe.Pipe: pipe or None.
+        """
+        rect = QtCore.QRectF(pos.x() - tolerance, pos.y() - tolerance,
+                             tolerance * 2, tolerance * 2)
+        stroker = QtGui.QPainterPathStroker()
+        stroker.setWidth(tolerance * 2)
+        for slot in self._query(rect):
+            pipe = self._pipes[slot]
+            if stroker.createStroke(pipe.path()).contains(pos):
+                return pipe
+
+    def hover(self, pos):
+        """
+        Activate the pipe under the scene position like the hover events of
+        the pipe items.
+
+        Args:
+            pos (QtCore.QPointF): scene position.
+        """
+        pipe = self.pipe_at(pos)
+        if pipe is self._hovered:
+            return
+        previous, self._hovered = self._hovered, pipe
+        if previous:
+            previous.reset()
+            if previous.input_port.node.selected or \
+                    previous.output_port.node.selected:
+                previous.highlight()
+        if pipe:
+            pipe.activate()
+
+    # --- painting ------------------------------------------------------
+
+    def paint(self, painter, option, widget):
+        groups = {}
+        for slot in self._query(option.exposedRect):
+            pipe = self._pipes[slot]
+            state = _pen_state(pipe)
+            path = groups.get(state)
+            if path is None:
+                path = groups[state] = QtGui.QPainterPath()
+            path.addPath(pipe.path())
+        if not groups:
+            return
+        painter.save()
+        painter.setRenderHint(painter.Antialiasing, True)
+        painter.setBrush(QtCore.Qt.NoBrush)
+        for (color, width, style), path in groups.items():
+            pen = QtGui.QPen(QtGui.QColor(*color), width)
+            pen.setStyle(PIPE_STYLES.get(style))
+            pen.setCapStyle(QtCore.Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawPath(path)
+        painter.restore()
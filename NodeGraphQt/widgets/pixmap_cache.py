@@ -0,0 +1,73 @@
+#!/usr/bin/python
+import os
+from collections import OrderedDict
+
+from PySide2 import QtCore, QtGui
+
+from .constants import PIXMAP_CACHE_LIMIT
+
+
+class _PixmapCache(object):
+    """
+    Process wide cache of scaled node icon pixmaps.
+
+    Pixmaps are keyed on the image path, the scaled height and the file
+    modified time so an icon that changes on disk is loaded again.
+    QPixmap is implicitly shared so every node using the same icon holds
+    the same image data.
+    """
+
+    def __init__(self, limit=PIXMAP_CACHE_LIMIT):
+        self._limit = limit
+        self._pixmaps = OrderedDict()
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    @property
+    def limit(self):
+        return self._limit
+
+    @limit.setter
+    def limit(self, limit=PIXMAP_CACHE_LIMIT):
+        self._limit = max(1, limit)
+        self._evict()
+
+    def _evict(self):
+        while len(self._pixmaps) > self._limit:
+            self._pixmaps.popitem(last=False)
+
+    def pixmap(self, path, height):
+        """
+        Returns the pixmap for the image path scaled to the height.
+
+        Args:
+            path (str): path to the image file.
+            height (int): pixmap height.
+
+        Returns:
+            QtGui.QPixmap: shared pixmap.
+        """
+        try:
+            mtime = os.path.getmtime(path)
+        except (OSError, TypeError):
+            mtime = None
+        key = (path, height, mtime)
+        pixmap = self._pixmaps.pop(key, None)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(path)
+            if not pixmap.isNull():
+                pixmap = pixmap.scaledToHeight(height,
+                                               QtCore.Qt.SmoothTransformation)
+        self._pixmaps[key] = pixmap
+        self._evict()
+        return pixmap
+
+    def clear(self):
+        """
+        Remove all the cached pixmaps.
+        """
+        self._pixmaps.clear()
+
+
+PixmapCache = _PixmapCache()
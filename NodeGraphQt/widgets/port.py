@@ -9,6 +9,8 @@ from .constants import (
     PORT_ACTIVE_BORDER_COLOR,
     Z_VAL_PORT)
 
+PORT_SIZE = 10.0
+
 PORT_DATA = {
     'name': 0,
     'color': 1,
@@ -20,6 +22,52 @@ PORT_DATA = {
 }
 
 
+def _pipes_changed(port):
+    scene = port.scene()
+    if scene is not None:
+        scene.pipes_changed(port)
+
+
+def draw_port(painter, rect, color, border_color, hovered=False, active=False):
+    """
+    Draw a port ellipse, shared by the port items and the nodes that paint
+    their own ports.
+
+    Args:
+        painter (QtGui.QPainter): painter object.
+        rect (QtCore.QRectF): port rect.
+        color (tuple): port color (r, g, b, a).
+        border_color (tuple): port border color (r, g, b, a).
+        hovered (bool): draw the hovered state.
+        active (bool): draw the connected state.
+    """
+    painter.save()
+
+    shadow_rect = rect.translated(0.0, 0.8)
+    painter.setBrush(QtGui.QColor(0, 0, 0, 200))
+    painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 255), 1.8))
+    path = QtGui.QPainterPath()
+    path.addEllipse(shadow_rect)
+    painter.drawPath(path)
+
+    if hovered:
+        color = QtGui.QColor(*PORT_HOVER_COLOR)
+        border_color = QtGui.QColor(*PORT_HOVER_BORDER_COLOR)
+    elif active:
+        color = QtGui.QColor(*PORT_ACTIVE_COLOR)
+        border_color = QtGui.QColor(*PORT_ACTIVE_BORDER_COLOR)
+    else:
+        color = QtGui.QColor(*color)
+        border_color = QtGui.QColor(*border_color)
+
+    painter.setBrush(color)
+    pen = QtGui.QPen(border_color, 1.5)
+    painter.setPen(pen)
+    painter.drawEllipse(rect)
+
+    painter.restore()
+
+
 class PortItem(QtWidgets.QGraphicsItem):
     """
     Base Port Item.
@@ -32,8 +80,8 @@ class PortItem(QtWidgets.QGraphicsItem):
         self.setFlag(self.ItemSendsScenePositionChanges, True)
         self.setZValue(Z_VAL_PORT)
         self._pipes = []
-        self._width = 10.0
-        self._height = 10.0
+        self._width = PORT_SIZE
+        self._height = PORT_SIZE
         self._hovered = False
         self.name = 'port'
         self.color = (49, 115, 100, 255)
@@ -52,31 +100,9 @@ class PortItem(QtWidgets.QGraphicsItem):
         return QtCore.QRectF(0.0, 0.0, self._width, self._height)
 
     def paint(self, painter, option, widget):
-        painter.save()
-
-        rect = QtCore.QRectF(0.0, 0.8, self._width, self._height)
-        painter.setBrush(QtGui.QColor(0, 0, 0, 200))
-        painter.setPen(QtGui.QPen(QtGui.QColor(0, 0, 0, 255), 1.8))
-        path = QtGui.QPainterPath()
-        path.addEllipse(rect)
-        painter.drawPath(path)
-
-        if self._hovered:
-            color = QtGui.QColor(*PORT_HOVER_COLOR)
-            border_color = QtGui.QColor(*PORT_HOVER_BORDER_COLOR)
-        elif self.connected_pipes:
-            color = QtGui.QColor(*PORT_ACTIVE_COLOR)
-            border_color = QtGui.QColor(*PORT_ACTIVE_BORDER_COLOR)
-        else:
-            color = QtGui.QColor(*self.color)
-            border_color = QtGui.QColor(*self.border_color)
-
-        painter.setBrush(color)
-        pen = QtGui.QPen(border_color, 1.5)
-        painter.setPen(pen)
-        painter.drawEllipse(self.boundingRect())
-
-        painter.restore()
+        draw_port(painter, self.boundingRect(),
+                  self.color, self.border_color,
+                  self._hovered, bool(self.connected_pipes))
 
     def itemChange(self, change, value):
         if change == self.ItemScenePositionHasChanged:
@@ -114,9 +140,21 @@ class PortItem(QtWidgets.QGraphicsItem):
 
     def add_pipe(self, pipe):
         self._pipes.append(pipe)
+        _pipes_changed(self)
 
     def remove_pipe(self, pipe):
         self._pipes.remove(pipe)
+        _pipes_changed(self)
+
+    def remove_pipes(self, pipes):
+        """
+        Remove all the pipes found in the set in a single pass.
+
+        Args:
+            pipes (set[Pipe]): pipes to remove.
+        """
+        self._pipes[:] = [p for p in self._pipes if p not in pipes]
+        _pipes_changed(self)
 
     @property
     def connected_pipes(self):
@@ -206,3 +244,126 @@ class PortItem(QtWidgets.QGraphicsItem):
         if self.scene():
             viewer = self.scene().viewer()
             viewer.connect_ports(self, port)
+
+
+class PaintedPort(object):
+    """
+    Lightweight port that is drawn and hit-tested by its parent node
+    instead of being a QGraphicsItem in the scene.
+
+    Implements the same attributes as the PortItem so the pipes, commands
+    and the Port interface work with either.
+    """
+
+    __slots__ = ('_node', '_pipes', '_x', '_y', 'hovered',
+                 'name', 'display_name', 'color', 'border_color',
+                 'border_size', 'port_type', 'multi_connection')
+
+    def __init__(self, node=None):
+        self._node = node
+        self._pipes = []
+        self._x = 0.0
+        self._y = 0.0
+        self.hovered = False
+        self.name = 'port'
+        self.display_name = True
+        self.color = (49, 115, 100, 255)
+        self.border_color = (29, 202, 151, 255)
+        self.border_size = 1
+        self.port_type = None
+        self.multi_connection = False
+
+    def __str__(self):
+        return '{}.PaintedPort("{}")'.format(self.__module__, self.name)
+
+    def __repr__(self):
+        return '{}.PaintedPort("{}")'.format(self.__module__, self.name)
+
+    def type(self):
+        return QtWidgets.QGraphicsItem.UserType
+
+    def boundingRect(self):
+        return QtCore.QRectF(0.0, 0.0, PORT_SIZE, PORT_SIZE)
+
+    def rect(self):
+        """
+        Returns:
+            QtCore.QRectF: port rect in the parent node coordinates.
+        """
+        return QtCore.QRectF(self._x, self._y, PORT_SIZE, PORT_SIZE)
+
+    def pos(self):
+        return QtCore.QPointF(self._x, self._y)
+
+    def setPos(self, x, y):
+        self._x = x
+        self._y = y
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+    def scenePos(self):
+        return self._node.mapToScene(self._x, self._y)
+
+    def scene(self):
+        if self._node:
+            return self._node.scene()
+
+    def redraw_connected_pipes(self):
+        if not self._pipes:
+            return
+        for pipe in self._pipes:
+            if self.port_type == IN_PORT:
+                pipe.draw_path(self, pipe.output_port)
+            elif self.port_type == OUT_PORT:
+                pipe.draw_path(pipe.input_port, self)
+
+    def add_pipe(self, pipe):
+        self._pipes.append(pipe)
+        if self._node:
+            self._node.update(self.rect())
+        _pipes_changed(self)
+
+    def remove_pipe(self, pipe):
+        self._pipes.remove(pipe)
+        if self._node:
+            self._node.update(self.rect())
+        _pipes_changed(self)
+
+    def remove_pipes(self, pipes):
+        self._pipes[:] = [p for p in self._pipes if p not in pipes]
+        if self._node:
+            self._node.update(self.rect())
+        _pipes_changed(self)
+
+    @property
+    def connected_pipes(self):
+        return self._pipes
+
+    @property
+    def connected_ports(self):
+        ports = []
+        port_types = {IN_PORT: 'output_port', OUT_PORT: 'input_port'}
+        for pipe in self._pipes:
+            ports.append(getattr(pipe, port_types[self.port_type]))
+        return ports
+
+    @property
+    def node(self):
+        return self._node
+
+    def delete(self):
+        for pipe in list(self._pipes):
+            pipe.delete()
+
+    def connect_to(self, port):
+        if not port:
+            for pipe in list(self._pipes):
+                pipe.delete()
+            return
+        if self.scene():
+            viewer = self.scene().viewer()
+            viewer.connect_ports(self, port)
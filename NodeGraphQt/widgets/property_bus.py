@@ -0,0 +1,112 @@
+#!/usr/bin/python
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from PySide2 import QtCore
+
+
+class PropertyBus(QtCore.QObject):
+    """
+    Node property change event bus.
+
+    Property changes are coalesced per node and property and emitted once
+    when the outer most transaction is committed, changes made outside of
+    a transaction are emitted together on the next event loop tick.
+
+    eg.
+        with bus.transaction('set node sizes'):
+            for node in nodes:
+                node.set_property('size', 2.0)
+    """
+
+    #: {<node_id>: {<name>: (<old value>, <new value>)}}
+    properties_changed = QtCore.Signal(dict)
+
+    def __init__(self, parent=None):
+        super(PropertyBus, self).__init__(parent)
+        self._changes = OrderedDict()
+        self._depth = 0
+        self._pending = False
+        self._text = None
+        self._undoable = True
+
+    def notify(self, node_id, name, old_value, new_value):
+        """
+        Add a property change to the current transaction.
+
+        Args:
+            node_id (str): node id.
+            name (str): property name.
+            old_value: value before the change.
+            new_value: value after the change.
+        """
+        node_changes = self._changes.get(node_id)
+        if node_changes is None:
+            node_changes = self._changes[node_id] = {}
+        change = node_changes.get(name)
+        if change:
+            old_value = change[0]
+        node_changes[name] = (old_value, new_value)
+        if not self._depth and not self._pending:
+            self._pending = True
+            QtCore.QTimer.singleShot(0, self.commit)
+
+    @contextmanager
+    def transaction(self, text=None, undoable=True):
+        """
+        Context manager that batches the property changes, nested
+        transactions are merged into the outer most transaction.
+
+        Args:
+            text (str): undo command text.
+            undoable (bool): false if the changes should not be added to
+                the undo stack.
+        """
+        if not self._depth:
+            self._text = text
+            self._undoable = undoable
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self.commit()
+
+    def in_transaction(self):
+        return bool(self._depth)
+
+    def text(self):
+        """
+        Returns:
+            str: text of the transaction being committed.
+        """
+        return self._text
+
+    def undoable(self):
+        """
+        Returns:
+            bool: true if the changes being committed should be undoable.
+        """
+        return self._undoable
+
+    def commit(self):
+        """
+        Emit the coalesced property changes, changes that set a property
+        back to its original value are dropped.
+        """
+        self._pending = False
+        if self._depth:
+            return
+        changes, self._changes = self._changes, OrderedDict()
+        for node_id in list(changes.keys()):
+            node_changes = {n: c for n, c in changes[node_id].items()
+                            if c[0] != c[1]}
+            if node_changes:
+                changes[node_id] = node_changes
+            else:
+                del changes[node_id]
+        if changes:
+            self.properties_changed.emit(changes)
+        self._text = None
+        self._undoable = True
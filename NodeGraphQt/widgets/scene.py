@@ -1,6 +1,10 @@
+from contextlib import contextmanager
+
 from PySide2 import QtGui, QtCore, QtWidgets
 
 from .constants import VIEWER_BG_COLOR, VIEWER_GRID_OVERLAY, VIEWER_GRID_COLOR
+from .node_abstract import AbstractNodeItem
+from .property_bus import PropertyBus
 
 
 class NodeScene(QtWidgets.QGraphicsScene):
@@ -10,6 +14,17 @@ class NodeScene(QtWidgets.QGraphicsScene):
         self.background_color = VIEWER_BG_COLOR
         self.grid = VIEWER_GRID_OVERLAY
         self.grid_color = VIEWER_GRID_COLOR
+        self._nodes = {}
+        self._index_locks = 0
+        self._index_method = self.BspTreeIndex
+        self._journal = None
+        self._journal_pending = []
+        self._property_bus = PropertyBus(self)
+        self.pipe_bundler = None
+        self.pipe_layer = None
+        self.node_culler = None
+        self._property_bus.properties_changed.connect(
+            self._on_properties_changed)
 
     def __repr__(self):
         return '{}.{}(\'{}\')'.format(self.__module__,
@@ -78,6 +93,162 @@ class NodeScene(QtWidgets.QGraphicsScene):
     def viewer(self):
         return self.views()[0] if self.views() else None
 
+    def addItem(self, item):
+        super(NodeScene, self).addItem(item)
+        if isinstance(item, AbstractNodeItem):
+            self._nodes[item.id] = item
+            if self.node_culler:
+                self.node_culler.node_added(item)
+
+    def removeItem(self, item):
+        if isinstance(item, AbstractNodeItem):
+            if self._nodes.get(item.id) is item:
+                del self._nodes[item.id]
+            if self.node_culler:
+                self.node_culler.node_removed(item)
+        super(NodeScene, self).removeItem(item)
+
+    def node_id_changed(self, node, old_id):
+        """
+        Update the node lookup when a node id has been changed.
+
+        Args:
+            node (AbstractNodeItem): node item.
+            old_id (str): previous node id.
+        """
+        if self._nodes.get(old_id) is node:
+            del self._nodes[old_id]
+        self._nodes[node.id] = node
+
+    def get_node(self, node_id):
+        """
+        Returns the node item in the scene from the node id.
+
+        Args:
+            node_id (str): node id.
+
+        Returns:
+            AbstractNodeItem: node item or None.
+        """
+        return self._nodes.get(node_id)
+
+    @contextmanager
+    def suspended_index(self, suspend=True):
+        """
+        Context manager that turns off the scene item index while items
+        are moved in bulk, the previous index method is restored and the
+        index rebuilt once on exit.
+
+        Args:
+            suspend (bool): false to leave the index untouched.
+        """
+        if not suspend:
+            yield
+            return
+        if not self._index_locks:
+            self._index_method = self.itemIndexMethod()
+            self.setItemIndexMethod(self.NoIndex)
+        self._index_locks += 1
+        try:
+            yield
+        finally:
+            self._index_locks -= 1
+            if not self._index_locks:
+                self.setItemIndexMethod(self._index_method)
+
+    def pipes_changed(self, port):
+        """
+        Called by the ports when their pipes have been connected or
+        disconnected.
+
+        Args:
+            port (PortItem or PaintedPort): port.
+        """
+        if self.pipe_bundler:
+            self.pipe_bundler.schedule(port)
+        if self.pipe_layer:
+            self.pipe_layer.schedule(port)
+
+    def add_pipe(self, pipe):
+        """
+        Add a connection pipe, the pipe item is handed to the pipe layer
+        when enabled.
+
+        Args:
+            pipe (NodeGraphQt.widgets.pipe.Pipe): pipe item.
+        """
+        if self.pipe_layer:
+            self.pipe_layer.add_pipe(pipe)
+        else:
+            self.addItem(pipe)
+
+    @property
+    def property_bus(self):
+        """
+        Returns:
+            NodeGraphQt.widgets.property_bus.PropertyBus: node property
+                change event bus.
+        """
+        return self._property_bus
+
+    def _on_properties_changed(self, changes):
+        for node_id, node_changes in changes.items():
+            for name, (_, value) in node_changes.items():
+                self.record_change('property', id=node_id, name=name,
+                                   value=value)
+
+    @property
+    def journal(self):
+        return self._journal
+
+    @journal.setter
+    def journal(self, journal=None):
+        """
+        Args:
+            journal (NodeGraphQt.base.session_journal.SessionJournal):
+                change journal the scene changes are recorded to.
+        """
+        self._journal_pending = []
+        self._journal = journal
+
+    def record_change(self, op, **data):
+        """
+        Queue a change record for the journal, the records are written
+        once on the next event loop tick.
+
+        Args:
+            op (str): change operation.
+            **data: record data.
+        """
+        if self._journal is None:
+            return
+        self._journal_pending.append((op, data))
+        if len(self._journal_pending) == 1:
+            QtCore.QTimer.singleShot(0, self.flush_journal)
+
+    def flush_journal(self):
+        """
+        Write the queued change records to the journal.
+        """
+        pending, self._journal_pending = self._journal_pending, []
+        if self._journal is None or not pending:
+            return
+        for op, data in pending:
+            if op == 'create':
+                # serialize the created nodes once they've been set up.
+                nodes = {}
+                for node_id in data.pop('ids'):
+                    node = self._nodes.get(node_id)
+                    if node:
+                        nodes.update(node.to_dict())
+                if not nodes:
+                    continue
+                data['nodes'] = nodes
+            self._journal.record(op, **data)
+        self._journal.flush()
+        if self._journal.needs_compaction() and self.viewer():
+            self.viewer().compact_journal()
+
     @property
     def grid(self):
         return self._grid
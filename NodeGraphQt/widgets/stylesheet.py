@@ -157,3 +157,63 @@ QCheckBox::indicator {
     height: 13px;
 }
 '''
+
+
+def _scope_stylesheet(style, scope):
+    """
+    Prefix every selector in the stylesheet with the scope selector.
+    """
+    style = re.sub(r'/\*.*?\*/', '', style, flags=re.DOTALL)
+    rules = []
+    for selectors, body in re.findall(r'([^{}]+)\{([^{}]*)\}', style):
+        selectors = ',\n'.join(
+            '{} {}'.format(scope, sel.strip()) for sel in selectors.split(',')
+        )
+        rules.append('{} {{{}}}'.format(selectors, body))
+    return '\n'.join(rules)
+
+
+NODE_WIDGET_GROUP = 'NodeWidgetGroup'
+
+# per widget type stylesheet applied to the node widget group box, the
+# embedded widgets inherit it so only the group box stylesheet is parsed.
+NODE_WIDGET_STYLES = {
+    'combo': STYLE_QCOMBOBOX + STYLE_QLISTVIEW,
+    'line_edit': STYLE_QLINEEDIT,
+    'checkbox': STYLE_QCHECKBOX,
+}
+
+_NODE_WIDGET_STYLESHEETS = {}
+
+
+def node_widget_stylesheet(widget_type, label=True):
+    """
+    Returns the combined group box and widget stylesheet, the strings are
+    only built once and shared by every widget of the same type.
+
+    Args:
+        widget_type (str): key in "NODE_WIDGET_STYLES".
+        label (bool): the group box displays a label.
+
+    Returns:
+        str: stylesheet.
+    """
+    key = (widget_type, label)
+    style = _NODE_WIDGET_STYLESHEETS.get(key)
+    if style is None:
+        padding_top = '14px' if label else '2px'
+        style = STYLE_QGROUPBOX.replace('$PADDING_TOP', padding_top)
+        style += NODE_WIDGET_STYLES.get(widget_type, '')
+        _NODE_WIDGET_STYLESHEETS[key] = style
+    return style
+
+
+# application level stylesheet scoped to the node widget group boxes.
+STYLE_NODE_WIDGETS_APP = '\n'.join([
+    STYLE_QGROUPBOX.replace('$PADDING_TOP', '14px').replace(
+        'QGroupBox', 'QGroupBox#{}'.format(NODE_WIDGET_GROUP)),
+    'QGroupBox#{}[label="false"] {{padding-top: 2px;}}'.format(
+        NODE_WIDGET_GROUP),
+    _scope_stylesheet(''.join(NODE_WIDGET_STYLES.values()),
+                      'QGroupBox#{}'.format(NODE_WIDGET_GROUP)),
+])
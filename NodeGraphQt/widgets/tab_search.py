@@ -1,77 +1,72 @@
 #!/usr/bin/python
 from PySide2 import QtCore, QtWidgets, QtGui
 
+from .constants import TAB_SEARCH_LIMIT
 from .stylesheet import STYLE_TABSEARCH, STYLE_TABSEARCH_LIST
+from ..base.search_index import SearchIndex
 
 
 class TabSearchCompleter(QtWidgets.QCompleter):
     """
-    QCompleter adapted from:
-    https://stackoverflow.com/questions/5129211/qcompleter-custom-completion-rules
+    Completer popup that shows the search index results as they are,
+    the filtering and ranking is done by the search index.
     """
 
     def __init__(self, nodes=None, parent=None):
         super(TabSearchCompleter, self).__init__(nodes, parent)
-        self.setCompletionMode(self.PopupCompletion)
+        self.setCompletionMode(self.UnfilteredPopupCompletion)
         self.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
-        self._local_completion_prefix = ''
-        self._using_orig_model = False
-        self._source_model = None
-        self._filter_model = None
 
     def splitPath(self, path):
-        self._local_completion_prefix = path
-        self.updateModel()
-        if self._filter_model.rowCount() == 0:
-            self._using_orig_model = False
-            self._filter_model.setSourceModel(QtGui.QStringListModel([path]))
-            return [path]
         return []
 
-    def updateModel(self):
-        if not self._using_orig_model:
-            self._filter_model.setSourceModel(self._source_model)
-
-        pattern = QtCore.QRegExp(self._local_completion_prefix,
-                                 QtCore.Qt.CaseInsensitive,
-                                 QtCore.QRegExp.FixedString)
-        self._filter_model.setFilterRegExp(pattern)
-
     def setModel(self, model):
-        self._source_model = model
-        self._filter_model = QtCore.QSortFilterProxyModel(self)
-        self._filter_model.setSourceModel(self._source_model)
-        super(TabSearchCompleter, self).setModel(self._filter_model)
+        super(TabSearchCompleter, self).setModel(model)
         self.popup().setStyleSheet(STYLE_TABSEARCH_LIST)
-        self._using_orig_model = True
 
 
 class TabSearchWidget(QtWidgets.QLineEdit):
 
     search_submitted = QtCore.Signal(str)
 
-    def __init__(self, parent=None, node_dict=None):
+    def __init__(self, parent=None, node_dict=None, limit=TAB_SEARCH_LIMIT):
         super(TabSearchWidget, self).__init__(parent)
         self.setStyleSheet(STYLE_TABSEARCH)
         self.setMinimumSize(200, 22)
         self.setTextMargins(2, 0, 2, 0)
         self.hide()
 
-        self._node_dict = node_dict or {}
-
-        node_names = sorted(self._node_dict.keys())
-        self._model = QtGui.QStringListModel(node_names, self)
+        self._node_dict = {}
+        self._limit = limit
+        self._index = SearchIndex()
+        self._model = QtGui.QStringListModel(self)
 
         self._completer = TabSearchCompleter()
         self._completer.setModel(self._model)
         self.setCompleter(self._completer)
+        self.set_nodes(node_dict)
 
+        self.textEdited.connect(self._on_text_edited)
         self.returnPressed.connect(self._on_search_submitted)
 
+    def _on_text_edited(self, text):
+        results = self._index.search(text, self._limit)
+        self._model.setStringList([name for name, _ in results])
+        if results:
+            self._completer.complete()
+        else:
+            self._completer.popup().hide()
+
     def _on_search_submitted(self):
         text = self.text()
         node_type = self._node_dict.get(text)
+        if not node_type and text.strip():
+            # fall back to the best match of the search text.
+            results = self._index.search(text, 1)
+            if results:
+                node_type = results[0][1]
         if node_type:
+            self._index.record_use(node_type)
             self.search_submitted.emit(node_type)
         self.close()
         self.parentWidget().clearFocus()
@@ -81,8 +76,23 @@ class TabSearchWidget(QtWidgets.QLineEdit):
         self.setSelection(0, len(self.text()))
         self.setFocus()
 
-    def set_nodes(self, node_dict=None):
-        self._node_dict = node_dict or {}
-        node_names = sorted(self._node_dict.keys())
-        self._model.setStringList(node_names)
-        self._completer.setModel(self._model)
+    @property
+    def search_index(self):
+        return self._index
+
+    def set_nodes(self, node_dict=None, aliases=None, revision=None):
+        """
+        Set the searchable nodes, the search index is only rebuilt when
+        the node registry revision has changed.
+
+        Args:
+            node_dict (dict): {<node name>: <node type>}
+            aliases (dict): {<alias>: <node type>} (optional).
+            revision (int): node registry revision.
+        """
+        if revision is not None and revision == self._index.revision:
+            return
+        self._node_dict = dict(node_dict or {})
+        self._index.build(self._node_dict, aliases, revision)
+        self._model.setStringList(
+            [name for name, _ in self._index.search('', self._limit)])
@@ -0,0 +1,310 @@
+#!/usr/bin/python
+import tempfile
+
+from PySide2 import QtCore, QtWidgets
+
+from .constants import UNDO_MEMORY_LIMIT
+
+
+class UndoSpillFile(object):
+    """
+    Temporary file the compacted undo commands move their serialized data
+    to, the file is removed when closed.
+    """
+
+    def __init__(self):
+        self._file = None
+        self._size = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    def write(self, data):
+        """
+        Append the data to the spill file.
+
+        Args:
+            data (str): serialized data.
+
+        Returns:
+            tuple: (offset, length) handle to read the data back.
+        """
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='nodegraphqt_undo_')
+        data = data.encode('utf-8')
+        self._file.seek(0, 2)
+        offset = self._file.tell()
+        self._file.write(data)
+        self._size = offset + len(data)
+        return offset, len(data)
+
+    def read(self, handle):
+        """
+        Args:
+            handle (tuple): (offset, length) returned from write.
+
+        Returns:
+            str: serialized data.
+        """
+        offset, length = handle
+        self._file.seek(offset)
+        return self._file.read(length).decode('utf-8')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._size = 0
+
+
+def _leaf_commands(cmd):
+    """
+    Returns the command and its macro child commands.
+    """
+    commands = [cmd]
+    for i in range(cmd.childCount()):
+        commands += _leaf_commands(cmd.child(i))
+    return commands
+
+
+def _command_cost(cmd):
+    return sum(c.memory_cost() for c in _leaf_commands(cmd)
+               if hasattr(c, 'memory_cost'))
+
+
+class _StackCommand(QtWidgets.QUndoCommand):
+    """
+    Holder the undo commands are pushed to the stack in, the stack only
+    owns the holders so the history can be rebuilt around the commands
+    when the oldest ones are dropped.
+    """
+
+    def __init__(self, stack, cmd, parent=None):
+        QtWidgets.QUndoCommand.__init__(self, cmd.text(), parent)
+        self.stack = stack
+        self.cmd = cmd
+        # memory cost of the command counted in the stack total.
+        self.cost = 0
+        self.merged = False
+
+    def id(self):
+        if self.stack.rebuilding:
+            return -1
+        return self.cmd.id()
+
+    def mergeWith(self, other):
+        if not isinstance(other, _StackCommand) or \
+                not self.cmd.mergeWith(other.cmd):
+            return False
+        other.merged = True
+        self.setText(self.cmd.text())
+        self._update()
+        return True
+
+    def undo(self):
+        if not self.stack.rebuilding:
+            self.cmd.undo()
+            self._update()
+
+    def redo(self):
+        if not self.stack.rebuilding:
+            self.cmd.redo()
+            self._update()
+
+    def _update(self):
+        if self.cmd.isObsolete():
+            # deleted by the stack.
+            self.setObsolete(True)
+            self.stack.update_cost(self, 0)
+        else:
+            self.stack.update_cost(self, _command_cost(self.cmd))
+
+
+class NodeUndoStack(QtWidgets.QUndoStack):
+    """
+    Undo stack with a memory budget and a history limit.
+
+    The memory held by the undo history is kept as a running total. When
+    it goes over the budget the oldest commands are compacted into
+    serialized node data, which is optionally spilled to a temp file.
+    When it's still over the budget, or the history is longer than the
+    limit, the oldest commands are dropped from the stack. The latest
+    undoable command is always kept.
+    """
+
+    def __init__(self, parent=None):
+        super(NodeUndoStack, self).__init__(parent)
+        self._memory_limit = UNDO_MEMORY_LIMIT
+        self._history_limit = 0
+        self._spill = True
+        self._spill_file = UndoSpillFile()
+        self._memory_cost = 0
+        self._macros = 0
+        self._scheduled = False
+        # true while the stack is rebuilt, the commands aren't run.
+        self.rebuilding = False
+        self.indexChanged.connect(self._on_index_changed)
+
+    def _on_index_changed(self, index):
+        if self.rebuilding or self._scheduled:
+            return
+        if self._over_limits():
+            # not while the stack is still emitting its signals.
+            self._scheduled = True
+            QtCore.QTimer.singleShot(0, self.enforce_limits)
+
+    def _over_limits(self):
+        if self._memory_limit and self._memory_cost > self._memory_limit:
+            return True
+        return bool(self._history_limit and
+                    self.count() > self._history_limit)
+
+    def _release(self, cmd):
+        # removes the cost of a command deleted by the stack.
+        for leaf in _leaf_commands(cmd):
+            if isinstance(leaf, _StackCommand):
+                self._memory_cost -= leaf.cost
+                leaf.cost = 0
+
+    def _release_redo(self):
+        # the commands after the index are deleted by a push.
+        for i in range(self.index(), self.count()):
+            self._release(self.command(i))
+
+    def update_cost(self, holder, cost):
+        """
+        Called by the pushed commands when their memory cost may have
+        changed.
+
+        Args:
+            holder (_StackCommand): pushed command.
+            cost (int): new memory cost in bytes.
+        """
+        self._memory_cost += cost - holder.cost
+        holder.cost = cost
+
+    def push(self, cmd):
+        if not self._macros:
+            self._release_redo()
+        holder = _StackCommand(self, cmd)
+        if cmd.isObsolete():
+            holder.setObsolete(True)
+        super(NodeUndoStack, self).push(holder)
+        if holder.merged:
+            self._memory_cost -= holder.cost
+            holder.cost = 0
+
+    def beginMacro(self, text):
+        if not self._macros:
+            self._release_redo()
+        self._macros += 1
+        super(NodeUndoStack, self).beginMacro(text)
+
+    def endMacro(self):
+        self._macros -= 1
+        super(NodeUndoStack, self).endMacro()
+
+    def set_limits(self, memory=UNDO_MEMORY_LIMIT, history=0, spill=True):
+        """
+        Set the undo history limits.
+
+        Args:
+            memory (int): memory budget in bytes (0 for unlimited).
+            history (int): max number of undo commands (0 for unlimited).
+            spill (bool): spill compacted commands to a temp file.
+        """
+        self._memory_limit = memory
+        self._history_limit = history
+        self._spill = spill
+        self.enforce_limits()
+
+    def memory_cost(self):
+        """
+        Returns:
+            int: estimated memory in bytes held by the undo history.
+        """
+        return self._memory_cost
+
+    def enforce_limits(self):
+        """
+        Compact, spill and drop the oldest commands until the undo
+        history is within the limits.
+        """
+        self._scheduled = False
+        if self._macros or self.rebuilding or not self._over_limits():
+            return
+        limit = self._memory_limit
+        if limit and self._memory_cost > limit:
+            self._compact(limit)
+
+        count = 0
+        if self._history_limit:
+            count = self.count() - self._history_limit
+        cost = self._memory_cost
+        while limit and cost > limit and count < self.count():
+            cost -= sum(h.cost for h in _leaf_commands(self.command(count))
+                        if isinstance(h, _StackCommand))
+            count += 1
+        # the latest undoable command is always kept.
+        count = min(count, self.index() - 1)
+        if count > 0:
+            self._drop_oldest(count)
+
+    def _compact(self, limit):
+        # compacts the oldest commands first.
+        spill_file = self._spill_file if self._spill else None
+        for i in range(self.count()):
+            for holder in _leaf_commands(self.command(i)):
+                if self._memory_cost <= limit:
+                    return
+                if not isinstance(holder, _StackCommand):
+                    continue
+                for cmd in _leaf_commands(holder.cmd):
+                    if hasattr(cmd, 'compact'):
+                        cmd.compact(spill_file)
+                self.update_cost(holder, _command_cost(holder.cmd))
+
+    def _drop_oldest(self, count):
+        """
+        Rebuild the stack without the oldest commands, the kept commands
+        are pushed again in new holders without being run.
+        """
+        kept = [self._copy_holder(self.command(i))
+                for i in range(count, self.count())]
+        for i in range(count):
+            self._release(self.command(i))
+        index = self.index() - count
+        clean = self.cleanIndex() - count
+
+        self.rebuilding = True
+        blocked = self.blockSignals(True)
+        try:
+            super(NodeUndoStack, self).clear()
+            for holder in kept:
+                super(NodeUndoStack, self).push(holder)
+            if clean >= 0:
+                self.setIndex(clean)
+                self.setClean()
+            else:
+                self.resetClean()
+            self.setIndex(index)
+        finally:
+            self.blockSignals(blocked)
+            self.rebuilding = False
+
+    def _copy_holder(self, cmd, parent=None):
+        if isinstance(cmd, _StackCommand):
+            holder = _StackCommand(self, cmd.cmd, parent)
+            holder.cost = cmd.cost
+            return holder
+        # macro command created by the stack.
+        macro = QtWidgets.QUndoCommand(cmd.text(), parent)
+        for i in range(cmd.childCount()):
+            self._copy_holder(cmd.child(i), macro)
+        return macro
+
+    def clear(self):
+        super(NodeUndoStack, self).clear()
+        self._spill_file.close()
+        self._memory_cost = 0
@@ -1,23 +1,38 @@
 #!/usr/bin/python
+import json
 import re
+import zlib
 from collections import OrderedDict
 
 from PySide2 import QtGui, QtCore, QtWidgets
 
 from .commands import *
 from .constants import (IN_PORT, OUT_PORT,
+                        CLIPBOARD_MIME_TYPE,
+                        MINIMAP_SIZE,
+                        NODE_CULL_MARGIN,
+                        PIPE_BUNDLE_THRESHOLD,
                         PIPE_LAYOUT_CURVED,
                         PIPE_LAYOUT_STRAIGHT,
                         PIPE_STYLE_DASHED)
+from .layout_runner import LayoutRunner
 from .node_abstract import AbstractNodeItem
 from .node_backdrop import BackdropNodeItem
+from .minimap import NodeMinimap
+from .node_culler import NodeCuller
 from .pipe import Pipe
-from .port import PortItem
+from .pipe_bundle import PipeBundler
+from .pipe_layer import PipeLayer
+from .port import PortItem, PaintedPort
 from .stylesheet import STYLE_QMENU
 from .tab_search import TabSearchWidget
+from .undo_stack import NodeUndoStack
 from .viewer_actions import setup_viewer_actions
+from ..base.graph_layout import layered_layout, force_layout
 from ..base.node_vendor import NodeVendor
 from ..base.serializer import SessionSerializer, SessionLoader
+from ..base.session_journal import SessionJournal
+from ..base.session_schema import upgrade_session
 
 ZOOM_LIMIT = 12
 
@@ -25,6 +40,7 @@ ZOOM_LIMIT = 12
 class NodeViewer(QtWidgets.QGraphicsView):
 
     search_triggered = QtCore.Signal(str, tuple)
+    viewport_changed = QtCore.Signal()
 
     def __init__(self, parent=None, scene=None):
         super(NodeViewer, self).__init__(scene, parent)
@@ -47,7 +63,18 @@ class NodeViewer(QtWidgets.QGraphicsView):
         self._rubber_band = QtWidgets.QRubberBand(
             QtWidgets.QRubberBand.Rectangle, self
         )
-        self._undo_stack = QtWidgets.QUndoStack(self)
+        self._undo_stack = NodeUndoStack(self)
+        self._journal_enabled = False
+        self.scene().property_bus.properties_changed.connect(
+            self._on_properties_changed)
+        self._layout_runner = LayoutRunner(self)
+        self._layout_runner.finished.connect(self._on_layout_finished)
+        self._layout_runner.failed.connect(self._on_layout_failed)
+        self._layout_runner.progress.connect(self._on_layout_progress)
+        self._layout_ids = []
+        self._layout_start = {}
+        # {<backdrop_id>: ([<node index>], <mean start position>)}
+        self._layout_groups = {}
         self._context_menu = QtWidgets.QMenu(self, 'Node Graph')
         self._context_menu.setStyleSheet(STYLE_QMENU)
         self._sub_context_menus = OrderedDict()
@@ -55,6 +82,9 @@ class NodeViewer(QtWidgets.QGraphicsView):
         self._sub_context_menus['Edit'] = QtWidgets.QMenu(None, title='Edit')
         self._search_widget = TabSearchWidget(self, NodeVendor.names)
         self._search_widget.search_submitted.connect(self._on_search_submitted)
+        self._minimap = None
+        self.horizontalScrollBar().valueChanged.connect(self._viewport_changed)
+        self.verticalScrollBar().valueChanged.connect(self._viewport_changed)
 
         self.acyclic = True
         self.LMB_state = False
@@ -107,6 +137,15 @@ class NodeViewer(QtWidgets.QGraphicsView):
             return
         scale = 1.0 + value
         self.scale(scale, scale)
+        self._viewport_changed()
+
+    def _viewport_changed(self, *args):
+        self.viewport_changed.emit()
+
+    def _place_minimap(self):
+        margin = 10
+        self._minimap.move(self.width() - self._minimap.width() - margin,
+                           self.height() - self._minimap.height() - margin)
 
     def _set_viewer_pan(self, pos_x, pos_y):
         scroll_x = self.horizontalScrollBar()
@@ -129,8 +168,38 @@ class NodeViewer(QtWidgets.QGraphicsView):
                 items.append(item)
         return items
 
+    def _ports_near(self, pos, width=20, height=20):
+        ports = []
+        for item in self._items_near(pos, None, width, height):
+            if isinstance(item, PortItem):
+                ports.append(item)
+            elif isinstance(item, AbstractNodeItem):
+                port = item.port_at(pos, max(width, height) / 2.0)
+                if port:
+                    ports.append(port)
+        return ports
+
+    def _port_at(self, pos):
+        for item in self.scene().items(pos):
+            if isinstance(item, PortItem):
+                return item
+            elif isinstance(item, AbstractNodeItem):
+                port = item.port_at(pos)
+                if port:
+                    return port
+
+    def _pipe_at(self, pos):
+        pipe_items = self._items_near(pos, Pipe, 3, 3)
+        if pipe_items:
+            return pipe_items[0]
+        if self.scene().pipe_layer:
+            return self.scene().pipe_layer.pipe_at(pos)
+        if self.scene().pipe_bundler:
+            return self.scene().pipe_bundler.pipe_at(pos)
+
     def _toggle_tab_search(self):
-        self._search_widget.set_nodes(NodeVendor.names)
+        self._search_widget.set_nodes(NodeVendor.names, NodeVendor.aliases,
+                                      NodeVendor.revision)
 
         pos = self._previous_pos
         state = not self._search_widget.isVisible()
@@ -167,6 +236,9 @@ class NodeViewer(QtWidgets.QGraphicsView):
 
     def resizeEvent(self, event):
         super(NodeViewer, self).resizeEvent(event)
+        if self._minimap:
+            self._place_minimap()
+        self._viewport_changed()
 
     def contextMenuEvent(self, event):
         self.RMB_state = False
@@ -235,10 +307,10 @@ class NodeViewer(QtWidgets.QGraphicsView):
             n for n in self.selected_nodes() if n.pos != n.prev_pos
         ]
         if nodes_pos_changed:
-            self._undo_stack.beginMacro('move nodes')
-            for node in nodes_pos_changed:
-                self._undo_stack.push(NodePositionChangedCmd(node))
-            self._undo_stack.endMacro()
+            self.push_nodes_moved(
+                [n.id for n in nodes_pos_changed],
+                [xy for n in nodes_pos_changed for xy in n.prev_pos],
+                [xy for n in nodes_pos_changed for xy in n.pos])
 
         super(NodeViewer, self).mouseReleaseEvent(event)
 
@@ -279,6 +351,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         unity = self.transform().mapRect(QtCore.QRectF(0, 0, 1, 1))
         self.scale(1 / unity.width(), 1 / unity.height())
         self._zoom = 0
+        self._viewport_changed()
 
     # def dropEvent(self, event):
     #     if event.mimeData().hasFormat('component/name'):
@@ -293,9 +366,10 @@ class NodeViewer(QtWidgets.QGraphicsView):
     #     if event.mimeData().hasFormat('component/name'):
     #         event.accept()
 
-    def get_unique_node_name(self, name):
+    def get_unique_node_name(self, name, node_names=None):
         name = ' '.join(name.split())
-        node_names = [n.name for n in self.all_nodes()]
+        if node_names is None:
+            node_names = set(n.name for n in self.all_nodes())
         if name not in node_names:
             return name
 
@@ -348,6 +422,9 @@ class NodeViewer(QtWidgets.QGraphicsView):
             event (QtWidgets.QGraphicsSceneMouseEvent):
                 The event handler from the QtWidgets.QGraphicsScene
         """
+        pipe_layer = self.scene().pipe_layer
+        if pipe_layer and not self._live_pipe:
+            pipe_layer.hover(event.scenePos())
         if not self._live_pipe:
             return
         if not self._start_port:
@@ -375,7 +452,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
 
         if not alt_modifier:
             pos = event.scenePos()
-            port_items = self._items_near(pos, PortItem, 5, 5)
+            port_items = self._ports_near(pos, 5, 5)
             if port_items:
                 port = port_items[0]
                 if not port.multi_connection and port.connected_ports:
@@ -390,9 +467,8 @@ class NodeViewer(QtWidgets.QGraphicsView):
                 if not isinstance(node_items[0], BackdropNodeItem):
                     return
 
-            pipe_items = self._items_near(pos, Pipe, 3, 3)
-            if pipe_items:
-                pipe = pipe_items[0]
+            pipe = self._pipe_at(pos)
+            if pipe:
                 attr = {IN_PORT: 'output_port', OUT_PORT: 'input_port'}
                 from_port = pipe.port_from_pos(pos, True)
                 to_port = getattr(pipe, attr[from_port.port_type])
@@ -421,11 +497,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
             return
 
         # find the end port.
-        end_port = None
-        for item in self.scene().items(event.scenePos()):
-            if isinstance(item, PortItem):
-                end_port = item
-                break
+        end_port = self._port_at(event.scenePos())
 
         if end_port is None:
             if self._detached_port:
@@ -449,7 +521,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         ]
         if any(restore_connection):
             pipe = Pipe()
-            self.scene().addItem(pipe)
+            self.scene().add_pipe(pipe)
             to_port = self._detached_port or end_port
             pipe.set_connections(self._start_port, to_port)
             pipe.draw_path(pipe.input_port, pipe.output_port)
@@ -508,10 +580,12 @@ class NodeViewer(QtWidgets.QGraphicsView):
             self, title, text, QtWidgets.QMessageBox.Ok)
 
     def all_pipes(self):
+        # collected from the output ports so the bundled pipes that are
+        # not in the scene are included.
         pipes = []
-        for item in self.scene().items():
-            if isinstance(item, Pipe):
-                pipes.append(item)
+        for node in self.all_nodes():
+            for port in getattr(node, 'outputs', []):
+                pipes += port.connected_pipes
         return pipes
 
     def all_nodes(self):
@@ -535,16 +609,34 @@ class NodeViewer(QtWidgets.QGraphicsView):
         self._undo_stack.push(NodeCreatedCommand(node, self.scene()))
         node.post_init(self, pos)
 
+    def _on_properties_changed(self, changes):
+        scene = self.scene()
+        bus = scene.property_bus
+        if bus.undoable():
+            self._undo_stack.push(
+                NodePropertiesChangedCmd(scene, changes, bus.text()))
+        # properties without a setter on the item don't redraw the node.
+        for node_id in changes:
+            node = scene.get_node(node_id)
+            if node:
+                node.update()
+
+    def set_node_property(self, node, name, value):
+        text = 'set {} ({})'.format(node.name, name)
+        with self.scene().property_bus.transaction(text):
+            node.set_property(name, value)
+
     def delete_node(self, node):
         if isinstance(node, AbstractNodeItem):
             self._undo_stack.push(NodeDeletedCmd(node, self.scene()))
 
+    def delete_nodes(self, nodes):
+        nodes = [n for n in nodes if isinstance(n, AbstractNodeItem)]
+        if nodes:
+            self._undo_stack.push(NodesDeletedCmd(nodes, self.scene()))
+
     def delete_selected_nodes(self):
-        self._undo_stack.beginMacro('delete selected node(s)')
-        for node in self.selected_nodes():
-            if isinstance(node, AbstractNodeItem):
-                self._undo_stack.push(NodeDeletedCmd(node, self.scene()))
-        self._undo_stack.endMacro()
+        self.delete_nodes(self.selected_nodes())
 
     def get_pipes_from_nodes(self, nodes=None):
         nodes = nodes or self.selected_nodes()
@@ -572,56 +664,361 @@ class NodeViewer(QtWidgets.QGraphicsView):
         if not nodes:
             return
         pipes = self.get_pipes_from_nodes(nodes)
-        serializer = SessionSerializer(nodes, pipes)
-        clipboard = QtGui.QClipboard()
-        clipboard.setText(serializer.serialize_to_str())
+        layout = SessionSerializer(nodes, pipes).serialize_layout()
+        mime_data = QtCore.QMimeData()
+        mime_data.setData(CLIPBOARD_MIME_TYPE, QtCore.QByteArray(
+            SessionSerializer.layout_to_bytes(layout)))
+        # plain json fallback for other applications.
+        mime_data.setText(json.dumps(layout, separators=(',', ':')))
+        QtWidgets.QApplication.clipboard().setMimeData(mime_data)
+
+    def _build_nodes(self, data):
+        """
+        Create the node items from the serialized layout data without
+        adding them to the scene.
+
+        Args:
+            data (dict): serialized session layout.
+
+        Returns:
+            tuple: list of node items, list of connection port keys.
+        """
+        data = upgrade_session(data)
+        node_names = set(n.name for n in self.all_nodes())
+        nodes = {}
+        for node_id, attrs in data.get('nodes', {}).items():
+            NodeInstance = NodeVendor.create_node_instance(attrs.get('type'))
+            if not NodeInstance:
+                continue
+            node = NodeInstance().item
+            attrs = dict(attrs)
+            name = attrs.get('name', node.name)
+            attrs['name'] = self.get_unique_node_name(name, node_names)
+            node_names.add(attrs['name'])
+            node.from_dict(attrs)
+            node.post_init(self)
+            nodes[node_id] = node
+
+        connections = []
+        for connection in data.get('connections', []):
+            in_node = nodes.get(connection['in'][0])
+            out_node = nodes.get(connection['out'][0])
+            if not (in_node and out_node):
+                continue
+            connections.append(((in_node.id, IN_PORT, connection['in'][1]),
+                                (out_node.id, OUT_PORT, connection['out'][1])))
+        return list(nodes.values()), connections
+
+    def _clone_nodes(self, nodes):
+        """
+        Create copies of the node items and of the connections between
+        them without adding them to the scene.
+
+        Args:
+            nodes (list[AbstractNodeItem]): node items to copy.
+
+        Returns:
+            tuple: list of node items, list of connection port keys.
+        """
+        node_names = set(n.name for n in self.all_nodes())
+        clones = {}
+        for node in nodes:
+            NodeInstance = NodeVendor.create_node_instance(node.type)
+            if not NodeInstance:
+                continue
+            clone = NodeInstance().item
+            clone.copy_properties(node)
+            clone.name = self.get_unique_node_name(node.name, node_names)
+            node_names.add(clone.name)
+            clone.post_init(self)
+            clones[node] = clone
+
+        connections = []
+        # the pipes between the nodes are listed from both of their ends.
+        for pipe in set(self.get_pipes_from_nodes(nodes)):
+            in_node = clones.get(pipe.input_port.node)
+            out_node = clones.get(pipe.output_port.node)
+            if not (in_node and out_node):
+                continue
+            connections.append(((in_node.id, IN_PORT, pipe.input_port.name),
+                                (out_node.id, OUT_PORT,
+                                 pipe.output_port.name)))
+        return list(clones.values()), connections
+
+    def load_nodes_data(self, data, undo_text=None):
+        """
+        Add the nodes from the serialized layout data offset to the cursor
+        as a single undo command.
 
-    def load_nodes_data(self, data):
+        Args:
+            data (dict): serialized session layout.
+            undo_text (str): undo command text.
+
+        Returns:
+            list[AbstractNodeItem]: new node items.
+        """
         self.clear_selection()
-        loader = SessionLoader(self)
-        loaded_nodes = loader.load_string_data(data)
+        loaded_nodes, connections = self._build_nodes(data)
+        return self._add_loaded_nodes(loaded_nodes, connections, undo_text)
+
+    def _add_loaded_nodes(self, loaded_nodes, connections, undo_text=None):
+        """
+        Add the new node items offset to the cursor as a single undo
+        command.
+
+        Args:
+            loaded_nodes (list[AbstractNodeItem]): node items.
+            connections (list[tuple]): connection port keys.
+            undo_text (str): undo command text.
+
+        Returns:
+            list[AbstractNodeItem]: new node items.
+        """
         if not loaded_nodes:
             return []
 
         # offset loaded nodes.
-        group = self.scene().createItemGroup(loaded_nodes)
-        group_rect = group.boundingRect()
+        rect = QtCore.QRectF()
+        for node in loaded_nodes:
+            rect = rect.united(node.sceneBoundingRect())
         prev_x, prev_y = self._previous_pos.x(), self._previous_pos.y()
         orig_x, orig_y = self._origin_pos.x(), self._origin_pos.y()
         if (prev_x, prev_y) != (orig_x, orig_y):
             pos = self.mapToScene(self._previous_pos)
-            x = pos.x() - group_rect.center().x()
-            y = pos.y() - group_rect.center().y()
+            x = pos.x() - rect.center().x()
+            y = pos.y() - rect.center().y()
         else:
-            x, y = group.pos().x() + 50, group.pos().y() + 50
-        group.setPos(x, y)
-        self.scene().destroyItemGroup(group)
+            x, y = 50.0, 50.0
+        for node in loaded_nodes:
+            node.setPos(node.x() + x, node.y() + y)
+            node.prev_pos = node.pos
         self._origin_pos = self._previous_pos
+
+        cmd = NodesCreatedCmd(loaded_nodes, self.scene(), connections)
+        if undo_text:
+            cmd.setText(undo_text)
+        self._undo_stack.push(cmd)
+
+        for node in loaded_nodes:
+            if node.get_property('selected'):
+                node.selected = True
+                if hasattr(node, 'hightlight_pipes'):
+                    node.hightlight_pipes()
         return loaded_nodes
 
     def paste_from_clipboard(self):
-        clipboard = QtGui.QClipboard()
-        data_string = clipboard.text()
-        self._undo_stack.beginMacro('pasted nodes')
-        self.load_nodes_data(data_string)
-        self._undo_stack.endMacro()
+        mime_data = QtWidgets.QApplication.clipboard().mimeData()
+        if mime_data.hasFormat(CLIPBOARD_MIME_TYPE):
+            data = mime_data.data(CLIPBOARD_MIME_TYPE).data()
+            try:
+                data = SessionSerializer.deserialize_bytes(data)
+            except (zlib.error, ValueError) as e:
+                print('Cannot read data from clipboard.\n{}'.format(e))
+                return
+        else:
+            try:
+                data = json.loads(mime_data.text())
+            except ValueError as e:
+                print('Cannot read data from clipboard.\n{}'.format(e))
+                return
+        self.load_nodes_data(data, 'pasted nodes')
 
     def duplicate_nodes(self, nodes=None):
         nodes = nodes or self.selected_nodes()
         if not nodes:
             return []
-        pipes = self.get_pipes_from_nodes(nodes)
-        serializer = SessionSerializer(nodes, pipes)
-        data = serializer.serialize_to_str()
-        self._undo_stack.beginMacro('duplicated nodes')
-        new_nodes = self.load_nodes_data(data)
-        self._undo_stack.endMacro()
-        return new_nodes
+        clones, connections = self._clone_nodes(nodes)
+        self.clear_selection()
+        return self._add_loaded_nodes(clones, connections, 'duplicated nodes')
 
     def select_all_nodes(self):
         for node in self.all_nodes():
             node.selected = True
 
+    def push_nodes_moved(self, node_ids, prev_pos, pos, merge=False):
+        """
+        Push a single undo command for a node move.
+
+        Args:
+            node_ids (list[str]): node ids.
+            prev_pos (list[float]): flat previous positions [x0, y0, x1...]
+            pos (list[float]): flat new positions [x0, y0, x1, y1...]
+            merge (bool): merge with the next move of the same nodes.
+        """
+        self._undo_stack.push(
+            NodesMovedCmd(self.scene(), node_ids, prev_pos, pos, merge))
+
+    def apply_node_positions(self, positions, text='move nodes',
+                             prev_positions=None):
+        """
+        Move the nodes as a single undo command.
+
+        Args:
+            positions (dict): node positions {<node_id>: (x, y)}.
+            text (str): undo command text.
+            prev_positions (dict): positions to undo to (defaults to the
+                current node positions).
+        """
+        scene = self.scene()
+        prev_positions = prev_positions or {}
+        node_ids = []
+        prev_pos = []
+        pos = []
+        for node_id, xy in positions.items():
+            node = scene.get_node(node_id)
+            if node:
+                node_ids.append(node_id)
+                prev_pos.extend(prev_positions.get(node_id, node.pos))
+                pos.extend(xy)
+        if not node_ids:
+            return
+        cmd = NodesMovedCmd(scene, node_ids, prev_pos, pos)
+        cmd.setText(text)
+        self._undo_stack.push(cmd)
+
+    def layout_runner(self):
+        return self._layout_runner
+
+    def layout_data(self, nodes):
+        """
+        Returns a plain data snapshot of the nodes and their connections
+        for the functions in "NodeGraphQt.base.graph_layout".
+
+        Args:
+            nodes (list[AbstractNodeItem]): nodes.
+
+        Returns:
+            tuple: (node_ids, connections, sizes, origin)
+        """
+        node_ids = [n.id for n in nodes]
+        connections = []
+        for node in nodes:
+            for port in getattr(node, 'outputs', []):
+                for in_port in port.connected_ports:
+                    connections.append((node.id, in_port.node.id))
+        sizes = {n.id: n.size for n in nodes}
+        positions = [n.pos for n in nodes]
+        origin = (min(p[0] for p in positions), min(p[1] for p in positions))
+        return node_ids, connections, sizes, origin
+
+    def auto_layout(self, nodes=None, mode='layered', **options):
+        """
+        Layout the nodes on a worker thread, the result is applied as a
+        single undo command once finished.
+
+        The "force" layout previews the node positions while it runs and
+        moves the backdrops along with the nodes on them.
+
+        Args:
+            nodes (list[AbstractNodeItem]): nodes (default: all nodes).
+            mode (str): "layered" or "force".
+            **options: keyword arguments of the "layered_layout" or
+                "force_layout" function in "NodeGraphQt.base.graph_layout".
+
+        Returns:
+            bool: false if there's nothing to layout or a layout is
+                already running.
+        """
+        if mode not in ('layered', 'force'):
+            raise ValueError('invalid layout mode "{}".'.format(mode))
+        if self._layout_runner.is_running():
+            return False
+        nodes = nodes or self.all_nodes()
+        backdrops = [n for n in nodes if isinstance(n, BackdropNodeItem)]
+        nodes = [n for n in nodes if not isinstance(n, BackdropNodeItem)]
+        if not nodes:
+            return False
+        node_ids, connections, sizes, origin = self.layout_data(nodes)
+        self._layout_ids = node_ids
+        self._layout_start = {n.id: n.pos for n in nodes}
+        self._layout_groups = {}
+        if mode == 'layered':
+            options.setdefault('origin', origin)
+            return self._layout_runner.run(
+                layered_layout, node_ids, connections, sizes, **options)
+
+        index = {nid: i for i, nid in enumerate(node_ids)}
+        groups = {}
+        for backdrop in backdrops:
+            groups[backdrop.id] = [n.id for n in backdrop.get_nodes(False)
+                                   if n.id in index]
+            self._layout_start[backdrop.id] = backdrop.pos
+            if groups[backdrop.id]:
+                # the preview moves the backdrop by the mean offset of its
+                # nodes like the layout result.
+                indices = [index[nid] for nid in groups[backdrop.id]]
+                self._layout_groups[backdrop.id] = (
+                    indices, self._mean_pos(
+                        [self._layout_start[node_ids[i]] for i in indices]))
+        options['callback'] = self._layout_runner.report
+        return self._layout_runner.run(
+            force_layout, node_ids, connections, sizes,
+            dict(self._layout_start), groups, **options)
+
+    def _on_layout_progress(self):
+        positions = self._layout_runner.take_preview()
+        if positions is None:
+            return
+        scene = self.scene()
+        suspend = len(self._layout_ids) > NodesMovedCmd.INDEX_THRESHOLD
+        positions = positions.tolist()
+        with scene.suspended_index(suspend):
+            for node_id, xy in zip(self._layout_ids, positions):
+                node = scene.get_node(node_id)
+                if node:
+                    node.setPos(xy[0], xy[1])
+            for backdrop_id, group in self._layout_groups.items():
+                backdrop = scene.get_node(backdrop_id)
+                if not backdrop:
+                    continue
+                indices, start = group
+                x, y = self._mean_pos([positions[i] for i in indices])
+                bx, by = self._layout_start[backdrop_id]
+                backdrop.setPos(bx + x - start[0], by + y - start[1])
+
+    @staticmethod
+    def _mean_pos(positions):
+        count = float(len(positions))
+        return (sum(p[0] for p in positions) / count,
+                sum(p[1] for p in positions) / count)
+
+    def _on_layout_finished(self, positions):
+        self.apply_node_positions(positions, 'auto layout',
+                                  self._layout_start)
+        self._layout_start = {}
+        self._layout_groups = {}
+
+    def _on_layout_failed(self, message):
+        # put back the nodes moved by the layout preview.
+        scene = self.scene()
+        for node_id, pos in self._layout_start.items():
+            node = scene.get_node(node_id)
+            if node:
+                node.setPos(pos[0], pos[1])
+        self._layout_start = {}
+        self._layout_groups = {}
+        if not self._layout_runner.is_cancelled():
+            self.message_dialog(message, 'auto layout')
+
+    def nudge_nodes(self, x=0.0, y=0.0, nodes=None):
+        """
+        Offset the nodes, consecutive nudges of the same nodes are merged
+        into a single undo command.
+
+        Args:
+            x (float): horizontal offset.
+            y (float): vertical offset.
+            nodes (list[AbstractNodeItem]): nodes (default: selected nodes).
+        """
+        nodes = nodes or self.selected_nodes()
+        if not nodes:
+            return
+        prev_pos = [xy for n in nodes for xy in n.pos]
+        pos = []
+        for i in range(0, len(prev_pos), 2):
+            pos += [prev_pos[i] + x, prev_pos[i + 1] + y]
+        self.push_nodes_moved([n.id for n in nodes], prev_pos, pos, True)
+
     def toggle_nodes_disability(self):
         nodes = self.selected_nodes()
         state = not nodes[0].disabled if nodes else False
@@ -635,7 +1032,7 @@ class NodeViewer(QtWidgets.QGraphicsView):
         self._undo_stack.endMacro()
 
     def connect_ports(self, from_port, to_port):
-        if not isinstance(from_port, PortItem):
+        if not isinstance(from_port, (PortItem, PaintedPort)):
             return
 
         pre_conn_port = None
@@ -679,18 +1076,79 @@ class NodeViewer(QtWidgets.QGraphicsView):
                 self._current_file = path
         except Exception as e:
             print(e)
+            return
+        # the journal changes are now part of the saved file.
+        if path == self._current_file:
+            self._open_journal(clear=True)
+        else:
+            SessionJournal(path).clear()
 
-    def load(self, file_path):
+    def save_changes(self):
+        """
+        Save the current session file by writing only the changes to the
+        journal, falls back to a full save when the journal is disabled or
+        due to be compacted.
+        """
+        if not self._current_file:
+            return
+        journal = self.scene().journal
+        if journal is None or journal.needs_compaction():
+            self.save(self._current_file)
+            return
+        self.scene().flush_journal()
+
+    def compact_journal(self):
+        """
+        Compact the journal into a full save of the current session file.
+        """
+        if self._current_file:
+            self.save(self._current_file)
+
+    def set_journal(self, enabled=True):
+        """
+        Record the graph changes to a journal next to the session file.
+
+        Args:
+            enabled (bool): false to disable the journal.
+        """
+        self._journal_enabled = enabled
+        self._open_journal()
+
+    def _open_journal(self, clear=False):
+        scene = self.scene()
+        if scene.journal:
+            scene.journal.close()
+        scene.journal = None
+        if not self._current_file:
+            return
+        journal = SessionJournal(self._current_file)
+        if clear:
+            journal.clear()
+        if self._journal_enabled:
+            scene.journal = journal
+
+    def load(self, file_path, set_current=True):
+        self.scene().journal = None
         self.clear()
         loader = SessionLoader(self)
         loader.load(file_path)
-        self._current_file = file_path
+        if set_current:
+            self._current_file = file_path
+            self._open_journal()
 
     def clear(self):
+        scene = self.scene()
+        # the pipe layer item is kept in the scene for the new pipes and the
+        # bundles are dropped along with the bundled pipes.
+        if scene.pipe_bundler:
+            scene.pipe_bundler.clear()
+        if scene.pipe_layer:
+            scene.pipe_layer.clear()
         for node in self.all_nodes():
             node.delete()
-        for item in self.scene().items():
-            self.scene().removeItem(item)
+        for item in scene.items():
+            if item is not scene.pipe_layer:
+                scene.removeItem(item)
         self._current_file = None
 
     def clear_selection(self):
@@ -710,6 +1168,101 @@ class NodeViewer(QtWidgets.QGraphicsView):
             rect = self._combined_rect(nodes)
             self.centerOn(rect.center().x(), rect.center().y())
 
+    def pipe_bundling(self):
+        return self.scene().pipe_bundler is not None
+
+    def set_pipe_bundling(self, mode=True, threshold=PIPE_BUNDLE_THRESHOLD):
+        """
+        Draw the pipes of the output ports connected to many inputs as a
+        single bundle item.
+
+        Args:
+            mode (bool): true to bundle the pipes.
+            threshold (int): min number of pipes on a port to bundle.
+        """
+        scene = self.scene()
+        if scene.pipe_bundler:
+            scene.pipe_bundler.clear()
+            scene.pipe_bundler.deleteLater()
+            scene.pipe_bundler = None
+        if not mode:
+            return
+        self.set_pipe_layer(False)
+        scene.pipe_bundler = PipeBundler(scene, threshold)
+        ports = []
+        for node in self.all_nodes():
+            ports += getattr(node, 'outputs', [])
+        scene.pipe_bundler.bundle_ports(ports)
+
+    def minimap(self):
+        return self._minimap
+
+    def set_minimap(self, mode=True, size=MINIMAP_SIZE):
+        """
+        Show a minimap overview in the bottom right corner of the viewer.
+
+        Args:
+            mode (bool): true to show the minimap.
+            size (tuple): minimap (width, height) in pixels.
+        """
+        if self._minimap:
+            self._minimap.deleteLater()
+            self._minimap = None
+        if not mode:
+            return
+        self._minimap = NodeMinimap(self, size)
+        self._place_minimap()
+        self._minimap.show()
+
+    def node_culling(self):
+        return self.scene().node_culler is not None
+
+    def set_node_culling(self, mode=True, margin=NODE_CULL_MARGIN):
+        """
+        Hide the text items and embedded widgets of the nodes outside the
+        visible area, they're restored as the nodes scroll into view.
+
+        Args:
+            mode (bool): true to cull the off screen nodes.
+            margin (float): scene distance around the viewport that is
+                kept unculled.
+        """
+        scene = self.scene()
+        if scene.node_culler:
+            scene.node_culler.clear()
+            scene.node_culler.deleteLater()
+            scene.node_culler = None
+        if not mode:
+            return
+        scene.node_culler = NodeCuller(self, margin)
+        scene.node_culler.cull_all()
+
+    def pipe_layer(self):
+        return self.scene().pipe_layer
+
+    def set_pipe_layer(self, mode=True):
+        """
+        Draw all the pipes with a single pipe layer item instead of a
+        scene item per pipe, turns off the pipe bundling.
+
+        Args:
+            mode (bool): true to use the pipe layer.
+        """
+        scene = self.scene()
+        if scene.pipe_layer:
+            if mode:
+                return
+            scene.pipe_layer.clear(restore=True)
+            scene.removeItem(scene.pipe_layer)
+            scene.pipe_layer = None
+            return
+        if not mode:
+            return
+        self.set_pipe_bundling(False)
+        scene.pipe_layer = PipeLayer()
+        scene.addItem(scene.pipe_layer)
+        scene.pipe_layer.add_pipes(self.all_pipes())
+
     def get_pipe_layout(self):
         return self._pipe_layout
 
@@ -722,6 +1275,9 @@ class NodeViewer(QtWidgets.QGraphicsView):
         for pipe in self.all_pipes():
             pipe.draw_path(pipe.input_port, pipe.output_port)
 
+    def undo_stack(self):
+        return self._undo_stack
+
     def set_zoom(self, zoom=0):
         if zoom == 0:
             self.fitInView()
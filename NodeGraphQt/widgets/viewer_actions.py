@@ -1,14 +1,18 @@
 #!/usr/bin/python
 from PySide2 import QtGui, QtWidgets
 
-from .constants import FILE_IO_EXT
+from .constants import (FILE_IO_EXT,
+                        NODE_NUDGE_STEP,
+                        NODE_NUDGE_STEP_LARGE)
+from ..base.session_reader import INDEXED_SESSION_EXT
 
 
 def load_session(viewer):
     file_dlg = QtWidgets.QFileDialog.getOpenFileName(
         viewer,
         caption='Open Session Setup',
-        filter='Node Graph (*{}) All Files (*)'.format(FILE_IO_EXT))
+        filter='Node Graph (*{} *{}) All Files (*)'.format(
+            FILE_IO_EXT, INDEXED_SESSION_EXT))
     file_path = file_dlg[0]
     if file_path:
         viewer.load(file_path)
@@ -18,7 +22,8 @@ def save_session_as(viewer):
     file_dlg = QtWidgets.QFileDialog.getSaveFileName(
         viewer,
         caption='Save Session',
-        filter='Node Graph (*{})'.format(FILE_IO_EXT))
+        filter='Node Graph (*{});;Indexed Node Graph (*{})'.format(
+            FILE_IO_EXT, INDEXED_SESSION_EXT))
     file_path = file_dlg[0]
     if not file_path:
         return
@@ -126,7 +131,27 @@ def setup_viewer_actions(viewer):
     fit_zoom.triggered.connect(viewer.center_selection)
     menu_edit.addAction(fit_zoom)
 
+    auto_layout = QtWidgets.QAction('Auto Layout', viewer)
+    auto_layout.setShortcut('Alt+l')
+    auto_layout.triggered.connect(
+        lambda: viewer.auto_layout(viewer.selected_nodes()))
+    menu_edit.addAction(auto_layout)
+
     menu_edit.addSeparator()
 
     for menu in (menu_file, menu_edit):
         viewer.addActions(menu.actions())
+
+    # nudge the selected nodes with the arrow keys (not in the menus).
+    directions = [('Left', -1.0, 0.0), ('Right', 1.0, 0.0),
+                  ('Up', 0.0, -1.0), ('Down', 0.0, 1.0)]
+    for key, x, y in directions:
+        for modifier, step in (('', NODE_NUDGE_STEP),
+                               ('Shift+', NODE_NUDGE_STEP_LARGE)):
+            nudge = QtWidgets.QAction('Nudge {}'.format(key), viewer)
+            nudge.setShortcut(modifier + key)
+            # "triggered" passes the checked state as the first argument.
+            nudge.triggered.connect(
+                lambda checked=False, x=x * step, y=y * step:
+                viewer.nudge_nodes(x, y))
+            viewer.addAction(nudge)